@@ -0,0 +1,51 @@
+from django.apps import AppConfig
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.signals import connection_created
+
+DEBUG_APPS = ("debug_toolbar",)
+DEBUG_MIDDLEWARE = ("debug_toolbar.middleware.DebugToolbarMiddleware",)
+INSECURE_SECRET_KEY_PREFIX = "django-insecure-"
+
+
+def settings_profile_problems(config):
+    """What keeps ``config`` (a settings object) from running as "prod"."""
+    if config.SETTINGS_PROFILE != "prod":
+        return []
+
+    problems = []
+    if config.DEBUG:
+        problems.append("DEBUG is on")
+    problems += [
+        f"{app} is installed" for app in DEBUG_APPS if app in config.INSTALLED_APPS
+    ]
+    problems += [
+        f"{middleware} is enabled"
+        for middleware in DEBUG_MIDDLEWARE
+        if middleware in config.MIDDLEWARE
+    ]
+    if config.SECRET_KEY.startswith(INSECURE_SECRET_KEY_PREFIX):
+        problems.append("SECRET_KEY is the development key")
+    if not config.ALLOWED_HOSTS:
+        problems.append("ALLOWED_HOSTS is empty")
+    return problems
+
+
+def check_settings_profile():
+    """Refuse to start the "prod" profile with debug components loaded."""
+    problems = settings_profile_problems(settings)
+    if problems:
+        raise ImproperlyConfigured(
+            f"Refusing to start the prod settings profile: {'; '.join(problems)}"
+        )
+
+
+class ProjectConfig(AppConfig):
+    name = "py_social_media_api"
+    verbose_name = "Social media API"
+
+    def ready(self):
+        from py_social_media_api.db import apply_sqlite_pragmas
+
+        check_settings_profile()
+        connection_created.connect(apply_sqlite_pragmas)
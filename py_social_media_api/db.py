@@ -0,0 +1,22 @@
+"""Per-connection SQLite tuning.
+
+``apply_sqlite_pragmas`` runs ``PRAGMA name = value`` for every entry of
+``SQLITE_PRAGMAS``, then of the alias's own ``PRAGMAS`` in ``DATABASES``, on
+each new SQLite connection (the backend has no ``init_command`` option in
+this Django version).
+"""
+
+from django.conf import settings
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    if connection.vendor != "sqlite":
+        return
+    pragmas = {
+        **getattr(settings, "SQLITE_PRAGMAS", {}),
+        **connection.settings_dict.get("PRAGMAS", {}),
+    }
+    if pragmas:
+        with connection.cursor() as cursor:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
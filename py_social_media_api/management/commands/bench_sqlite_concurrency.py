@@ -0,0 +1,134 @@
+import statistics
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections, transaction
+from django.test.utils import override_settings
+
+from social.models import Post, Profile
+
+# Journal mode per scenario. Reads use "default" in each; the query-only
+# "read" alias opens the same kind of per-thread connection, so it would
+# measure the same thing as "wal".
+SCENARIOS = {
+    "rollback-journal": "DELETE",
+    "wal": "WAL",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure post list reads per second while writer threads keep "
+        "creating posts, per SQLite journal mode (bench rows are deleted afterwards)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seconds", type=float, default=5.0)
+        parser.add_argument("--readers", type=int, default=4)
+        parser.add_argument("--writers", type=int, default=2)
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            choices=list(SCENARIOS),
+            help="Repeat to pick several; all of them by default",
+        )
+
+    def handle(self, *args, **options):
+        if connections["default"].vendor != "sqlite":
+            raise CommandError("This benchmark is for SQLite databases")
+
+        user = get_user_model().objects.create_user(
+            email="bench-sqlite@example.com"
+        )
+        profile = Profile.objects.create(
+            user=user, first_name="Bench", last_name="Writer", gender="unknown"
+        )
+        try:
+            for name in options["scenario"] or SCENARIOS:
+                with override_settings(
+                    SQLITE_PRAGMAS={
+                        **settings.SQLITE_PRAGMAS,
+                        "journal_mode": SCENARIOS[name],
+                    }
+                ):
+                    connections.close_all()
+                    self.report(name, self.run(profile, options))
+        finally:
+            connections.close_all()
+            user.delete()
+
+    def run(self, profile, options):
+        stop = threading.Event()
+        latencies = []
+        writes = []
+        errors = []
+
+        posts = Post.objects.using("default").select_related("profile")
+
+        def read():
+            try:
+                while not stop.is_set():
+                    started = time.perf_counter()
+                    try:
+                        list(posts[:30])
+                    except OperationalError:
+                        errors.append("read")
+                        continue
+                    latencies.append(time.perf_counter() - started)
+            finally:
+                connections.close_all()
+
+        def write():
+            try:
+                while not stop.is_set():
+                    try:
+                        with transaction.atomic():
+                            Post.objects.create(
+                                author_id=profile.user_id,
+                                profile=profile,
+                                title="bench",
+                                content="concurrency benchmark " * 20,
+                            )
+                    except OperationalError:
+                        errors.append("write")
+                        continue
+                    writes.append(1)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=read) for _ in range(options["readers"])]
+        threads += [threading.Thread(target=write) for _ in range(options["writers"])]
+        for thread in threads:
+            thread.start()
+        time.sleep(options["seconds"])
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        return {
+            "seconds": options["seconds"],
+            "latencies": latencies,
+            "writes": len(writes),
+            "errors": len(errors),
+        }
+
+    def report(self, name, result):
+        latencies = sorted(result["latencies"])
+        seconds = result["seconds"]
+        if latencies:
+            p50 = statistics.median(latencies) * 1000
+            p99 = latencies[int(len(latencies) * 0.99)] * 1000
+            reads = f"{len(latencies) / seconds:.0f} reads/s "
+            reads += f"(p50 {p50:.2f} ms, p99 {p99:.2f} ms)"
+        else:
+            reads = "no reads completed"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{name}: {reads}, "
+                f"{result['writes'] / seconds:.0f} writes/s, "
+                f"{result['errors']} locked errors"
+            )
+        )
@@ -0,0 +1,33 @@
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the primary SQLite database over every SQLite replica in "
+        "DATABASE_REPLICAS, standing in for replication in local testing"
+    )
+
+    def handle(self, *args, **options):
+        primary = connections[DEFAULT_DB_ALIAS].settings_dict
+        if primary["ENGINE"] != "django.db.backends.sqlite3":
+            raise CommandError("The primary database is not SQLite")
+
+        for alias in settings.DATABASE_REPLICAS:
+            replica = connections[alias].settings_dict
+            if replica["ENGINE"] != "django.db.backends.sqlite3":
+                raise CommandError(f"Replica {alias!r} is not SQLite")
+
+            source = sqlite3.connect(primary["NAME"])
+            target = sqlite3.connect(replica["NAME"])
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+                source.close()
+            self.stdout.write(
+                self.style.SUCCESS(f"Copied {primary['NAME']} to {replica['NAME']}")
+            )
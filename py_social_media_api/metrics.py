@@ -0,0 +1,260 @@
+"""Per-view request metrics in the Prometheus text format.
+
+``MetricsMiddleware`` times each request and counts the queries it runs on
+every database connection (through ``connection.execute_wrapper``), with
+their time. Serializer time is added by ``timed("serializer")`` blocks, see
+``SerializerMetricsMixin``; queries run inside such a block (an unpaginated
+queryset evaluated while serializing) count as DB time, not serializer
+time. Samples are aggregated per view name and method in process memory
+and served by ``metrics_view`` at ``/metrics``; each worker process reports
+its own numbers, so scrape every worker (or sum them at the collector).
+
+A streaming response is measured until the view returns it: queries run
+while its body is consumed (exports) are not counted.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+# Other methods share the "other" label, so clients cannot add series.
+METHODS = frozenset({"GET", "HEAD", "OPTIONS", "POST", "PUT", "PATCH", "DELETE"})
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_current = ContextVar("metrics_sample", default=None)
+
+
+class Sample:
+    """Measurements of the request being handled."""
+
+    __slots__ = ("queries", "db_seconds", "serializer_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serializer_seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - start
+            self.queries += 1
+
+
+@contextmanager
+def timed(kind):
+    """Add the time spent in the block, net of queries, to the request's ``kind``."""
+    sample = _current.get()
+    if sample is None:
+        yield
+        return
+    start = time.perf_counter()
+    db_start = sample.db_seconds
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start - (sample.db_seconds - db_start)
+        setattr(
+            sample, f"{kind}_seconds", getattr(sample, f"{kind}_seconds") + elapsed
+        )
+
+
+class Series:
+    __slots__ = (
+        "errors",
+        "latency_buckets",
+        "latency_sum",
+        "query_buckets",
+        "query_sum",
+        "db_seconds",
+        "serializer_seconds",
+    )
+
+    def __init__(self):
+        self.errors = 0
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self.query_buckets = [0] * (len(QUERY_BUCKETS) + 1)
+        self.query_sum = 0
+        self.db_seconds = 0.0
+        self.serializer_seconds = 0.0
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def observe(self, labels, seconds, status_code, sample):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = Series()
+            if status_code >= 500:
+                series.errors += 1
+            series.latency_buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            series.latency_sum += seconds
+            series.query_buckets[bisect_left(QUERY_BUCKETS, sample.queries)] += 1
+            series.query_sum += sample.queries
+            series.db_seconds += sample.db_seconds
+            series.serializer_seconds += sample.serializer_seconds
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                labels: _copy(series) for labels, series in self._series.items()
+            }
+
+
+def _copy(series):
+    copy = Series()
+    for name in Series.__slots__:
+        value = getattr(series, name)
+        setattr(copy, name, list(value) if isinstance(value, list) else value)
+    return copy
+
+
+registry = Registry()
+
+
+def _labels(view, method):
+    return f'view="{_escape(view)}",method="{_escape(method)}"'
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _header(lines, name, kind, description):
+    lines.append(f"# HELP {name} {description}.")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _histogram(lines, name, labels, bounds, buckets, total):
+    count = 0
+    for bound, observed in zip((*bounds, "+Inf"), buckets):
+        count += observed
+        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+    lines.append(f"{name}_sum{{{labels}}} {total}")
+    lines.append(f"{name}_count{{{labels}}} {count}")
+
+
+def render():
+    """All series, plus the response cache counters, as Prometheus text."""
+    from social.cache import stats
+
+    snapshot = [
+        (_labels(view, method), series)
+        for (view, method), series in sorted(registry.snapshot().items())
+    ]
+    lines = []
+
+    name = "http_request_duration_seconds"
+    _header(lines, name, "histogram", "Request latency by view")
+    for labels, series in snapshot:
+        _histogram(
+            lines,
+            name,
+            labels,
+            LATENCY_BUCKETS,
+            series.latency_buckets,
+            series.latency_sum,
+        )
+
+    name = "db_queries_per_request"
+    _header(lines, name, "histogram", "Database queries per request")
+    for labels, series in snapshot:
+        _histogram(
+            lines, name, labels, QUERY_BUCKETS, series.query_buckets, series.query_sum
+        )
+
+    for name, attribute, description in (
+        ("http_request_errors_total", "errors", "Requests answered with a 5xx"),
+        ("db_query_duration_seconds_total", "db_seconds", "Time in database queries"),
+        ("serializer_duration_seconds_total", "serializer_seconds", "Time serializing"),
+    ):
+        _header(lines, name, "counter", description)
+        for labels, series in snapshot:
+            lines.append(f"{name}{{{labels}}} {getattr(series, attribute)}")
+
+    name = "response_cache_requests_total"
+    _header(lines, name, "counter", "Response cache lookups")
+    for outcome, count in sorted(stats().items()):
+        lines.append(f'{name}{{outcome="{outcome}"}} {count}')
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """Record latency, queries and serializer time of every request.
+
+    Place it first in ``MIDDLEWARE`` so the latency covers the others too.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "METRICS_ENABLED", True)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        sample = Sample()
+        token = _current.set(sample)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(sample))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        match = request.resolver_match
+        if match is None or match.func is not metrics_view:
+            view = match.view_name if match is not None else "<unmatched>"
+            method = request.method if request.method in METHODS else "other"
+            registry.observe(
+                (view, method),
+                time.perf_counter() - start,
+                response.status_code,
+                sample,
+            )
+        return response
+
+
+class SerializerMetricsMixin:
+    """Count the time spent in ``to_representation``, net of queries, as
+    serializer time."""
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        to_representation = serializer.to_representation
+
+        def timed_to_representation(instance):
+            with timed("serializer"):
+                return to_representation(instance)
+
+        serializer.to_representation = timed_to_representation
+        return serializer
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint, open to ``METRICS_ALLOWED_IPS``."""
+    allowed = getattr(settings, "METRICS_ALLOWED_IPS", ["127.0.0.1"])
+    if request.META.get("REMOTE_ADDR") not in allowed:
+        return HttpResponseForbidden()
+    return HttpResponse(render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,146 @@
+"""Read/write connection split and read replicas.
+
+Writes, and reads inside a transaction on ``default``, use ``default``:
+code inside ``atomic()`` sees its own uncommitted rows and keeps its
+``select_for_update`` locks.
+
+Reads made while ``ReplicaRoutingMiddleware`` handles a safe-method request
+go to one of ``DATABASE_REPLICAS``, the same one for the whole request,
+unless the client wrote within the last ``DATABASE_STICKY_SECONDS``:
+replicas may lag, and a client must see its own new post or follow at once.
+Stickiness assumes replicas lag less than that. Models of
+``DATABASE_PRIMARY_APPS`` (tokens, sessions) are always read from
+``default``, since a fresh login must work on the very next request.
+
+Other reads go to ``DATABASE_READ_ALIAS`` when one is configured. For
+SQLite that is a query-only connection to the same file, so a read path
+cannot write by mistake. It does not make reads faster: connections are
+per thread, and WAL already lets the ``default`` connections read while
+another thread writes.
+"""
+
+import hashlib
+import random
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+STICKY_COOKIE = "db_primary_until"
+
+_replica = ContextVar("replica", default=None)
+
+
+def read_alias():
+    return getattr(settings, "DATABASE_READ_ALIAS", None)
+
+
+def replica_aliases():
+    return getattr(settings, "DATABASE_REPLICAS", [])
+
+
+def current_replica():
+    """The replica the current request reads from, if any."""
+    return _replica.get()
+
+
+class ReadWriteRouter:
+    def db_for_read(self, model, **hints):
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        replica = _replica.get()
+        if replica is not None and model._meta.app_label not in getattr(
+            settings, "DATABASE_PRIMARY_APPS", ()
+        ):
+            return replica
+        return read_alias() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, read_alias(), *replica_aliases()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == read_alias() or db in replica_aliases():
+            return False
+        return None
+
+
+def _sticky_keys(request):
+    """Cache keys for the credentials the request carries."""
+    credentials = [
+        request.META.get("HTTP_AUTHORIZATION"),
+        request.COOKIES.get(settings.SESSION_COOKIE_NAME),
+    ]
+    return [
+        "db:primary:" + hashlib.sha256(credential.encode()).hexdigest()
+        for credential in credentials
+        if credential
+    ]
+
+
+class ReplicaRoutingMiddleware:
+    """Let safe-method requests read from a replica, except after a write.
+
+    A request picks one replica, so its count and page see the same state.
+    A successful (2xx) write marks the client's credentials in the cache and
+    sets a cookie, for clients without credentials, for
+    ``DATABASE_STICKY_SECONDS``. Token clients usually ignore cookies, so
+    their stickiness needs ``DATABASE_STICKY_CACHE_ALIAS`` to be shared
+    between workers (Redis); with the LocMem default it only holds on the
+    worker that handled the write.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not replica_aliases():
+            return self.get_response(request)
+
+        safe = request.method in SAFE_METHODS
+        replica = None
+        if safe and not self.is_sticky(request):
+            replica = random.choice(replica_aliases())
+        token = _replica.set(replica)
+        try:
+            response = self.get_response(request)
+        finally:
+            _replica.reset(token)
+
+        if not safe and 200 <= response.status_code < 300:
+            self.stick(request, response)
+        return response
+
+    @staticmethod
+    def get_cache():
+        return caches[getattr(settings, "DATABASE_STICKY_CACHE_ALIAS", "default")]
+
+    def is_sticky(self, request):
+        try:
+            if float(request.COOKIES.get(STICKY_COOKIE, 0)) > time.time():
+                return True
+        except ValueError:
+            pass
+        keys = _sticky_keys(request)
+        return bool(keys) and bool(self.get_cache().get_many(keys))
+
+    def stick(self, request, response):
+        seconds = getattr(settings, "DATABASE_STICKY_SECONDS", 5)
+        keys = _sticky_keys(request)
+        if keys:
+            self.get_cache().set_many(dict.fromkeys(keys, True), seconds)
+        response.set_cookie(
+            STICKY_COOKIE,
+            str(time.time() + seconds),
+            max_age=seconds,
+            httponly=True,
+            samesite="Lax",
+        )
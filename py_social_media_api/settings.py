@@ -12,20 +12,45 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 
-# Quick-start development settings - unsuitable for production
-# See https://docs.djangoproject.com/en/4.2/howto/deployment/checklist/
+# Settings profile, from DJANGO_SETTINGS_PROFILE:
+# - "dev" (default): DEBUG and the debug toolbar.
+# - "prod": no debug components, persistent database connections and cached
+#   templates. SECRET_KEY and ALLOWED_HOSTS must come from the environment,
+#   and the project app refuses to start with any debug component loaded.
+# - "bench": the prod request path with the dev secret key and any host, for
+#   load tests on a workstation.
+
+SETTINGS_PROFILES = ("dev", "prod", "bench")
+SETTINGS_PROFILE = os.environ.get("DJANGO_SETTINGS_PROFILE", "dev")
+if SETTINGS_PROFILE not in SETTINGS_PROFILES:
+    raise ImproperlyConfigured(
+        f"DJANGO_SETTINGS_PROFILE must be one of {', '.join(SETTINGS_PROFILES)}"
+    )
+DEV = SETTINGS_PROFILE == "dev"
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = "django-insecure-8z67(i6flebpuoi_8-g1su=qii#&d&^svqslk0q77d-3k5)t54"
+SECRET_KEY = os.environ.get(
+    "SECRET_KEY",
+    "django-insecure-8z67(i6flebpuoi_8-g1su=qii#&d&^svqslk0q77d-3k5)t54",
+)
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.environ.get("DJANGO_DEBUG", str(DEV)).lower() in ("1", "true", "yes")
 
-ALLOWED_HOSTS = []
+if SETTINGS_PROFILE == "prod":
+    ALLOWED_HOSTS = [
+        host for host in os.environ.get("ALLOWED_HOSTS", "").split(",") if host
+    ]
+elif SETTINGS_PROFILE == "bench":
+    ALLOWED_HOSTS = ["*"]
+else:
+    ALLOWED_HOSTS = []
 
 INTERNAL_IPS = [
     "127.0.0.1",
@@ -39,17 +64,18 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
-    "debug_toolbar",
     "rest_framework",
     "rest_framework.authtoken",
     "drf_spectacular",
+    "py_social_media_api",
     "user",
     "social",
 ]
 
 MIDDLEWARE = [
+    "py_social_media_api.metrics.MetricsMiddleware",
+    "py_social_media_api.routers.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -58,6 +84,13 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+if DEV:
+    INSTALLED_APPS.insert(INSTALLED_APPS.index("rest_framework"), "debug_toolbar")
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index("django.middleware.security.SecurityMiddleware") + 1,
+        "debug_toolbar.middleware.DebugToolbarMiddleware",
+    )
+
 ROOT_URLCONF = "py_social_media_api.urls"
 
 TEMPLATES = [
@@ -76,19 +109,120 @@ TEMPLATES = [
     },
 ]
 
+if not DEV:
+    # Compile each template once per process, without checking for edits.
+    TEMPLATES[0]["APP_DIRS"] = False
+    TEMPLATES[0]["OPTIONS"]["loaders"] = [
+        (
+            "django.template.loaders.cached.Loader",
+            [
+                "django.template.loaders.filesystem.Loader",
+                "django.template.loaders.app_directories.Loader",
+            ],
+        ),
+    ]
+
 WSGI_APPLICATION = "py_social_media_api.wsgi.application"
 
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# Outside dev, connections are kept for CONN_MAX_AGE seconds instead of
+# being opened per request, and checked before reuse.
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        "CONN_MAX_AGE": int(os.environ.get("CONN_MAX_AGE") or (0 if DEV else 600)),
+        "CONN_HEALTH_CHECKS": not DEV,
+        # Seconds a writer waits for another writer before "database is locked"
+        "OPTIONS": {"timeout": 20},
     }
 }
 
+# SQLite performance mode, on unless SQLITE_PERFORMANCE_MODE is false:
+# - SQLITE_PRAGMAS run on each new connection (see py_social_media_api/db.py):
+#   write-ahead logging so readers never wait for the writer, fsync at
+#   checkpoints only, a 64 MiB page cache and 256 MiB of mmap I/O.
+# - Unless SQLITE_READ_ALIAS is false, reads outside a transaction go to the
+#   "read" alias, a query-only connection to the same file (see
+#   py_social_media_api/routers.py). It guards against writes from read
+#   paths; it is not faster, since each thread already has its own
+#   connection and WAL keeps readers off the writer (bench_sqlite_concurrency
+#   measures that). It costs a second connection per thread, opened with its
+#   pragmas on every request when CONN_MAX_AGE is 0.
+
+SQLITE_PERFORMANCE_MODE = os.environ.get(
+    "SQLITE_PERFORMANCE_MODE", "true"
+).lower() in ("1", "true", "yes")
+SQLITE_READ_ALIAS = os.environ.get(
+    "SQLITE_READ_ALIAS", "true"
+).lower() in ("1", "true", "yes")
+
+SQLITE_PRAGMAS = {}
+DATABASE_READ_ALIAS = None
+
+if SQLITE_PERFORMANCE_MODE:
+    SQLITE_PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64_000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    }
+
+if SQLITE_PERFORMANCE_MODE and SQLITE_READ_ALIAS:
+    DATABASES["read"] = {
+        **DATABASES["default"],
+        "PRAGMAS": {"query_only": "ON"},
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_READ_ALIAS = "read"
+
+# Read replicas for safe-method requests, with reads sticking to the primary
+# for DATABASE_STICKY_SECONDS after a client writes (see
+# py_social_media_api/routers.py). DATABASE_STICKY_SECONDS must exceed the
+# replica lag, and token clients only stick across workers when
+# DATABASE_STICKY_CACHE_ALIAS is shared (set REDIS_URL). SQLITE_REPLICA_PATH
+# stands a second SQLite file in for a replica; `manage.py
+# sync_sqlite_replica` copies the primary over it.
+
+DATABASE_REPLICAS = []
+DATABASE_PRIMARY_APPS = ["authtoken", "sessions"]
+DATABASE_STICKY_SECONDS = 5
+DATABASE_STICKY_CACHE_ALIAS = "default"
+
+if os.environ.get("SQLITE_REPLICA_PATH"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": os.environ["SQLITE_REPLICA_PATH"],
+        "PRAGMAS": {"query_only": "ON"},
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS = ["replica"]
+
+DATABASE_ROUTERS = ["py_social_media_api.routers.ReadWriteRouter"]
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Process-local by default; set REDIS_URL to share cached responses,
+# invalidations and auth lookups between workers.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "OPTIONS": {"MAX_ENTRIES": 10_000},
+    },
+}
+
+if os.environ.get("REDIS_URL"):
+    CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ["REDIS_URL"],
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -110,6 +244,24 @@ AUTH_PASSWORD_VALIDATORS = [
 
 AUTH_USER_MODEL = "user.User"
 
+# Password hashing
+# https://docs.djangoproject.com/en/4.2/topics/auth/passwords/
+# New passwords use the first hasher. Stored hashes made by any other one are
+# re-hashed on the user's next successful login, so a comma-separated
+# PASSWORD_HASHERS can switch algorithm (or cost) without a migration.
+
+PASSWORD_HASHERS = [
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
+if os.environ.get("PASSWORD_HASHERS"):
+    PASSWORD_HASHERS = os.environ["PASSWORD_HASHERS"].split(",")
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.2/topics/i18n/
 
@@ -134,6 +286,28 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "user.authentication.CachedTokenAuthentication",
+        "rest_framework.authentication.SessionAuthentication",
+    ],
+    # Number of trusted proxies in front of the app. Unset, X-Forwarded-For
+    # is ignored by the login IP throttle, since any client can send it.
+    "NUM_PROXIES": (
+        int(os.environ["NUM_PROXIES"]) if os.environ.get("NUM_PROXIES") else None
+    ),
+}
+
+# Token lookups cached by user.authentication.CachedTokenAuthentication, only
+# when this cache is shared between workers (Redis, not the LocMem default)
+AUTH_TOKEN_CACHE_ALIAS = "default"
+AUTH_TOKEN_CACHE_TIMEOUT = 300
+
+# Token buckets in front of the login view, see user.throttling
+LOGIN_THROTTLE_STORE = "user.throttling.MemoryBucketStore"
+LOGIN_THROTTLE_CACHE_ALIAS = "default"
+LOGIN_THROTTLE_RATES = {
+    "login_ip": "30/min",
+    "login_email": "5/min",
 }
 
 SPECTACULAR_SETTINGS = {
@@ -148,3 +322,26 @@ SPECTACULAR_SETTINGS = {
         "defaultModelExpandDepth": 2,
     },
 }
+
+# Home timeline fan-out (see social/feed.py)
+SOCIAL_FEED_ASYNC = True
+SOCIAL_FEED_WORKERS = 2
+SOCIAL_FEED_FANOUT_THRESHOLD = 10_000
+
+# Anonymous GET response cache (see social/cache.py)
+SOCIAL_RESPONSE_CACHE_ALIAS = "default"
+SOCIAL_RESPONSE_CACHE_TIMEOUT = 60
+
+# Viewer follow-set cache of /profiles/relationships/ (see social/relationships.py),
+# only used when the response cache is shared (set REDIS_URL)
+SOCIAL_RELATIONSHIP_CACHE = False
+SOCIAL_RELATIONSHIP_CACHE_TIMEOUT = 300
+SOCIAL_RELATIONSHIP_CACHE_MAX_SIZE = 5_000
+
+# Post and profile lists from .values() rows, encoded with orjson when it is
+# installed (see social/fastpath.py)
+SOCIAL_FAST_LIST = True
+
+# Request metrics served at /metrics (see py_social_media_api/metrics.py)
+METRICS_ENABLED = True
+METRICS_ALLOWED_IPS = ["127.0.0.1"]
@@ -0,0 +1,313 @@
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import OperationalError, connection, router, transaction
+from django.http import HttpResponse
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from rest_framework.authtoken.models import Token
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from py_social_media_api import metrics
+from py_social_media_api.apps import settings_profile_problems
+from py_social_media_api.db import apply_sqlite_pragmas
+from py_social_media_api.routers import STICKY_COOKIE, ReplicaRoutingMiddleware
+from social.models import Post
+from social.tests.test_social_media_api import sample_post, sample_profile
+
+METRICS_URL = reverse("metrics")
+POST_URL = reverse("social:post-list")
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        metrics.registry.reset()
+        self.client = APIClient()
+        user = get_user_model().objects.create_user("me@test.com")
+        profile = sample_profile(user=user)
+        sample_post(author=user, profile=profile)
+
+    def series(self, view="cinema:post-list", method="GET"):
+        return metrics.registry.snapshot()[(view, method)]
+
+    def test_records_latency_queries_and_serializer_time(self):
+        with self.assertNumQueries(2):
+            self.client.get(POST_URL)
+        with override_settings(SOCIAL_FAST_LIST=False):
+            self.client.get(POST_URL, {"page_size": 1})
+
+        series = self.series()
+        self.assertEqual(sum(series.latency_buckets), 2)
+        self.assertEqual(series.query_sum, 4)
+        self.assertGreater(series.db_seconds, 0)
+        self.assertGreater(series.serializer_seconds, 0)
+        self.assertEqual(series.errors, 0)
+
+    def test_unmatched_paths_share_a_series(self):
+        self.client.get("/no/such/page/")
+        self.client.get("/nor/this/")
+
+        self.assertEqual(sum(self.series("<unmatched>").latency_buckets), 2)
+
+    def test_unknown_methods_share_a_label(self):
+        for method in ("FOO1", "FOO2", "FOO3"):
+            self.client.generic(method, POST_URL)
+
+        snapshot = metrics.registry.snapshot()
+        self.assertEqual(sum(self.series(method="other").latency_buckets), 3)
+        self.assertFalse(any(method.startswith("FOO") for _, method in snapshot))
+
+    def test_serializer_time_excludes_queries(self):
+        sample = metrics.Sample()
+        token = metrics._current.set(sample)
+        try:
+            with metrics.timed("serializer"):
+                # A query evaluated while serializing.
+                sample.db_seconds += 10.0
+        finally:
+            metrics._current.reset(token)
+
+        self.assertLess(sample.serializer_seconds, 1.0)
+
+    def test_prometheus_text(self):
+        self.client.get(POST_URL)
+
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res["Content-Type"], metrics.CONTENT_TYPE)
+        body = res.content.decode()
+        labels = 'view="cinema:post-list",method="GET"'
+        self.assertIn("# TYPE http_request_duration_seconds histogram", body)
+        self.assertIn(
+            f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1', body
+        )
+        self.assertIn(f'db_queries_per_request_bucket{{{labels},le="2"}} 1', body)
+        self.assertIn(f"db_queries_per_request_sum{{{labels}}} 2", body)
+        self.assertIn('response_cache_requests_total{outcome="misses"}', body)
+        self.assertNotIn(("metrics", "GET"), metrics.registry.snapshot())
+
+    @override_settings(METRICS_ALLOWED_IPS=["10.0.0.1"])
+    def test_other_addresses_are_forbidden(self):
+        res = self.client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, 403)
+
+
+PROD = {
+    "SETTINGS_PROFILE": "prod",
+    "DEBUG": False,
+    "INSTALLED_APPS": ["django.contrib.auth", "social"],
+    "MIDDLEWARE": ["django.middleware.security.SecurityMiddleware"],
+    "SECRET_KEY": "a-real-secret",
+    "ALLOWED_HOSTS": ["api.example.com"],
+}
+
+
+def run_check(profile, **environ):
+    """``manage.py diffsettings`` under ``profile``: (exit code, output)."""
+    env = {**os.environ, "DJANGO_SETTINGS_PROFILE": profile}
+    for name in ("DJANGO_DEBUG", "SECRET_KEY", "ALLOWED_HOSTS", "CONN_MAX_AGE"):
+        env.pop(name, None)
+    env.update(environ)
+    result = subprocess.run(
+        [sys.executable, "manage.py", "diffsettings"],
+        cwd=settings.BASE_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    return result.returncode, result.stdout + result.stderr
+
+
+class SettingsProfileTests(SimpleTestCase):
+    def test_clean_prod_profile(self):
+        self.assertEqual(settings_profile_problems(SimpleNamespace(**PROD)), [])
+
+    def test_prod_refuses_debug_components(self):
+        for name, value in (
+            ("DEBUG", True),
+            ("INSTALLED_APPS", [*PROD["INSTALLED_APPS"], "debug_toolbar"]),
+            (
+                "MIDDLEWARE",
+                [
+                    *PROD["MIDDLEWARE"],
+                    "debug_toolbar.middleware.DebugToolbarMiddleware",
+                ],
+            ),
+            ("SECRET_KEY", "django-insecure-dev"),
+            ("ALLOWED_HOSTS", []),
+        ):
+            with self.subTest(name):
+                config = SimpleNamespace(**{**PROD, name: value})
+                self.assertEqual(len(settings_profile_problems(config)), 1)
+
+    def test_other_profiles_are_not_checked(self):
+        config = SimpleNamespace(**{**PROD, "SETTINGS_PROFILE": "bench", "DEBUG": True})
+
+        self.assertEqual(settings_profile_problems(config), [])
+
+    def test_prod_profile_drops_debug_overhead(self):
+        code, output = run_check(
+            "prod", SECRET_KEY="a-real-secret", ALLOWED_HOSTS="api.example.com"
+        )
+
+        self.assertEqual(code, 0, output)
+        self.assertNotIn("DEBUG = True", output)
+        self.assertNotIn("debug_toolbar", output)
+        self.assertIn("'CONN_MAX_AGE': 600", output)
+        self.assertIn("django.template.loaders.cached.Loader", output)
+
+    def test_prod_profile_with_debug_does_not_boot(self):
+        code, output = run_check(
+            "prod", ALLOWED_HOSTS="api.example.com", DJANGO_DEBUG="true"
+        )
+
+        self.assertNotEqual(code, 0)
+        self.assertIn("DEBUG is on", output)
+        self.assertIn("SECRET_KEY is the development key", output)
+
+    def test_unknown_profile(self):
+        code, output = run_check("staging")
+
+        self.assertNotEqual(code, 0)
+        self.assertIn("DJANGO_SETTINGS_PROFILE", output)
+
+
+class SqlitePragmaTests(TestCase):
+    @override_settings(SQLITE_PRAGMAS={"cache_size": -4_000})
+    def test_pragmas_applied(self):
+        apply_sqlite_pragmas(sender=None, connection=connection)
+
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA cache_size")
+            self.assertEqual(cursor.fetchone()[0], -4_000)
+
+
+@skipUnless(settings.DATABASE_READ_ALIAS, "SQLite performance mode is off")
+class ReadWriteRouterTests(TransactionTestCase):
+    databases = {"default", "read"}
+
+    def setUp(self):
+        user = get_user_model().objects.create_user("me@test.com")
+        self.post = sample_post(author=user, profile=sample_profile(user=user))
+
+    def test_reads_use_the_read_alias(self):
+        posts = Post.objects.all()
+
+        self.assertEqual(posts.db, "read")
+        self.assertEqual([post.id for post in posts], [self.post.id])
+
+    def test_reads_in_a_transaction_use_default(self):
+        with transaction.atomic():
+            Post.objects.filter(id=self.post.id).update(title="renamed")
+
+            self.assertEqual(Post.objects.all().db, "default")
+            self.assertEqual(Post.objects.get().title, "renamed")
+
+    def test_objects_read_from_the_read_alias_save_to_default(self):
+        post = Post.objects.get()
+        post.title = "renamed"
+        post.save()
+
+        self.assertEqual(post._state.db, "default")
+        self.assertEqual(Post.objects.get().title, "renamed")
+
+    def test_read_alias_is_query_only(self):
+        with self.assertRaises(OperationalError):
+            Post.objects.using("read").update(title="renamed")
+
+    def test_migrations_skip_the_read_alias(self):
+        self.assertTrue(router.allow_migrate("default", "social"))
+        self.assertFalse(router.allow_migrate("read", "social"))
+
+
+@override_settings(DATABASE_REPLICAS=["replica"], DATABASE_READ_ALIAS=None)
+class ReplicaRoutingTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.middleware = ReplicaRoutingMiddleware(self.route)
+
+    def route(self, request):
+        self.routed = {
+            "post": router.db_for_read(Post),
+            "token": router.db_for_read(Token),
+        }
+        self.later_reads = {router.db_for_read(Post) for _ in range(20)}
+        return HttpResponse(status=self.status)
+
+    def send(self, method="get", status=200, **extra):
+        self.status = status
+        request = getattr(self.factory, method)("/api/social/posts/", **extra)
+        response = self.middleware(request)
+        return self.routed, response
+
+    def test_safe_requests_read_from_replicas(self):
+        routed, _ = self.send()
+
+        self.assertEqual(routed, {"post": "replica", "token": "default"})
+
+    @override_settings(DATABASE_REPLICAS=["replica", "replica2"])
+    def test_one_replica_per_request(self):
+        for _ in range(10):
+            routed, _ = self.send()
+            self.assertEqual(self.later_reads, {routed["post"]})
+
+    def test_writes_and_code_outside_requests_use_primary(self):
+        routed, _ = self.send("post")
+
+        self.assertEqual(routed["post"], "default")
+        self.assertEqual(router.db_for_read(Post), "default")
+
+    def test_client_sticks_to_primary_after_writing(self):
+        _, response = self.send("post", HTTP_AUTHORIZATION="Token abc")
+
+        routed, _ = self.send(HTTP_AUTHORIZATION="Token abc")
+        self.assertEqual(routed["post"], "default")
+
+        routed, _ = self.send(HTTP_AUTHORIZATION="Token other")
+        self.assertEqual(routed["post"], "replica")
+
+        self.factory.cookies[STICKY_COOKIE] = response.cookies[STICKY_COOKIE].value
+        routed, _ = self.send()
+        self.assertEqual(routed["post"], "default")
+
+    def test_failed_writes_do_not_stick(self):
+        for status in (400, 401, 500):
+            _, response = self.send(
+                "post", status=status, HTTP_AUTHORIZATION="Token abc"
+            )
+            self.assertNotIn(STICKY_COOKIE, response.cookies)
+
+        routed, _ = self.send(HTTP_AUTHORIZATION="Token abc")
+        self.assertEqual(routed["post"], "replica")
+
+    @override_settings(DATABASE_STICKY_SECONDS=0)
+    def test_stickiness_expires(self):
+        _, response = self.send("post", HTTP_AUTHORIZATION="Token abc")
+        self.factory.cookies[STICKY_COOKIE] = response.cookies[STICKY_COOKIE].value
+
+        routed, _ = self.send(HTTP_AUTHORIZATION="Token abc")
+
+        self.assertEqual(routed["post"], "replica")
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas(self):
+        routed, response = self.send("post")
+
+        self.assertEqual(routed["post"], "default")
+        self.assertNotIn(STICKY_COOKIE, response.cookies)
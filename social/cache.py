@@ -0,0 +1,200 @@
+"""Read-through cache of anonymous GET responses.
+
+Entries are keyed on the request path, its query parameters and the
+serializer class and ``cache_version``. Each key also carries a per-
+namespace generation number. Bumping the generation (from model signals)
+invalidates every cached page of that namespace at once, without knowing
+which keys exist. Writes bump the namespace of the rows they change; views
+list every namespace their responses are built from.
+
+A response read from a lagging replica may predate the write that bumped
+the generation, so while an invalidation is more recent than
+``DATABASE_STICKY_SECONDS`` (the replica lag the router assumes), replica
+reads of that namespace are served but not stored.
+
+Entries live in the Django cache named by ``SOCIAL_RESPONSE_CACHE_ALIAS``:
+a process-local ``LocMemCache`` by default, or any shared backend (Redis,
+Memcached) configured under that alias.
+"""
+
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from rest_framework.response import Response
+
+from py_social_media_api.routers import current_replica
+
+POSTS = "posts"
+PROFILES = "profiles"
+# Profile fields shown with every post (the author's name).
+AUTHORS = "authors"
+CACHED_HEADERS = ("ETag",)
+
+_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+
+def get_cache():
+    return caches[getattr(settings, "SOCIAL_RESPONSE_CACHE_ALIAS", "default")]
+
+
+def _generation_key(namespace):
+    return f"social:generation:{namespace}"
+
+
+def _invalidated_key(namespace):
+    return f"social:invalidated:{namespace}"
+
+
+def generations(namespaces):
+    cache = get_cache()
+    keys = [_generation_key(namespace) for namespace in namespaces]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            # Seed from the clock so an evicted counter never restarts at a
+            # value that older, still cached entries were stored under.
+            cache.add(key, time.time_ns(), timeout=None)
+            found[key] = cache.get(key)
+    return [found[key] for key in keys]
+
+
+def invalidate(*namespaces):
+    """Bump the generations of ``namespaces`` once the transaction commits.
+
+    The generation is read before the response is built, so a concurrent
+    read of the old rows is stored under the old generation; bumping before
+    the commit would let it be stored under the new one.
+    """
+    transaction.on_commit(lambda: _bump(namespaces))
+
+
+def _bump(namespaces):
+    cache = get_cache()
+    for namespace in namespaces:
+        key = _generation_key(namespace)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=None)
+    lag = getattr(settings, "DATABASE_STICKY_SECONDS", 5)
+    cache.set_many(
+        {_invalidated_key(namespace): True for namespace in namespaces},
+        max(1, math.ceil(lag)),
+    )
+
+
+def recently_invalidated(namespaces):
+    """Whether a replica may not have caught up with ``namespaces`` yet."""
+    keys = [_invalidated_key(namespace) for namespace in namespaces]
+    return bool(get_cache().get_many(keys))
+
+
+def _record(outcome):
+    with _stats_lock:
+        _stats[outcome] += 1
+
+
+def stats():
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_stats():
+    with _stats_lock:
+        for outcome in _stats:
+            _stats[outcome] = 0
+
+
+class ResponseCacheMixin:
+    """Serve ``list``/``retrieve`` of anonymous GETs from the response cache.
+
+    ``cache_namespaces`` lists the namespaces whose invalidation must drop
+    this view's entries; override ``get_cache_namespaces`` when they
+    depend on the action.
+    """
+
+    cache_namespaces = ()
+    cached_actions = ("list", "retrieve")
+
+    def get_cache_namespaces(self):
+        return self.cache_namespaces
+
+    def response_cache_key(self, request):
+        serializer_class = self.get_serializer_class()
+        params = sorted(
+            (name, value)
+            for name, values in request.query_params.lists()
+            for value in values
+        )
+        raw = "|".join(
+            [
+                f"{serializer_class.__module__}.{serializer_class.__qualname__}",
+                str(getattr(serializer_class, "cache_version", 1)),
+                # Bodies hold absolute next/previous links.
+                request.build_absolute_uri(request.path),
+                repr(params),
+                *map(str, generations(self.get_cache_namespaces())),
+            ]
+        )
+        return f"social:response:{hashlib.sha256(raw.encode()).hexdigest()}"
+
+    def is_response_cacheable(self, request):
+        return (
+            request.method in ("GET", "HEAD")
+            and self.action in self.cached_actions
+            and not request.user.is_authenticated
+        )
+
+    def cached_response(self, request, build):
+        if not self.is_response_cacheable(request):
+            return build()
+
+        cache = get_cache()
+        key = self.response_cache_key(request)
+        entry = cache.get(key)
+        if entry is not None:
+            _record("hits")
+            data, headers = entry
+            response = get_conditional_response(
+                request._request, etag=headers.get("ETag")
+            ) or Response(data)
+            for name, value in headers.items():
+                response[name] = value
+            response["X-Cache"] = "HIT"
+            return response
+
+        _record("misses")
+        response = build()
+        if response.status_code == 200 and not (
+            current_replica() is not None
+            and recently_invalidated(self.get_cache_namespaces())
+        ):
+            headers = {
+                name: response[name] for name in CACHED_HEADERS if name in response
+            }
+            cache.set(
+                key,
+                (response.data, headers),
+                getattr(settings, "SOCIAL_RESPONSE_CACHE_TIMEOUT", 60),
+            )
+        response["X-Cache"] = "MISS"
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(
+            request,
+            lambda: super(ResponseCacheMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            request,
+            lambda: super(ResponseCacheMixin, self).retrieve(request, *args, **kwargs),
+        )
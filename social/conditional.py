@@ -0,0 +1,191 @@
+"""Conditional GET (``ETag`` / ``Last-Modified``) for list and detail views.
+
+An ETag is derived from the version of every row on the page (and the
+total count in page-number mode). A request carrying ``If-None-Match`` or
+``If-Modified-Since`` is checked against a narrow ``.only()`` query of the
+same page, before anything is serialized; the count is a window function
+of that query. A matching request gets a 304. Unconditional requests
+compute the same ETag from the rows they already fetched, at no extra
+query. Batch retrievals (``?ids=``, see ``social.multiget``) get no
+validators, since their body is not the page.
+"""
+
+import hashlib
+from types import SimpleNamespace
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Count, Window
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.pagination import PageNumberPagination
+
+from social.pagination import KeysetPagination
+
+
+class ConditionalGetMixin:
+    """Viewsets set ``validator_fields`` and implement ``row_version``.
+
+    ``validator_fields`` must cover ``row_version``, ``row_modified`` and
+    the keyset ordering of the viewset's paginator. They may name
+    annotations of ``get_queryset``.
+    """
+
+    conditional_actions = ("list", "retrieve")
+    validator_fields = ("id",)
+
+    def row_version(self, obj):
+        raise NotImplementedError
+
+    def row_modified(self, obj):
+        return None
+
+    def paginate_queryset(self, queryset):
+        self._validated_rows = super().paginate_queryset(queryset)
+        return self._validated_rows
+
+    def get_object(self):
+        obj = super().get_object()
+        self._validated_rows = [obj]
+        return obj
+
+    def _page_count(self):
+        get_count = getattr(self.paginator, "get_count", None)
+        return get_count() if get_count is not None else None
+
+    def _validators(self, rows, count=None):
+        rows = [
+            SimpleNamespace(**row) if isinstance(row, dict) else row for row in rows
+        ]
+        serializer_class = self.get_serializer_class()
+        raw = "|".join(
+            [
+                serializer_class.__qualname__,
+                str(getattr(serializer_class, "cache_version", 1)),
+                self.request.get_full_path(),
+                str(count),
+                *(repr(self.row_version(row)) for row in rows),
+            ]
+        )
+        etag = quote_etag(hashlib.sha256(raw.encode()).hexdigest()[:32])
+
+        # Rows leaving a list page cannot move its newest timestamp forward,
+        # so only a single object gets a Last-Modified.
+        modified = self.row_modified(rows[0]) if self.action == "retrieve" else None
+        return etag, int(modified.timestamp()) if modified else None
+
+    def _current_validators(self):
+        rows = getattr(self, "_validated_rows", None)
+        if rows is None:
+            return None
+        if self.action == "retrieve":
+            return self._validators(rows)
+        return self._validators(rows, self._page_count())
+
+    def _narrow(self, queryset):
+        annotations = queryset.query.annotations
+        return (
+            queryset.select_related(None)
+            .prefetch_related(None)
+            .only(*(name for name in self.validator_fields if name not in annotations))
+        )
+
+    def _stored_validators(self):
+        """Validators read with a narrow query instead of serializing."""
+        if self.action == "retrieve":
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            try:
+                obj = (
+                    self._narrow(self.get_queryset())
+                    .filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+                    .first()
+                )
+            except (TypeError, ValueError, ValidationError):
+                return None
+            return self._validators([obj]) if obj is not None else None
+
+        queryset = self._narrow(self.filter_queryset(self.get_queryset()))
+        if self._page_count_is_counted():
+            return self._stored_page_validators(queryset)
+        rows = super().paginate_queryset(queryset)
+        if rows is None:
+            rows = list(queryset)
+        return self._validators(rows, self._page_count())
+
+    def _page_count_is_counted(self):
+        return (
+            isinstance(self.paginator, PageNumberPagination)
+            and KeysetPagination.cursor_query_param not in self.request.query_params
+        )
+
+    def _stored_page_validators(self, queryset):
+        """The page and the total count as one query, with a window function."""
+        if not connections[queryset.db].features.supports_over_clause:
+            rows = super().paginate_queryset(queryset)
+            return self._validators(rows, self._page_count())
+
+        paginator = self.paginator
+        page_size = paginator.get_page_size(self.request)
+        try:
+            number = int(self.request.query_params.get(paginator.page_query_param, 1))
+        except ValueError:
+            return None
+        if page_size is None or number < 1:
+            return None
+
+        start = (number - 1) * page_size
+        rows = list(
+            queryset.annotate(validator_count=Window(Count("*")))[
+                start : start + page_size
+            ]
+        )
+        if rows:
+            return self._validators(rows, rows[0].validator_count)
+        # Past the last page, the full response is a 404.
+        return self._validators(rows, 0) if number == 1 else None
+
+    def conditional_response(self, request, build):
+        if (
+            request.method not in ("GET", "HEAD")
+            or self.action not in self.conditional_actions
+            or "ids" in request.query_params
+        ):
+            return build()
+
+        headers = request._request.headers
+        if "If-None-Match" in headers or "If-Modified-Since" in headers:
+            validators = self._stored_validators()
+            if validators is not None:
+                etag, modified = validators
+                not_modified = get_conditional_response(
+                    request._request, etag=etag, last_modified=modified
+                )
+                if not_modified is not None:
+                    return self._with_validators(not_modified, etag, modified)
+
+        self._validated_rows = None
+        response = build()
+        if response.status_code == 200:
+            validators = self._current_validators()
+            if validators is not None:
+                self._with_validators(response, *validators)
+        return response
+
+    @staticmethod
+    def _with_validators(response, etag, modified):
+        response["ETag"] = etag
+        if modified is not None:
+            response["Last-Modified"] = http_date(modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            request,
+            lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            request,
+            lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs),
+        )
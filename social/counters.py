@@ -0,0 +1,92 @@
+"""Denormalized follower/following/post counters stored on ``Profile``.
+
+Counters are adjusted with ``F()`` expressions inside the transaction that
+changes the underlying rows, so concurrent writers never lose updates.
+``rebuild_counters`` recomputes them from scratch for drift that bypasses
+the ORM (raw SQL, cascades from deleted users).
+"""
+
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+from social.models import Post, Profile
+
+Follow = Profile.following.through
+
+
+def _adjust(queryset, field, delta):
+    version = F("version") + 1
+    if delta > 0:
+        queryset.update(**{field: F(field) + delta, "version": version})
+    elif delta < 0:
+        queryset.update(**{field: Greatest(F(field) + delta, 0), "version": version})
+
+
+def touch(profile_id):
+    """Bump ``Profile.version`` after a change that moves no counter."""
+    Profile.objects.filter(id=profile_id).update(version=F("version") + 1)
+
+
+def follows_added(profile_id, user_ids):
+    """``profile_id`` started following every user in ``user_ids``."""
+    _adjust(Profile.objects.filter(id=profile_id), "following_count", len(user_ids))
+    _adjust(Profile.objects.filter(user_id__in=user_ids), "followers_count", 1)
+
+
+def follows_removed(profile_id, user_ids):
+    """``profile_id`` stopped following every user in ``user_ids``."""
+    _adjust(Profile.objects.filter(id=profile_id), "following_count", -len(user_ids))
+    _adjust(Profile.objects.filter(user_id__in=user_ids), "followers_count", -1)
+
+
+def followers_added(user_id, profile_ids):
+    """Every profile in ``profile_ids`` started following ``user_id``."""
+    _adjust(
+        Profile.objects.filter(user_id=user_id), "followers_count", len(profile_ids)
+    )
+    _adjust(Profile.objects.filter(id__in=profile_ids), "following_count", 1)
+
+
+def followers_removed(user_id, profile_ids):
+    """Every profile in ``profile_ids`` stopped following ``user_id``."""
+    _adjust(
+        Profile.objects.filter(user_id=user_id), "followers_count", -len(profile_ids)
+    )
+    _adjust(Profile.objects.filter(id__in=profile_ids), "following_count", -1)
+
+
+def posts_added(profile_id, count=1):
+    _adjust(Profile.objects.filter(id=profile_id), "posts_count", count)
+
+
+def posts_removed(profile_id, count=1):
+    _adjust(Profile.objects.filter(id=profile_id), "posts_count", -count)
+
+
+def _count(queryset, group_by):
+    return Coalesce(
+        Subquery(
+            queryset.order_by()
+            .values(group_by)
+            .annotate(total=Count("*"))
+            .values("total"),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def rebuild_counters(queryset=None):
+    """Recompute the stored counters of ``queryset`` (all profiles by default)."""
+    queryset = Profile.objects.all() if queryset is None else queryset
+    return queryset.update(
+        followers_count=_count(
+            Follow.objects.filter(user_id=OuterRef("user_id")), "user_id"
+        ),
+        following_count=_count(
+            Follow.objects.filter(profile_id=OuterRef("id")), "profile_id"
+        ),
+        posts_count=_count(
+            Post.objects.filter(profile_id=OuterRef("id")), "profile_id"
+        ),
+    )
@@ -0,0 +1,211 @@
+"""Read-only fast path for the list actions of post and profile viewsets.
+
+``FastListMixin.list`` reads the page with ``.values()`` and turns each row
+into its representation with a ``RowConverter``, compiled once per
+serializer class and fieldset, instead of running the serializer field
+machinery on model instances. ``FastJSONRenderer`` encodes those responses
+with orjson when it is installed.
+
+The output is byte-for-byte what the serializer and DRF's ``JSONRenderer``
+produce. A serializer with a field the converter cannot reproduce exactly
+(method fields, nested serializers, related fields, unknown field types)
+falls back to the regular path.
+"""
+
+from operator import itemgetter
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from py_social_media_api.metrics import timed
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Serializer fields whose to_representation() is the identity on values of
+# the matching model columns.
+IDENTITY_FIELDS = (
+    (serializers.CharField, (models.CharField, models.TextField)),
+    (serializers.IntegerField, (models.IntegerField, models.AutoField)),
+)
+DELEGATED_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.DateField,
+    serializers.DateTimeField,
+    serializers.IntegerField,
+)
+
+
+class Unsupported(Exception):
+    pass
+
+
+class RowConverter:
+    """Representation of ``.values()`` rows for one serializer class.
+
+    ``columns`` lists what the rows must contain. A serializer may map a
+    field with a computed source to ``(columns, function)`` in
+    ``row_sources``.
+    """
+
+    def __init__(self, serializer_class, field_names=None):
+        model = serializer_class.Meta.model
+        row_sources = getattr(serializer_class, "row_sources", {})
+        self.columns = []
+        self.steps = []
+
+        for name, field in serializer_class().fields.items():
+            if field.write_only or (
+                field_names is not None and name not in field_names
+            ):
+                continue
+            if name in row_sources:
+                columns, compute = row_sources[name]
+                self.columns.extend(columns)
+                getter = _computed(itemgetter(*columns), compute)
+                self.steps.append((name, getter, self._represent(field, None)))
+            else:
+                column = self._column(model, field)
+                self.columns.append(column.attname)
+                self.steps.append(
+                    (name, itemgetter(column.attname), self._represent(field, column))
+                )
+
+    def __call__(self, row):
+        ret = {}
+        for name, getter, represent in self.steps:
+            value = getter(row)
+            if value is not None and represent is not None:
+                value = represent(value)
+            ret[name] = value
+        return ret
+
+    @staticmethod
+    def _column(model, field):
+        if field.source == "*" or "." in field.source:
+            raise Unsupported(field.source)
+        try:
+            column = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            raise Unsupported(field.source)
+        if column.is_relation or not column.concrete:
+            raise Unsupported(field.source)
+        return column
+
+    @staticmethod
+    def _represent(field, column):
+        """``field.to_representation``, or ``None`` where it is the identity."""
+        field_type = type(field)
+        if field_type.to_representation is serializers.ReadOnlyField.to_representation:
+            return None
+        for base, columns in IDENTITY_FIELDS:
+            if (
+                field_type.to_representation is base.to_representation
+                and isinstance(column, columns)
+            ):
+                return None
+        if isinstance(field, DELEGATED_FIELDS):
+            return field.to_representation
+        raise Unsupported(field_type.__name__)
+
+
+def _computed(getter, compute):
+    return lambda row: compute(*getter(row))
+
+
+_converters = {}
+
+
+def get_converter(serializer_class, field_names=None):
+    """Cached ``RowConverter``, or ``None`` if the serializer is unsupported."""
+    key = (serializer_class, field_names)
+    if key not in _converters:
+        try:
+            _converters[key] = RowConverter(serializer_class, field_names)
+        except Unsupported:
+            _converters[key] = None
+    return _converters[key]
+
+
+class FastJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` that encodes fast-path responses with orjson.
+
+    Fast-path data holds only ``dict``, ``list``, ``str``, ``int``, ``bool``
+    and ``None``, which orjson encodes exactly like the compact, non-ASCII
+    stdlib encoder. Everything else goes through ``JSONRenderer``.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        renderer_context = renderer_context or {}
+        response = renderer_context.get("response")
+        if (
+            orjson is None
+            or data is None
+            or not getattr(response, "plain_data", False)
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same JavaScript-safe escaping as JSONRenderer.
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
+
+
+class FastListMixin:
+    """Serve ``list`` from ``.values()`` rows when ``SOCIAL_FAST_LIST`` is on.
+
+    Rows also carry the primary key and ``validator_fields``, so distinct
+    filters, keyset cursors and conditional GET validators keep working.
+    """
+
+    renderer_classes = [
+        FastJSONRenderer if renderer is JSONRenderer else renderer
+        for renderer in api_settings.DEFAULT_RENDERER_CLASSES
+    ]
+
+    def row_converter(self):
+        if not getattr(settings, "SOCIAL_FAST_LIST", True):
+            return None
+        keep = self.sparse_fields() if hasattr(self, "sparse_fields") else None
+        return get_converter(
+            self.get_serializer_class(), None if keep is None else tuple(keep)
+        )
+
+    def list(self, request, *args, **kwargs):
+        converter = self.row_converter()
+        if converter is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        columns = [
+            queryset.model._meta.pk.attname,
+            *getattr(self, "validator_fields", ()),
+            *converter.columns,
+        ]
+        rows = queryset.values(*dict.fromkeys(columns))
+
+        page = self.paginate_queryset(rows)
+        with timed("serializer"):
+            data = [converter(row) for row in (rows if page is None else page)]
+        if page is not None:
+            response = self.get_paginated_response(data)
+        else:
+            response = Response(data)
+        response.plain_data = True
+        return response
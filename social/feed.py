@@ -0,0 +1,184 @@
+"""Home timeline materialization.
+
+New posts are pushed (fan-out-on-write) into the ``TimelineEntry`` rows of
+every follower by a background worker. Authors with more followers than
+``SOCIAL_FEED_FANOUT_THRESHOLD`` are skipped on write and merged into their
+followers' feeds at read time instead (fan-out-on-read): each one is a
+separate source that ``FeedPagination`` reads a bounded page from and
+merges with the timeline page.
+"""
+import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+
+from social.models import Post, Profile, TimelineEntry
+
+logger = logging.getLogger(__name__)
+
+FANOUT_BATCH_SIZE = getattr(settings, "SOCIAL_FEED_FANOUT_BATCH_SIZE", 1_000)
+BACKFILL_SIZE = getattr(settings, "SOCIAL_FEED_BACKFILL_SIZE", 50)
+
+_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, "SOCIAL_FEED_WORKERS", 2),
+    thread_name_prefix="feed-fanout",
+)
+
+
+def _run_in_background(func, *args):
+    def job():
+        close_old_connections()
+        try:
+            func(*args)
+        except Exception:
+            logger.exception("Feed job %s%r failed", func.__name__, args)
+        finally:
+            close_old_connections()
+
+    if getattr(settings, "SOCIAL_FEED_ASYNC", True):
+        _executor.submit(job)
+    else:
+        func(*args)
+
+
+def fanout_threshold():
+    return getattr(settings, "SOCIAL_FEED_FANOUT_THRESHOLD", 10_000)
+
+
+def followers_count(user_id):
+    return (
+        Profile.objects.filter(user_id=user_id)
+        .values_list("followers_count", flat=True)
+        .first()
+        or 0
+    )
+
+
+def celebrity_profile_ids(user):
+    """Return profile ids of followed authors whose posts are merged on read."""
+    following = Profile.following.through.objects.filter(profile__user=user)
+    return list(
+        Profile.objects.filter(
+            user_id__in=following.values("user_id"),
+            followers_count__gte=fanout_threshold(),
+        ).values_list("id", flat=True)
+    )
+
+
+def fan_out_post(post_id):
+    """Insert ``post_id`` into the timelines of its author and followers."""
+    fan_out_posts([post_id])
+
+
+def fan_out_posts(post_ids):
+    """Fan out many posts, reading each author's followers once."""
+    by_author = defaultdict(list)
+    for post_id, author_id, created_at in Post.objects.filter(
+        id__in=post_ids
+    ).values_list("id", "author_id", "created_at"):
+        by_author[author_id].append((post_id, created_at))
+
+    for author_id, posts in by_author.items():
+        recipients = [author_id]
+        if followers_count(author_id) < fanout_threshold():
+            recipients.extend(
+                Profile.objects.filter(following=author_id).values_list(
+                    "user_id", flat=True
+                )
+            )
+
+        TimelineEntry.objects.bulk_create(
+            [
+                TimelineEntry(
+                    user_id=user_id,
+                    post_id=post_id,
+                    author_id=author_id,
+                    created_at=created_at,
+                )
+                for post_id, created_at in posts
+                for user_id in recipients
+            ],
+            batch_size=FANOUT_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+
+
+def backfill_timeline(user_id, author_ids):
+    """Copy the latest posts of newly followed authors into a timeline."""
+    entries = []
+    for author_id in author_ids:
+        if followers_count(author_id) >= fanout_threshold():
+            continue
+        posts = Post.objects.filter(author_id=author_id).values_list(
+            "id", "created_at"
+        )[:BACKFILL_SIZE]
+        entries.extend(
+            TimelineEntry(
+                user_id=user_id,
+                post_id=post_id,
+                author_id=author_id,
+                created_at=created_at,
+            )
+            for post_id, created_at in posts
+        )
+
+    TimelineEntry.objects.bulk_create(
+        entries, batch_size=FANOUT_BATCH_SIZE, ignore_conflicts=True
+    )
+
+
+def prune_timeline(user_id, author_ids):
+    """Drop posts of unfollowed authors from a timeline."""
+    TimelineEntry.objects.filter(user_id=user_id, author_id__in=author_ids).delete()
+
+
+def schedule_fan_out(post):
+    transaction.on_commit(lambda: _run_in_background(fan_out_post, post.id))
+
+
+def schedule_fan_out_many(post_ids):
+    post_ids = list(post_ids)
+    transaction.on_commit(lambda: _run_in_background(fan_out_posts, post_ids))
+
+
+def schedule_backfill(user_id, author_ids):
+    author_ids = [author_id for author_id in author_ids if author_id != user_id]
+    transaction.on_commit(
+        lambda: _run_in_background(backfill_timeline, user_id, author_ids)
+    )
+
+
+def schedule_prune(user_id, author_ids):
+    author_ids = [author_id for author_id in author_ids if author_id != user_id]
+    transaction.on_commit(
+        lambda: _run_in_background(prune_timeline, user_id, author_ids)
+    )
+
+
+def feed_sources(user):
+    """Querysets of the posts in ``user``'s home timeline.
+
+    One holds the materialized timeline and one each followed large
+    account's posts; they share the ``feed_created_at``/``feed_post_id``
+    ordering and are merged by ``FeedPagination``.
+    """
+    celebrities = celebrity_profile_ids(user)
+
+    timeline = Post.objects.filter(timeline_entries__user=user).annotate(
+        feed_created_at=F("timeline_entries__created_at"),
+        feed_post_id=F("timeline_entries__post_id"),
+    )
+    if celebrities:
+        # Entries fanned out before the author became a large account.
+        timeline = timeline.exclude(profile_id__in=celebrities)
+
+    sources = [timeline] + [
+        Post.objects.filter(profile_id=profile_id).annotate(
+            feed_created_at=F("created_at"), feed_post_id=F("id")
+        )
+        for profile_id in celebrities
+    ]
+    return [source.select_related("profile") for source in sources]
@@ -0,0 +1,69 @@
+"""Set-based follow and unfollow of many users at once.
+
+Edges are written straight to the ``Profile.following`` through table with
+one ``bulk_create`` or one ``DELETE``, so the cost grows with the number of
+changed edges rather than with everything the profile already follows.
+Those writes fire no ``m2m_changed``; counters, timelines, cached profile
+responses and relationship sets are therefore updated here, once per batch.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from social import cache, counters, feed, relationships
+from social.models import Profile
+
+Follow = Profile.following.through
+
+MAX_BATCH_SIZE = 1_000
+
+
+def _lock(profile):
+    # Serialize batches of the same profile so the diff below stays exact.
+    Profile.objects.select_for_update().filter(id=profile.id).first()
+
+
+@transaction.atomic
+def follow(profile, user_ids):
+    """Follow every existing user of ``user_ids``; return the ids added."""
+    if not user_ids:
+        return []
+    _lock(profile)
+    added = list(
+        get_user_model()
+        .objects.filter(id__in=user_ids)
+        .exclude(id=profile.user_id)
+        .exclude(followers=profile)
+        .values_list("id", flat=True)
+    )
+    if not added:
+        return []
+
+    Follow.objects.bulk_create(
+        [Follow(profile_id=profile.id, user_id=user_id) for user_id in added],
+        ignore_conflicts=True,
+    )
+    counters.follows_added(profile.id, added)
+    feed.schedule_backfill(profile.user_id, added)
+    relationships.forget([profile.user_id, *added])
+    cache.invalidate(cache.PROFILES)
+    return added
+
+
+@transaction.atomic
+def unfollow(profile, user_ids):
+    """Stop following every user of ``user_ids``; return the ids removed."""
+    if not user_ids:
+        return []
+    _lock(profile)
+    edges = Follow.objects.filter(profile_id=profile.id, user_id__in=user_ids)
+    removed = list(edges.values_list("user_id", flat=True))
+    if not removed:
+        return []
+
+    edges.delete()
+    counters.follows_removed(profile.id, removed)
+    feed.schedule_prune(profile.user_id, removed)
+    relationships.forget([profile.user_id, *removed])
+    cache.invalidate(cache.PROFILES)
+    return removed
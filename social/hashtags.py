@@ -0,0 +1,78 @@
+"""Hashtag parsing and the ``Post`` <-> ``Hashtag`` index.
+
+Tags are ``#word`` tokens of a post's content plus every word of its legacy
+``hashtag`` field, stored lowercase so lookups hit the unique name index.
+"""
+
+import re
+
+from social.models import Hashtag, PostHashtag
+
+HASHTAG_RE = re.compile(r"#(\w+)")
+WORD_RE = re.compile(r"\w+")
+MAX_LENGTH = Hashtag._meta.get_field("name").max_length
+
+
+def normalize(name):
+    return name.strip().lstrip("#").lower()
+
+
+def parse_hashtags(content, hashtag=""):
+    names = set(HASHTAG_RE.findall(content)) | set(WORD_RE.findall(hashtag))
+    return {
+        normalized
+        for normalized in map(normalize, names)
+        if normalized and len(normalized) <= MAX_LENGTH
+    }
+
+
+def hashtag_ids(names):
+    """Map tag names to ids, creating the missing ``Hashtag`` rows."""
+    if not names:
+        return {}
+
+    Hashtag.objects.bulk_create(
+        [Hashtag(name=name) for name in names], ignore_conflicts=True
+    )
+    return dict(Hashtag.objects.filter(name__in=names).values_list("name", "id"))
+
+
+def tag_posts(posts, created=True):
+    """Point every post's hashtag links at the tags parsed from its text.
+
+    Returns ``{post.id: [hashtag ids added]}``.
+    """
+    parsed = {post.id: parse_hashtags(post.content, post.hashtag) for post in posts}
+    ids = hashtag_ids(set().union(*parsed.values()))
+    wanted = {
+        post_id: {ids[name] for name in names} for post_id, names in parsed.items()
+    }
+
+    existing = {post_id: set() for post_id in wanted}
+    if not created:
+        links = PostHashtag.objects.filter(post_id__in=wanted).values_list(
+            "post_id", "hashtag_id"
+        )
+        for post_id, hashtag_id in links:
+            existing[post_id].add(hashtag_id)
+
+        for post_id, hashtag_ids_ in existing.items():
+            stale = hashtag_ids_ - wanted[post_id]
+            if stale:
+                PostHashtag.objects.filter(
+                    post_id=post_id, hashtag_id__in=stale
+                ).delete()
+
+    added = {
+        post_id: sorted(hashtag_ids_ - existing[post_id])
+        for post_id, hashtag_ids_ in wanted.items()
+    }
+    PostHashtag.objects.bulk_create(
+        [
+            PostHashtag(post_id=post_id, hashtag_id=hashtag_id)
+            for post_id, hashtag_ids_ in added.items()
+            for hashtag_id in hashtag_ids_
+        ],
+        ignore_conflicts=True,
+    )
+    return added
@@ -0,0 +1,45 @@
+"""Bulk creation of posts.
+
+``bulk_create`` sends no ``post_save``, so ``create_posts`` applies what the
+post signals and ``PostViewSet.perform_create`` do for a single post —
+counters, hashtag links, trending buckets, the search index, cached
+responses and timeline fan-out — once per batch instead of once per post.
+"""
+
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+
+from social import cache, counters, feed, trending
+from social.hashtags import tag_posts
+from social.models import Post
+from social.search import get_search_backend
+
+BATCH_SIZE = getattr(settings, "SOCIAL_INGEST_BATCH_SIZE", 1_000)
+MAX_BULK_POSTS = getattr(settings, "SOCIAL_MAX_BULK_POSTS", 1_000)
+
+
+@transaction.atomic
+def create_posts(posts, batch_size=BATCH_SIZE, fan_out=True, record_trending=True):
+    """Insert unsaved ``posts`` and return them with their ids set.
+
+    ``fan_out`` and ``record_trending`` may be turned off for historical
+    imports that should neither fill home timelines nor trend now.
+    """
+    posts = Post.objects.bulk_create(posts, batch_size=batch_size)
+    if not posts:
+        return posts
+
+    for profile_id, count in Counter(post.profile_id for post in posts).items():
+        counters.posts_added(profile_id, count)
+
+    added = tag_posts(posts, created=True)
+    if record_trending:
+        trending.record_many((added[post.id], post.created_at) for post in posts)
+
+    get_search_backend().index(posts)
+    cache.invalidate(cache.POSTS, cache.PROFILES)
+    if fan_out:
+        feed.schedule_fan_out_many(post.id for post in posts)
+    return posts
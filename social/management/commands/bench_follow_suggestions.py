@@ -0,0 +1,60 @@
+import random
+import time
+from array import array
+
+from django.core.management.base import BaseCommand
+
+from social.suggestions import SUGGESTIONS_SIZE, FollowGraph, np
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark building a FollowGraph and computing suggestions on a "
+        "synthetic graph (the database is not touched)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100_000)
+        parser.add_argument("--edges", type=int, default=1_000_000)
+        parser.add_argument("--sample", type=int, default=10_000)
+        parser.add_argument("--size", type=int, default=SUGGESTIONS_SIZE)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--no-numpy", action="store_true", help="Use the array backend"
+        )
+
+    def handle(self, *args, **options):
+        users = options["users"]
+        rng = random.Random(options["seed"])
+
+        # Skewed followees: a few accounts collect most of the followers.
+        edges = set()
+        while len(edges) < options["edges"]:
+            source = rng.randrange(users)
+            target = int(users * rng.random() ** 3)
+            if source != target:
+                edges.add((source, target))
+        sources = array("q", (source for source, _ in edges))
+        targets = array("q", (target for _, target in edges))
+        del edges
+
+        use_numpy = np is not None and not options["no_numpy"]
+        started = time.perf_counter()
+        graph = FollowGraph.from_edges(sources, targets, use_numpy)
+        built = time.perf_counter() - started
+
+        nodes = rng.sample(range(len(graph)), min(options["sample"], len(graph)))
+        started = time.perf_counter()
+        for node in nodes:
+            graph.suggest(node, options["size"])
+        per_user = (time.perf_counter() - started) / len(nodes)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{'numpy' if use_numpy else 'array'} backend, "
+                f"{len(graph)} users, {len(sources)} edges: "
+                f"graph built in {built:.2f}s, "
+                f"{per_user * 1000:.3f} ms per user, "
+                f"~{per_user * len(graph):.0f}s for all users"
+            )
+        )
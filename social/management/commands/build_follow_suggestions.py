@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from social.suggestions import SUGGESTIONS_SIZE, build_suggestions
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored follow suggestions of every user"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size", type=int, default=SUGGESTIONS_SIZE)
+        parser.add_argument("--batch-size", type=int, default=1_000)
+
+    def handle(self, *args, **options):
+        written = build_suggestions(
+            k=options["size"], batch_size=options["batch_size"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Stored follow suggestions for {written} users")
+        )
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from social import trending
+
+
+class Command(BaseCommand):
+    help = (
+        "Merge old trending hashtag buckets into hourly rows, drop expired "
+        "ones and refresh the in-process rankings (run every few minutes)"
+    )
+
+    def handle(self, *args, **options):
+        expired, merged = trending.compact()
+        trending.refresh()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Dropped {expired} expired and compacted {merged} fine buckets"
+            )
+        )
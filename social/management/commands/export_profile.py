@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from social import export
+from social.models import Profile
+
+
+class Command(BaseCommand):
+    help = "Stream a profile's posts, followers or following as NDJSON or CSV"
+
+    def add_arguments(self, parser):
+        parser.add_argument("profile", type=int, help="Profile id")
+        parser.add_argument("resource", choices=list(export.RESOURCES))
+        parser.add_argument(
+            "--output", choices=list(export.FORMATS), default="ndjson"
+        )
+        parser.add_argument("--file", help="Write here instead of stdout")
+
+    def handle(self, *args, **options):
+        profile = Profile.objects.filter(id=options["profile"]).first()
+        if profile is None:
+            raise CommandError(f"Profile {options['profile']} does not exist")
+
+        lines = export.export_lines(profile, options["resource"], options["output"])
+        if options["file"]:
+            with open(options["file"], "w", encoding="utf-8", newline="") as file:
+                file.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending="")
@@ -0,0 +1,120 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand
+from rest_framework.exceptions import ValidationError
+
+from social.ingest import BATCH_SIZE, create_posts
+from social.models import Post, Profile
+from social.serializers import PostImportSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Import posts from newline-delimited JSON, one post object per line. "
+        'A line\'s "profile" key (a profile id) overrides --profile; '
+        '"created_at" (ISO 8601) keeps the original time, else it is now.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="NDJSON file, or - for stdin")
+        parser.add_argument("--profile", type=int, help="Default profile id")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            "--no-fan-out",
+            action="store_true",
+            help="Do not push imported posts into followers' home timelines",
+        )
+        parser.add_argument(
+            "--no-trending",
+            action="store_true",
+            help="Do not count imported posts towards trending hashtags",
+        )
+
+    def handle(self, *args, **options):
+        self.options = options
+        # One instance validates every line, as a ``many=True`` serializer
+        # does, so its fields are built once.
+        self.serializer = PostImportSerializer()
+        self.authors = {}
+        self.imported = self.skipped = 0
+
+        if options["path"] == "-":
+            self.import_lines(sys.stdin)
+        else:
+            with open(options["path"], encoding="utf-8") as lines:
+                self.import_lines(lines)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {self.imported} posts, skipped {self.skipped}"
+            )
+        )
+
+    def import_lines(self, lines):
+        batch = []
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            post = self.parse(number, line)
+            if post is None:
+                self.skipped += 1
+                continue
+            batch.append(post)
+            if len(batch) == self.options["batch_size"]:
+                self.flush(batch)
+                batch = []
+        self.flush(batch)
+
+    def parse(self, number, line):
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as error:
+            self.stderr.write(f"Line {number}: {error}")
+            return None
+        if not isinstance(data, dict):
+            self.stderr.write(f"Line {number}: expected a JSON object")
+            return None
+
+        profile_id = data.pop("profile", self.options["profile"])
+        if not isinstance(profile_id, int) or isinstance(profile_id, bool):
+            self.stderr.write(f"Line {number}: expected a profile id")
+            return None
+        try:
+            validated_data = self.serializer.run_validation(data)
+        except ValidationError as error:
+            self.stderr.write(f"Line {number}: {error.detail}")
+            return None
+        return Post(profile_id=profile_id, **validated_data)
+
+    def resolve_authors(self, batch):
+        """Set ``author_id`` from the profile; drop posts of unknown profiles."""
+        missing = {post.profile_id for post in batch} - self.authors.keys()
+        if missing:
+            self.authors.update(
+                Profile.objects.filter(id__in=missing).values_list("id", "user_id")
+            )
+            for profile_id in sorted(missing - self.authors.keys()):
+                self.stderr.write(f"Unknown profile {profile_id}")
+                self.authors[profile_id] = None
+
+        resolved = []
+        for post in batch:
+            post.author_id = self.authors[post.profile_id]
+            if post.author_id is None:
+                self.skipped += 1
+            else:
+                resolved.append(post)
+        return resolved
+
+    def flush(self, batch):
+        batch = self.resolve_authors(batch)
+        if not batch:
+            return
+        create_posts(
+            batch,
+            batch_size=self.options["batch_size"],
+            fan_out=not self.options["no_fan_out"],
+            record_trending=not self.options["no_trending"],
+        )
+        self.imported += len(batch)
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from social.counters import rebuild_counters
+from social.models import Profile
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored followers/following/posts counters of profiles"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "profile_ids",
+            nargs="*",
+            type=int,
+            help="Only rebuild these profiles (default: all)",
+        )
+
+    def handle(self, *args, **options):
+        queryset = Profile.objects.all()
+        if options["profile_ids"]:
+            queryset = queryset.filter(id__in=options["profile_ids"])
+
+        updated = rebuild_counters(queryset)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt counters of {updated} profiles"))
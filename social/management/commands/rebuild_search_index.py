@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from social.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index of posts"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1_000)
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        backend.rebuild(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt search index with {type(backend).__name__}")
+        )
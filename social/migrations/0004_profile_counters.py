@@ -0,0 +1,62 @@
+# Generated by Django 4.2.2 on 2026-10-18 18:54
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def _count(queryset, group_by):
+    return Coalesce(
+        Subquery(
+            queryset.order_by()
+            .values(group_by)
+            .annotate(total=Count("*"))
+            .values("total"),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def populate_counters(apps, schema_editor):
+    Profile = apps.get_model("social", "Profile")
+    Post = apps.get_model("social", "Post")
+    Follow = Profile.following.through
+
+    Profile.objects.update(
+        followers_count=_count(
+            Follow.objects.filter(user_id=OuterRef("user_id")), "user_id"
+        ),
+        following_count=_count(
+            Follow.objects.filter(profile_id=OuterRef("id")), "profile_id"
+        ),
+        posts_count=_count(
+            Post.objects.filter(profile_id=OuterRef("id")), "profile_id"
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("social", "0003_timelineentry"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="followers_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="following_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="posts_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
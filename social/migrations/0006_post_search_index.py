@@ -0,0 +1,46 @@
+from django.db import migrations
+
+SQLITE_CREATE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS social_post_fts "
+    "USING fts5(title, content, hashtag, tokenize='unicode61')",
+    "INSERT INTO social_post_fts (rowid, title, content, hashtag) "
+    "SELECT id, title, content, hashtag FROM social_post",
+)
+SQLITE_DROP = ("DROP TABLE IF EXISTS social_post_fts",)
+
+POSTGRES_CREATE = (
+    "CREATE TABLE IF NOT EXISTS social_post_search ("
+    "post_id bigint PRIMARY KEY REFERENCES social_post (id) "
+    "ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, "
+    "document tsvector NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS social_post_search_document_idx "
+    "ON social_post_search USING GIN (document)",
+    "INSERT INTO social_post_search (post_id, document) "
+    "SELECT id, "
+    "setweight(to_tsvector('english', title), 'A') || "
+    "setweight(to_tsvector('english', content), 'C') || "
+    "setweight(to_tsvector('english', hashtag), 'B') "
+    "FROM social_post",
+)
+POSTGRES_DROP = ("DROP TABLE IF EXISTS social_post_search",)
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, ()):
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("social", "0005_post_created_id_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({"sqlite": SQLITE_CREATE, "postgresql": POSTGRES_CREATE}),
+            _run({"sqlite": SQLITE_DROP, "postgresql": POSTGRES_DROP}),
+        ),
+    ]
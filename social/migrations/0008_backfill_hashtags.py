@@ -0,0 +1,53 @@
+import re
+
+from django.db import migrations
+
+HASHTAG_RE = re.compile(r"#(\w+)")
+WORD_RE = re.compile(r"\w+")
+BATCH_SIZE = 1_000
+
+
+def _parse(content, hashtag):
+    names = set(HASHTAG_RE.findall(content)) | set(WORD_RE.findall(hashtag))
+    return {name.lower() for name in names if len(name) <= 50}
+
+
+def backfill_hashtags(apps, schema_editor):
+    Post = apps.get_model("social", "Post")
+    Hashtag = apps.get_model("social", "Hashtag")
+    PostHashtag = apps.get_model("social", "PostHashtag")
+
+    def flush(batch):
+        names = set().union(*batch.values())
+        Hashtag.objects.bulk_create(
+            [Hashtag(name=name) for name in names], ignore_conflicts=True
+        )
+        ids = dict(Hashtag.objects.filter(name__in=names).values_list("name", "id"))
+        PostHashtag.objects.bulk_create(
+            [
+                PostHashtag(post_id=post_id, hashtag_id=ids[name])
+                for post_id, post_names in batch.items()
+                for name in post_names
+            ],
+            ignore_conflicts=True,
+        )
+
+    batch = {}
+    posts = Post.objects.values_list("id", "content", "hashtag").order_by("id")
+    for post_id, content, hashtag in posts.iterator(chunk_size=BATCH_SIZE):
+        batch[post_id] = _parse(content, hashtag)
+        if len(batch) == BATCH_SIZE:
+            flush(batch)
+            batch = {}
+    if batch:
+        flush(batch)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("social", "0007_hashtags"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_hashtags, migrations.RunPython.noop),
+    ]
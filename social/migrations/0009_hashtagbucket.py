@@ -0,0 +1,42 @@
+# Generated by Django 4.2.2 on 2026-10-18 19:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("social", "0008_backfill_hashtags"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="HashtagBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("start", models.DateTimeField()),
+                ("count", models.PositiveIntegerField(default=0)),
+                (
+                    "hashtag",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, to="social.hashtag"
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="hashtagbucket",
+            constraint=models.UniqueConstraint(
+                fields=("start", "hashtag"), name="unique_hashtag_bucket"
+            ),
+        ),
+    ]
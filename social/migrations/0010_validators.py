@@ -0,0 +1,30 @@
+# Generated by Django 4.2.2 on 2026-10-18 19:09
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def copy_created_at(apps, schema_editor):
+    Post = apps.get_model("social", "Post")
+    Post.objects.update(updated_at=F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("social", "0009_hashtagbucket"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="version",
+            field=models.PositiveBigIntegerField(default=1, editable=False),
+        ),
+        migrations.RunPython(copy_created_at, migrations.RunPython.noop),
+    ]
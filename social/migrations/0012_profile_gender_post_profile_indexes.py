@@ -0,0 +1,24 @@
+# Generated by Django 4.2.2 on 2026-10-18 19:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("social", "0011_followsuggestion"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["profile", "-created_at", "-id"],
+                name="post_profile_created_id_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="profile",
+            index=models.Index(fields=["gender", "id"], name="profile_gender_id_idx"),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.2 on 2026-10-18 20:19
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("social", "0013_profile_updated_at"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="post",
+            name="created_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
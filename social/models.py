@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models.functions import Lower
+from django.utils import timezone
 
 
 from py_social_media_api import settings
@@ -21,13 +23,57 @@ class Profile(models.Model):
     following = models.ManyToManyField(
         settings.AUTH_USER_MODEL, related_name="followers", blank=True
     )
+    followers_count = models.PositiveIntegerField(default=0, editable=False)
+    following_count = models.PositiveIntegerField(default=0, editable=False)
+    posts_count = models.PositiveIntegerField(default=0, editable=False)
+    version = models.PositiveBigIntegerField(default=1, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["gender", "id"], name="profile_gender_id_idx"),
+        ]
+
+    # Maintained with F() updates (see social.counters); a save() from an
+    # instance loaded earlier must not write back older values.
+    COUNTER_FIELDS = ("followers_count", "following_count", "posts_count", "version")
 
     def __str__(self):
         return self.first_name + " " + self.last_name
 
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.COUNTER_FIELDS
+                and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
     @property
     def full_name(self):
-        return f"{self.first_name} {self.last_name}"
+        return self.format_full_name(self.first_name, self.last_name)
+
+    @staticmethod
+    def format_full_name(first_name, last_name):
+        return f"{first_name} {last_name}"
+
+
+class Hashtag(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+
+    class Meta:
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(name=Lower("name")), name="hashtag_name_lowercase"
+            ),
+        ]
+
+    def __str__(self):
+        return f"#{self.name}"
 
 
 class Post(models.Model):
@@ -35,12 +81,110 @@ class Post(models.Model):
     title = models.CharField(max_length=70)
     content = models.TextField()
     media_attachments = models.URLField(max_length=255, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    # A default rather than auto_now_add, so imports can keep the original
+    # time; the API serializers keep it read-only.
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
     profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name="posts")
     hashtag = models.CharField(max_length=50, blank=True)
+    hashtags = models.ManyToManyField(
+        Hashtag, through="PostHashtag", related_name="posts", blank=True
+    )
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="post_created_id_idx"),
+            models.Index(
+                fields=["profile", "-created_at", "-id"],
+                name="post_profile_created_id_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
+
+
+class PostHashtag(models.Model):
+    post = models.ForeignKey(Post, on_delete=models.CASCADE)
+    hashtag = models.ForeignKey(Hashtag, on_delete=models.CASCADE)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["hashtag", "post"], name="unique_post_hashtag"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.post_id} {self.hashtag_id}"
+
+
+class HashtagBucket(models.Model):
+    """Number of posts tagged ``hashtag`` created in ``[start, start + bucket)``."""
+
+    hashtag = models.ForeignKey(Hashtag, on_delete=models.CASCADE)
+    start = models.DateTimeField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["start", "hashtag"], name="unique_hashtag_bucket"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.hashtag_id} @ {self.start}: {self.count}"
+
+
+class TimelineEntry(models.Model):
+    """Materialized home timeline row: ``post`` is visible in ``user``'s feed."""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="timeline_entries",
+    )
+    post = models.ForeignKey(
+        Post, on_delete=models.CASCADE, related_name="timeline_entries"
+    )
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+"
+    )
+    created_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "post"], name="unique_timeline_entry"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["user", "-created_at", "-post"],
+                name="timeline_user_created_idx",
+            ),
+            models.Index(fields=["user", "author"], name="timeline_user_author_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} <- {self.post_id}"
+
+
+class FollowSuggestion(models.Model):
+    """Precomputed "who to follow" list of ``user``.
+
+    ``candidates`` holds ``[user_id, mutual_follows]`` pairs, best first.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="follow_suggestion",
+    )
+    candidates = models.JSONField(default=list)
+    computed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.user_id}: {len(self.candidates)} suggestions"
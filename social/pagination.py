@@ -0,0 +1,267 @@
+import base64
+import datetime
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from social.multiget import MAX_ID
+
+
+class Pagination(PageNumberPagination):
+    page_size = 5
+    page_size_query_param = "page_size"
+    max_page_size = 30
+
+
+class KeysetPagination(BasePagination):
+    """Seek pagination on a unique ``ordering`` tuple.
+
+    Each page is a ``WHERE (ordering) < (last row) LIMIT n`` range scan, so
+    deep pages cost the same as the first one and no ``COUNT(*)`` is issued.
+    The last field of ``ordering`` must make the ordering unique.
+    """
+
+    page_size = Pagination.page_size
+    page_size_query_param = Pagination.page_size_query_param
+    max_page_size = Pagination.max_page_size
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+    ordering = ("-id",)
+
+    def __init__(self, ordering=None):
+        if ordering is not None:
+            self.ordering = tuple(ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request, queryset)
+
+        ordering = self._invert(self.ordering) if reverse else self.ordering
+        page = self.fetch(queryset, ordering, position, self.page_size + 1)
+        has_more = len(page) > self.page_size
+        page = page[: self.page_size]
+        if reverse:
+            page.reverse()
+
+        self.has_next = has_more if not reverse else True
+        self.has_previous = position is not None if not reverse else has_more
+        self.page = page
+        return page
+
+    def fetch(self, queryset, ordering, position, limit):
+        """Up to ``limit`` rows of ``queryset`` after ``position`` in ``ordering``."""
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._seek(ordering, position))
+        return list(queryset[:limit])
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self._position(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self._position(self.page[0]), reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Keyset cursor; pass an empty value for the first page",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+    def encode_cursor(self, position, reverse):
+        payload = {"p": [self._encode_value(value) for value in position]}
+        if reverse:
+            payload["r"] = 1
+        token = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request, queryset):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode()))
+            values = payload["p"]
+            if len(values) != len(self.ordering):
+                raise ValueError(token)
+            position = [
+                self._output_field(queryset, name).to_python(value)
+                for name, value in zip(self._names(self.ordering), values)
+            ]
+            if not all(map(self._bindable, position)):
+                raise ValueError(token)
+        except (TypeError, KeyError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, bool(payload.get("r"))
+
+    def _position(self, item):
+        names = self._names(self.ordering)
+        if isinstance(item, dict):
+            return [item[name] for name in names]
+        return [getattr(item, name) for name in names]
+
+    @staticmethod
+    def _bindable(value):
+        """Whether ``value`` can be compared against a column without erroring."""
+        if value is None:
+            return False
+        if isinstance(value, int):
+            return -MAX_ID - 1 <= value <= MAX_ID
+        return True
+
+    @staticmethod
+    def _names(ordering):
+        return [field.lstrip("-") for field in ordering]
+
+    @staticmethod
+    def _invert(ordering):
+        return tuple(
+            field[1:] if field.startswith("-") else f"-{field}" for field in ordering
+        )
+
+    @staticmethod
+    def _seek(ordering, position):
+        """Rows strictly after ``position`` in ``ordering``.
+
+        The leading inclusive bound lets the database turn the first column
+        into an index range; the disjunction then breaks ties.
+        """
+        lookups = [
+            (field.lstrip("-"), "lt" if field.startswith("-") else "gt")
+            for field in ordering
+        ]
+        first_name, first_op = lookups[0]
+        bound = Q(**{f"{first_name}__{first_op}e": position[0]})
+
+        after = Q()
+        for index, (name, op) in enumerate(lookups):
+            equal = {lookups[i][0]: position[i] for i in range(index)}
+            after |= Q(**equal, **{f"{name}__{op}": position[index]})
+        return bound & after
+
+    @staticmethod
+    def _output_field(queryset, name):
+        annotation = queryset.query.annotations.get(name)
+        if annotation is not None:
+            return annotation.output_field
+        return queryset.model._meta.get_field(name)
+
+    @staticmethod
+    def _encode_value(value):
+        if isinstance(value, (datetime.datetime, datetime.date)):
+            return value.isoformat()
+        return value
+
+
+class MergedKeysetPagination(KeysetPagination):
+    """``KeysetPagination`` over a list of querysets, merged in ``ordering``.
+
+    Each queryset is read with its own bounded range scan, so a page costs
+    one ``LIMIT n`` query per queryset instead of a sort of their union.
+    Rows must not repeat across querysets, and all fields of ``ordering``
+    must sort in the same direction.
+    """
+
+    def decode_cursor(self, request, queryset):
+        return super().decode_cursor(request, queryset[0])
+
+    def fetch(self, queryset, ordering, position, limit):
+        rows = []
+        for source in queryset:
+            rows.extend(super().fetch(source, ordering, position, limit))
+        rows.sort(key=self._position, reverse=ordering[0].startswith("-"))
+        return rows[:limit]
+
+
+class CursorOptInPagination(Pagination):
+    """Page-number pagination that switches to ``KeysetPagination`` on ``?cursor``."""
+
+    cursor_ordering = ("-id",)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if KeysetPagination.cursor_query_param in request.query_params:
+            self.keyset = KeysetPagination(self.cursor_ordering)
+            return self.keyset.paginate_queryset(queryset, request, view)
+
+        self.keyset = None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_count(self):
+        """Total the page-number response reports; ``None`` in cursor mode."""
+        if self.keyset is not None:
+            return None
+        return self.page.paginator.count
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        return parameters + KeysetPagination().get_schema_operation_parameters(view)[:1]
+
+
+class PostPagination(CursorOptInPagination):
+    cursor_ordering = ("-created_at", "-id")
+
+
+class ProfilePagination(CursorOptInPagination):
+    cursor_ordering = ("id",)
+
+
+class FeedPagination(MergedKeysetPagination):
+    """Cursor-only: a page number would need a count of the merged sources."""
+
+    ordering = ("-feed_created_at", "-feed_post_id")
@@ -0,0 +1,93 @@
+"""Follow relationship flags of a viewer toward a batch of profiles.
+
+Without a cache the flags are two ``EXISTS`` probes per profile against the
+unique ``(profile_id, user_id)`` index of the following through table, all
+in one query. With ``SOCIAL_RELATIONSHIP_CACHE`` enabled, the viewer's
+followed and follower user-id sets are kept in the response cache and the
+flags are set lookups. Sets bigger than ``SOCIAL_RELATIONSHIP_CACHE_MAX_SIZE``
+are not cached. Follow writes call ``forget`` for both ends of every
+changed edge, which only reaches other workers through a shared cache, so
+with a process-local backend the setting is ignored.
+"""
+
+from django.conf import settings
+from django.db.models import Exists, OuterRef
+
+from social.cache import get_cache
+from social.models import Profile
+from user.authentication import PROCESS_LOCAL_BACKENDS
+
+Follow = Profile.following.through
+
+MAX_PROFILES = 100
+TOO_LARGE = "too-large"
+
+
+def _cache_key(user_id):
+    return f"social:relationships:{user_id}"
+
+
+def cache_enabled():
+    return getattr(settings, "SOCIAL_RELATIONSHIP_CACHE", False) and not isinstance(
+        get_cache(), PROCESS_LOCAL_BACKENDS
+    )
+
+
+def forget(user_ids):
+    """Drop the cached id sets of ``user_ids`` after their follows changed."""
+    if cache_enabled():
+        get_cache().delete_many([_cache_key(user_id) for user_id in user_ids])
+
+
+def _id_sets(user_id):
+    """``(following, followers)`` user ids of ``user_id``, or ``None``."""
+    cache = get_cache()
+    key = _cache_key(user_id)
+    sets = cache.get(key)
+    if sets is None:
+        max_size = getattr(settings, "SOCIAL_RELATIONSHIP_CACHE_MAX_SIZE", 5_000)
+        following = Follow.objects.filter(profile__user_id=user_id).values_list(
+            "user_id", flat=True
+        )[: max_size + 1]
+        followers = Follow.objects.filter(user_id=user_id).values_list(
+            "profile__user_id", flat=True
+        )[: max_size + 1]
+        sets = (frozenset(following), frozenset(followers))
+        if max(map(len, sets)) > max_size:
+            sets = TOO_LARGE
+        cache.set(
+            key, sets, getattr(settings, "SOCIAL_RELATIONSHIP_CACHE_TIMEOUT", 300)
+        )
+    return None if sets == TOO_LARGE else sets
+
+
+def relationships(user, profile_ids):
+    """``{profile_id: (following, followed_by)}`` for the existing profiles.
+
+    ``following``: ``user`` follows the profile's user. ``followed_by``: the
+    profile follows ``user``.
+    """
+    profiles = Profile.objects.filter(id__in=profile_ids)
+
+    sets = _id_sets(user.id) if cache_enabled() else None
+    if sets is not None:
+        following, followers = sets
+        return {
+            profile_id: (profile_user_id in following, profile_user_id in followers)
+            for profile_id, profile_user_id in profiles.values_list("id", "user_id")
+        }
+
+    rows = profiles.annotate(
+        is_following=Exists(
+            Follow.objects.filter(
+                profile__user_id=user.id, user_id=OuterRef("user_id")
+            )
+        ),
+        is_followed_by=Exists(
+            Follow.objects.filter(profile_id=OuterRef("id"), user_id=user.id)
+        ),
+    ).values_list("id", "is_following", "is_followed_by")
+    return {
+        profile_id: (following, followed_by)
+        for profile_id, following, followed_by in rows
+    }
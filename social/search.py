@@ -0,0 +1,257 @@
+"""Full-text search over post title, content and hashtag.
+
+Backends keep an inverted index in sync with ``Post`` rows and answer
+queries with a ranked list of post ids read from the index alone; the
+caller then fetches just that page of posts by primary key.
+
+``SOCIAL_SEARCH_BACKEND`` may name a ``SearchBackend`` subclass by dotted
+path; otherwise one is picked from the database vendor, falling back to
+the index-less ``ContainsSearchBackend``.
+"""
+
+import re
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connections, router
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+from social.models import Post
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(query):
+    return TOKEN_RE.findall(query.lower())
+
+
+class SearchBackend:
+    fields = ("title", "content", "hashtag")
+
+    def index(self, posts):
+        """Add or replace ``posts`` in the index."""
+        raise NotImplementedError
+
+    def remove(self, post_ids):
+        raise NotImplementedError
+
+    def search(self, query, limit):
+        """Return up to ``limit`` post ids matching ``query``, best first."""
+        raise NotImplementedError
+
+    def rebuild(self, batch_size=1_000):
+        self.clear()
+        batch = []
+        for post in Post.objects.only(*self.fields).iterator(chunk_size=batch_size):
+            batch.append(post)
+            if len(batch) == batch_size:
+                self.index(batch)
+                batch = []
+        if batch:
+            self.index(batch)
+
+    def clear(self):
+        raise NotImplementedError
+
+    @staticmethod
+    def _write_connection():
+        return connections[router.db_for_write(Post)]
+
+    @staticmethod
+    def _batches(connection, rows, params_per_row):
+        """Split ``rows`` so one statement stays within the parameter limit.
+
+        Statements bind many rows with one ``execute()``; ``executemany()``
+        breaks the debug toolbar's SQL panel.
+        """
+        limit = connection.features.max_query_params
+        size = max(limit // params_per_row, 1) if limit else len(rows) or 1
+        for start in range(0, len(rows), size):
+            yield rows[start : start + size]
+
+    @staticmethod
+    def _values(rows, row_sql):
+        """``VALUES`` placeholders and flat parameters for ``rows``."""
+        placeholders = ", ".join([row_sql] * len(rows))
+        return placeholders, [value for row in rows for value in row]
+
+    @staticmethod
+    def _read_connection():
+        return connections[router.db_for_read(Post)]
+
+
+class SQLiteFTS5Backend(SearchBackend):
+    """SQLite FTS5 virtual table keyed on the post id (its ``rowid``).
+
+    The table is created by migration ``0006_post_search_index``.
+    """
+
+    table = "social_post_fts"
+
+    def index(self, posts):
+        rows = list(
+            {
+                post.id: (post.id, post.title, post.content, post.hashtag)
+                for post in posts
+            }.values()
+        )
+        connection = self._write_connection()
+        with connection.cursor() as cursor:
+            for batch in self._batches(connection, rows, 4):
+                self._delete(cursor, [row[0] for row in batch])
+                values, params = self._values(batch, "(%s, %s, %s, %s)")
+                cursor.execute(
+                    f"INSERT INTO {self.table} (rowid, title, content, hashtag) "
+                    f"VALUES {values}",
+                    params,
+                )
+
+    def remove(self, post_ids):
+        post_ids = list(post_ids)
+        connection = self._write_connection()
+        with connection.cursor() as cursor:
+            for batch in self._batches(connection, post_ids, 1):
+                self._delete(cursor, batch)
+
+    def _delete(self, cursor, post_ids):
+        placeholders = ", ".join(["%s"] * len(post_ids))
+        cursor.execute(
+            f"DELETE FROM {self.table} WHERE rowid IN ({placeholders})", post_ids
+        )
+
+    def clear(self):
+        with self._write_connection().cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+
+    def search(self, query, limit):
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        match = " ".join(f'"{token}"' for token in tokens)
+        # bm25() weights: title and hashtag hits outrank body hits.
+        with self._read_connection().cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s "
+                f"ORDER BY bm25({self.table}, 10.0, 1.0, 5.0) LIMIT %s",
+                [match, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+class PostgresSearchBackend(SearchBackend):
+    """Weighted ``tsvector`` documents in a side table with a GIN index.
+
+    The table is created by migration ``0006_post_search_index``.
+    """
+
+    table = "social_post_search"
+    config = "english"
+
+    def index(self, posts):
+        document = (
+            "setweight(to_tsvector(%s::regconfig, %s), 'A') || "
+            "setweight(to_tsvector(%s::regconfig, %s), 'C') || "
+            "setweight(to_tsvector(%s::regconfig, %s), 'B')"
+        )
+        # One INSERT cannot update the same post twice.
+        rows = list(
+            {
+                post.id: (
+                    post.id,
+                    self.config,
+                    post.title,
+                    self.config,
+                    post.content,
+                    self.config,
+                    post.hashtag,
+                )
+                for post in posts
+            }.values()
+        )
+        connection = self._write_connection()
+        with connection.cursor() as cursor:
+            for batch in self._batches(connection, rows, 7):
+                values, params = self._values(batch, f"(%s, {document})")
+                cursor.execute(
+                    f"INSERT INTO {self.table} (post_id, document) "
+                    f"VALUES {values} "
+                    f"ON CONFLICT (post_id) DO UPDATE SET "
+                    f"document = EXCLUDED.document",
+                    params,
+                )
+
+    def remove(self, post_ids):
+        with self._write_connection().cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {self.table} WHERE post_id = ANY(%s)", [list(post_ids)]
+            )
+
+    def clear(self):
+        with self._write_connection().cursor() as cursor:
+            cursor.execute(f"TRUNCATE {self.table}")
+
+    def search(self, query, limit):
+        if not tokenize(query):
+            return []
+
+        with self._read_connection().cursor() as cursor:
+            cursor.execute(
+                f"SELECT post_id FROM {self.table}, "
+                f"websearch_to_tsquery(%s::regconfig, %s) query "
+                f"WHERE document @@ query "
+                f"ORDER BY ts_rank_cd(document, query) DESC LIMIT %s",
+                [self.config, query, limit],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+
+class ContainsSearchBackend(SearchBackend):
+    """Substring search without an index, newest first.
+
+    Every query scans posts; it keeps search (and post saves, which index
+    through signals) working on databases without a full-text backend.
+    """
+
+    def index(self, posts):
+        pass
+
+    def remove(self, post_ids):
+        pass
+
+    def clear(self):
+        pass
+
+    def search(self, query, limit):
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        matches = Q()
+        for term in terms:
+            matches &= Q(
+                *(Q(**{f"{field}__icontains": term}) for field in self.fields),
+                _connector=Q.OR,
+            )
+        return list(
+            Post.objects.filter(matches)
+            .order_by("-created_at", "-id")
+            .values_list("id", flat=True)[:limit]
+        )
+
+
+BACKENDS = {
+    "sqlite": SQLiteFTS5Backend,
+    "postgresql": PostgresSearchBackend,
+}
+
+
+@lru_cache(maxsize=None)
+def get_search_backend():
+    path = getattr(settings, "SOCIAL_SEARCH_BACKEND", None)
+    if path:
+        return import_string(path)()
+
+    vendor = connections[router.db_for_read(Post)].vendor
+    return BACKENDS.get(vendor, ContainsSearchBackend)()
@@ -1,12 +1,18 @@
 from rest_framework import serializers
 
+from social.follows import MAX_BATCH_SIZE
 from social.models import Profile, Post
+from social.multiget import MAX_ID
 from user.serializers import UserSerializer
 
+PREVIEW_SIZE = 5
+
 
 class ProfileSerializer(serializers.ModelSerializer):
-    followers_count = serializers.SerializerMethodField()
-    posts_count = serializers.SerializerMethodField()
+    # Columns and function computing "full_name" for the list fast path.
+    row_sources = {
+        "full_name": (("first_name", "last_name"), Profile.format_full_name),
+    }
 
     class Meta:
         model = Profile
@@ -19,26 +25,32 @@ class ProfileSerializer(serializers.ModelSerializer):
             "posts_count",
         )
 
-    @staticmethod
-    def get_followers_count(obj):
-        return obj.user.followers.count()
-
-    @staticmethod
-    def get_posts_count(obj):
-        return obj.posts.count()
-
 
 class ProfilePostsSerializer(serializers.ModelSerializer):
     class Meta:
         model = Post
         fields = ("id", "title", "created_at",)
+        read_only_fields = ["created_at"]
+
+
+class ProfileSuggestionSerializer(ProfileSerializer):
+    mutual_follows = serializers.IntegerField(read_only=True)
+
+    class Meta(ProfileSerializer.Meta):
+        fields = ProfileSerializer.Meta.fields + ("mutual_follows",)
 
 
 class ProfileDetailSerializer(serializers.ModelSerializer):
+    """Profile with the first ``PREVIEW_SIZE`` posts, followers and followings.
+
+    Full lists are served by the paginated ``posts``, ``followers`` and
+    ``following`` actions of ``ProfileViewSet``.
+    """
+
     followers = serializers.SerializerMethodField()
     following = serializers.SerializerMethodField()
     user = UserSerializer(many=False, read_only=True)
-    posts = ProfilePostsSerializer(many=True, read_only=True)
+    posts = serializers.SerializerMethodField()
 
     class Meta:
         model = Profile
@@ -53,18 +65,30 @@ class ProfileDetailSerializer(serializers.ModelSerializer):
             "gender",
             "following",
             "followers",
+            "posts_count",
+            "following_count",
+            "followers_count",
         )
 
+    @staticmethod
+    def get_posts(obj):
+        posts = obj.posts.order_by("-created_at", "-id")[:PREVIEW_SIZE]
+        return ProfilePostsSerializer(posts, many=True).data
+
     @staticmethod
     def get_followers(obj):
         return [
-            followed_user.full_name for followed_user in obj.user.followers.all()
+            followed_user.full_name
+            for followed_user in obj.user.followers.order_by("id")[:PREVIEW_SIZE]
         ]
 
     @staticmethod
     def get_following(obj):
         return [
-            following_user.profiles.full_name for following_user in obj.following.all()
+            following_user.profiles.full_name
+            for following_user in obj.following.select_related("profiles").order_by(
+                "profiles__id"
+            )[:PREVIEW_SIZE]
         ]
 
 
@@ -83,6 +107,13 @@ class ProfileCreateUpdateSerializer(serializers.ModelSerializer):
 
 class PostSerializer(serializers.ModelSerializer):
     author = serializers.CharField(source="profile.full_name")
+    row_sources = {
+        "author": (
+            ("profile__first_name", "profile__last_name"),
+            Profile.format_full_name,
+        ),
+    }
+
     class Meta:
         model = Post
         fields = (
@@ -96,6 +127,7 @@ class PostSerializer(serializers.ModelSerializer):
         )
         read_only_fields = [
             "author",
+            "created_at",
         ]
 
 
@@ -115,4 +147,64 @@ class PostCreateUpdateSerializer(serializers.ModelSerializer):
         read_only_fields = [
             "author",
             "profile",
+            "created_at",
         ]
+
+
+class PostImportSerializer(PostCreateUpdateSerializer):
+    """Posts read by ``import_posts``, which keep their original ``created_at``.
+
+    API serializers keep ``created_at`` read-only: it orders lists, cursors,
+    timelines and trending windows.
+    """
+
+    created_at = serializers.DateTimeField(required=False)
+
+
+class TrendingHashtagSerializer(serializers.Serializer):
+    name = serializers.CharField()
+    count = serializers.IntegerField()
+
+
+class FollowSerializer(serializers.Serializer):
+    user_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1, max_value=MAX_ID),
+        allow_empty=False,
+        max_length=MAX_BATCH_SIZE,
+    )
+
+
+class BulkFollowSerializer(serializers.Serializer):
+    follow = serializers.ListField(
+        child=serializers.IntegerField(min_value=1, max_value=MAX_ID),
+        required=False,
+        max_length=MAX_BATCH_SIZE,
+    )
+    unfollow = serializers.ListField(
+        child=serializers.IntegerField(min_value=1, max_value=MAX_ID),
+        required=False,
+        max_length=MAX_BATCH_SIZE,
+    )
+
+    def validate(self, data):
+        follow = set(data.get("follow", []))
+        unfollow = set(data.get("unfollow", []))
+        if not follow and not unfollow:
+            raise serializers.ValidationError("Nothing to follow or unfollow")
+        if follow & unfollow:
+            raise serializers.ValidationError(
+                "Users cannot be followed and unfollowed at once"
+            )
+        return data
+
+
+class FollowResultSerializer(serializers.Serializer):
+    followed = serializers.ListField(child=serializers.IntegerField())
+    unfollowed = serializers.ListField(child=serializers.IntegerField())
+
+
+class RelationshipSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    following = serializers.BooleanField()
+    followed_by = serializers.BooleanField()
+    mutual = serializers.BooleanField()
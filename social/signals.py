@@ -0,0 +1,142 @@
+from django.conf import settings
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from social import cache, counters, feed, relationships, trending
+from social.hashtags import tag_posts
+from social.search import get_search_backend
+from social.models import Post, Profile
+
+Follow = Profile.following.through
+
+
+def _existing_follow_ids(instance, reverse, pk_set=None):
+    if reverse:
+        rows = Follow.objects.filter(user_id=instance.pk)
+        column = "profile_id"
+        if pk_set is not None:
+            rows = rows.filter(profile_id__in=pk_set)
+    else:
+        rows = Follow.objects.filter(profile_id=instance.pk)
+        column = "user_id"
+        if pk_set is not None:
+            rows = rows.filter(user_id__in=pk_set)
+    return set(rows.values_list(column, flat=True))
+
+
+@receiver(m2m_changed, sender=Follow)
+def sync_follow_changes(sender, instance, action, reverse, pk_set, **kwargs):
+    # ``pk_set`` of ``post_remove`` holds every requested id, not only the
+    # rows that existed, and ``post_clear`` carries none; capture the real
+    # edges before the delete so counters and timelines stay exact.
+    if action == "pre_remove":
+        instance._removed_follow_ids = _existing_follow_ids(instance, reverse, pk_set)
+        return
+    if action == "pre_clear":
+        instance._removed_follow_ids = _existing_follow_ids(instance, reverse)
+        return
+
+    if action == "post_add":
+        changed = pk_set or set()
+    elif action in ("post_remove", "post_clear"):
+        changed = instance.__dict__.pop("_removed_follow_ids", set())
+    else:
+        return
+
+    if not changed:
+        return
+
+    added = action == "post_add"
+    schedule = feed.schedule_backfill if added else feed.schedule_prune
+
+    if reverse:
+        update = counters.followers_added if added else counters.followers_removed
+        update(instance.pk, changed)
+        follower_ids = list(
+            Profile.objects.filter(id__in=changed).values_list("user_id", flat=True)
+        )
+        for user_id in follower_ids:
+            schedule(user_id, [instance.pk])
+        relationships.forget([instance.pk, *follower_ids])
+    else:
+        update = counters.follows_added if added else counters.follows_removed
+        update(instance.pk, changed)
+        schedule(instance.user_id, list(changed))
+        relationships.forget([instance.user_id, *changed])
+
+
+@receiver(post_save, sender=Post)
+def count_created_post(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        counters.posts_added(instance.profile_id)
+    else:
+        counters.touch(instance.profile_id)
+
+
+@receiver(post_delete, sender=Post)
+def count_deleted_post(sender, instance, **kwargs):
+    counters.posts_removed(instance.profile_id)
+
+
+@receiver(post_save, sender=Post)
+def tag_saved_post(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        added = tag_posts([instance], created=created)
+        if created:
+            trending.record(added[instance.id], instance.created_at)
+
+
+@receiver(post_save, sender=Post)
+def index_saved_post(sender, instance, raw=False, **kwargs):
+    if not raw:
+        get_search_backend().index([instance])
+
+
+@receiver(post_delete, sender=Post)
+def unindex_deleted_post(sender, instance, **kwargs):
+    get_search_backend().remove([instance.id])
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def bump_user_profile_version(
+    sender, instance, created, raw=False, update_fields=None, **kwargs
+):
+    # Profile detail embeds the user's email; logins only touch last_login.
+    if raw or created or update_fields == frozenset({"last_login"}):
+        return
+    Profile.objects.filter(user=instance).update(version=F("version") + 1)
+    cache.invalidate(cache.PROFILES)
+
+
+@receiver(post_save, sender=Profile)
+def bump_profile_version(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        return
+    # Post validators include the author's version and updated_at, so the
+    # author's posts need no rewrite.
+    counters.touch(instance.id)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_cached_posts(sender, created=True, **kwargs):
+    # Creating or deleting a post also changes its author's posts_count.
+    if created:
+        cache.invalidate(cache.POSTS, cache.PROFILES)
+    else:
+        cache.invalidate(cache.POSTS)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_cached_profiles(sender, **kwargs):
+    cache.invalidate(cache.PROFILES, cache.AUTHORS)
+
+
+@receiver(m2m_changed, sender=Follow)
+def invalidate_cached_follows(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        cache.invalidate(cache.PROFILES)
@@ -0,0 +1,111 @@
+"""Sparse fieldsets: ``?fields=`` and ``?omit=`` on list and detail reads.
+
+Unrequested fields are dropped from the serializer, and the projection is
+pushed into the queryset. Model columns read only by dropped fields are
+deferred, and ``select_related`` joins that no remaining field traverses
+are removed. Large text columns a client did not ask for are then neither
+selected nor rendered.
+"""
+
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.exceptions import ValidationError
+
+SPARSE_PARAMETERS = [
+    OpenApiParameter(
+        "fields",
+        type=OpenApiTypes.STR,
+        description="Comma-separated fields to return (ex. ?fields=id,title)",
+    ),
+    OpenApiParameter(
+        "omit",
+        type=OpenApiTypes.STR,
+        description="Comma-separated fields to leave out (ex. ?omit=content)",
+    ),
+]
+
+
+def _names(value):
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+class SparseFieldsMixin:
+    """Viewsets list every column a view needs beyond its serializer
+    (validators, keyset ordering) in ``validator_fields``; those are never
+    deferred.
+    """
+
+    sparse_actions = ("list", "retrieve")
+
+    def sparse_fields(self):
+        """Names of the serializer fields to keep, or ``None`` for all."""
+        if not hasattr(self, "_sparse_fields"):
+            self._sparse_fields = self._parse_sparse_fields()
+        return self._sparse_fields
+
+    def _parse_sparse_fields(self):
+        params = self.request.query_params
+        if self.action not in self.sparse_actions or not (
+            "fields" in params or "omit" in params
+        ):
+            return None
+
+        available = list(self.get_serializer_class()().fields)
+        wanted = _names(params["fields"]) if "fields" in params else set(available)
+        omitted = _names(params.get("omit", ""))
+        unknown = (wanted | omitted) - set(available)
+        if unknown:
+            raise ValidationError(
+                {
+                    "fields": f"Unknown fields: {', '.join(sorted(unknown))}. "
+                    f"Available: {', '.join(available)}"
+                }
+            )
+        return [name for name in available if name in wanted - omitted]
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        keep = self.sparse_fields()
+        if keep is not None:
+            fields = getattr(serializer, "child", serializer).fields
+            for name in list(fields):
+                if name not in keep:
+                    del fields[name]
+        return serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        keep = self.sparse_fields()
+        if keep is None:
+            return queryset
+        return self._project(queryset, keep)
+
+    def _project(self, queryset, keep):
+        fields = self.get_serializer_class()().fields
+        kept = {fields[name].source.split(".")[0] for name in fields if name in keep}
+        if "*" in kept:
+            # Method fields may read anything: leave the query alone.
+            return queryset
+        dropped = {
+            fields[name].source.split(".")[0] for name in fields if name not in keep
+        }
+
+        columns = {field.name: field for field in queryset.model._meta.concrete_fields}
+        deferred = [
+            name
+            for name in dropped - kept - set(self.validator_fields)
+            if name in columns
+            and not columns[name].is_relation
+            and not columns[name].primary_key
+        ]
+        if deferred:
+            queryset = queryset.defer(*deferred)
+
+        joins = queryset.query.select_related
+        if isinstance(joins, dict) and not joins.keys() <= kept:
+            # An empty select_related() would follow every foreign key.
+            queryset = queryset.select_related(None)
+            needed = [name for name in joins if name in kept]
+            if needed:
+                queryset = queryset.select_related(*needed)
+        return queryset
@@ -0,0 +1,227 @@
+""""Who to follow" suggestions from a precomputed friends-of-friends graph.
+
+``build_suggestions`` loads the whole follow table once into a
+``FollowGraph``: compressed sparse rows over dense node indexes, backed by
+NumPy arrays when NumPy is installed and by ``array`` otherwise. For every
+user it ranks the accounts followed by the people they follow by the number
+of such mutual follows. The top candidates are stored in one
+``FollowSuggestion`` row per user, so serving them is a primary-key lookup.
+"""
+
+import heapq
+from array import array
+from bisect import bisect_left
+from collections import Counter
+
+from django.conf import settings
+from django.utils import timezone
+
+from social.models import FollowSuggestion, Profile
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised where NumPy is missing
+    np = None
+
+Follow = Profile.following.through
+
+SUGGESTIONS_SIZE = getattr(settings, "SOCIAL_SUGGESTIONS_SIZE", 20)
+
+
+class FollowGraph:
+    """Followees of node ``i`` are ``targets[offsets[i]:offsets[i + 1]]``.
+
+    Nodes are indexes into the sorted ``ids`` (user ids), so ranking ties
+    broken on the node index are broken on the user id.
+    """
+
+    def __init__(self, ids, offsets, targets):
+        self.ids = ids
+        self.offsets = offsets
+        self.targets = targets
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def uses_numpy(self):
+        return np is not None and isinstance(self.targets, np.ndarray)
+
+    @classmethod
+    def from_edges(cls, sources, targets, use_numpy=None):
+        """Build from parallel sequences of follower and followee user ids.
+
+        Edges are expected to be unique, as in the follow table.
+        """
+        if use_numpy is None:
+            use_numpy = np is not None
+        if use_numpy:
+            return cls._from_edges_numpy(sources, targets)
+        return cls._from_edges_array(sources, targets)
+
+    @classmethod
+    def _from_edges_numpy(cls, sources, targets):
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        ids, nodes = np.unique(
+            np.concatenate([sources, targets]), return_inverse=True
+        )
+        sources, targets = nodes[: len(sources)], nodes[len(sources):]
+
+        order = np.lexsort((targets, sources))
+        sources, targets = sources[order], targets[order]
+        offsets = np.zeros(len(ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=len(ids)), out=offsets[1:])
+        return cls(ids, offsets, targets)
+
+    @classmethod
+    def _from_edges_array(cls, sources, targets):
+        ids = sorted(set(sources).union(targets))
+        node = {user_id: index for index, user_id in enumerate(ids)}
+        edges = sorted(
+            (node[source], node[target]) for source, target in zip(sources, targets)
+        )
+
+        offsets = array("q", bytes(8 * (len(ids) + 1)))
+        for source, _ in edges:
+            offsets[source + 1] += 1
+        for index in range(len(ids)):
+            offsets[index + 1] += offsets[index]
+        return cls(ids, offsets, array("q", (target for _, target in edges)))
+
+    def node(self, user_id):
+        """Node index of ``user_id``, or ``None`` if it has no edges."""
+        if self.uses_numpy:
+            index = int(np.searchsorted(self.ids, user_id))
+        else:
+            index = bisect_left(self.ids, user_id)
+        if index < len(self.ids) and self.ids[index] == user_id:
+            return index
+        return None
+
+    def suggest(self, node, k=SUGGESTIONS_SIZE):
+        """Top ``k`` ``(user_id, mutual_follows)`` of ``node``, best first."""
+        if self.uses_numpy:
+            return self._suggest_numpy(node, k)
+        return self._suggest_array(node, k)
+
+    def _suggest_numpy(self, node, k):
+        offsets, targets = self.offsets, self.targets
+        followed = targets[offsets[node]:offsets[node + 1]]
+        starts = offsets[followed]
+        lengths = offsets[followed + 1] - starts
+        total = int(lengths.sum())
+        if not total:
+            return []
+
+        # Concatenate the followee slices of every followed node at once.
+        shift = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        candidates, counts = np.unique(
+            targets[shift + np.arange(total)], return_counts=True
+        )
+        keep = ~np.isin(candidates, followed) & (candidates != node)
+        candidates, counts = candidates[keep], counts[keep]
+        best = np.lexsort((candidates, -counts))[:k]
+        return list(
+            zip(self.ids[candidates[best]].tolist(), counts[best].tolist())
+        )
+
+    def _suggest_array(self, node, k):
+        offsets, targets = self.offsets, self.targets
+        followed = targets[offsets[node]:offsets[node + 1]]
+        counts = Counter()
+        for followee in followed:
+            counts.update(targets[offsets[followee]:offsets[followee + 1]])
+
+        excluded = set(followed)
+        excluded.add(node)
+        best = heapq.nlargest(
+            k,
+            (
+                (count, -candidate)
+                for candidate, count in counts.items()
+                if candidate not in excluded
+            ),
+        )
+        return [(self.ids[-candidate], count) for count, candidate in best]
+
+
+def load_graph(use_numpy=None):
+    """The follow table as a ``FollowGraph`` of follower -> followee user ids."""
+    sources, targets = array("q"), array("q")
+    for source, target in Follow.objects.values_list(
+        "profile__user_id", "user_id"
+    ).iterator(chunk_size=10_000):
+        sources.append(source)
+        targets.append(target)
+    return FollowGraph.from_edges(sources, targets, use_numpy)
+
+
+def build_suggestions(k=SUGGESTIONS_SIZE, batch_size=1_000, use_numpy=None):
+    """Recompute and store the suggestions of every user who follows someone.
+
+    Rows of users who no longer follow anyone are deleted. Returns the
+    number of rows written.
+    """
+    graph = load_graph(use_numpy)
+    computed_at = timezone.now()
+    written = 0
+    batch = []
+
+    def flush():
+        FollowSuggestion.objects.bulk_create(
+            batch,
+            update_conflicts=True,
+            unique_fields=["user"],
+            update_fields=["candidates", "computed_at"],
+        )
+
+    for node in range(len(graph)):
+        if graph.offsets[node] == graph.offsets[node + 1]:
+            continue
+        batch.append(
+            FollowSuggestion(
+                user_id=int(graph.ids[node]),
+                candidates=[list(pair) for pair in graph.suggest(node, k)],
+                computed_at=computed_at,
+            )
+        )
+        if len(batch) == batch_size:
+            flush()
+            written += len(batch)
+            batch = []
+    if batch:
+        flush()
+        written += len(batch)
+
+    FollowSuggestion.objects.filter(computed_at__lt=computed_at).delete()
+    return written
+
+
+def suggested_profiles(user, limit=SUGGESTIONS_SIZE):
+    """Profiles suggested to ``user``, best first, each with ``mutual_follows``.
+
+    Accounts followed since the last build are left out.
+    """
+    candidates = (
+        FollowSuggestion.objects.filter(user=user)
+        .values_list("candidates", flat=True)
+        .first()
+    )
+    if not candidates:
+        return []
+
+    mutual = dict(candidates[:limit])
+    profiles = {
+        profile.user_id: profile
+        for profile in Profile.objects.filter(user_id__in=mutual).exclude(
+            user__followers__user=user
+        )
+    }
+    suggested = []
+    for user_id, count in mutual.items():
+        profile = profiles.get(user_id)
+        if profile is not None:
+            profile.mutual_follows = count
+            suggested.append(profile)
+    return suggested
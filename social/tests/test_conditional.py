@@ -0,0 +1,191 @@
+import datetime
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from social.tests.test_social_media_api import sample_profile, sample_post
+
+PROFILE_URL = reverse("social:profile-list")
+POST_URL = reverse("social:post-list")
+
+
+def profile_detail_url(profile_id):
+    return reverse("social:profile-detail", args=[profile_id])
+
+
+def post_detail_url(post_id):
+    return reverse("social:post-detail", args=[post_id])
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("me@test.com", "testpass1")
+        self.profile = sample_profile(user=self.user)
+        self.client.force_authenticate(self.user)
+
+    def post(self, **params):
+        return sample_post(author=self.user, profile=self.profile, **params)
+
+    def assertNotModified(self, url, etag, queries):
+        with self.assertNumQueries(queries):
+            res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res["ETag"], etag)
+
+    def assertModified(self, url, etag):
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+
+    def test_post_list_etag_tracks_inserts_edits_and_deletes(self):
+        post = self.post()
+        etag = self.client.get(POST_URL)["ETag"]
+        # The page and its count (a window function) in one query.
+        self.assertNotModified(POST_URL, etag, queries=1)
+
+        other = self.post()
+        self.assertModified(POST_URL, etag)
+        etag = self.client.get(POST_URL)["ETag"]
+
+        post.title = "edited"
+        post.save()
+        self.assertModified(POST_URL, etag)
+        etag = self.client.get(POST_URL)["ETag"]
+
+        other.delete()
+        self.assertModified(POST_URL, etag)
+
+    def test_post_detail_last_modified(self):
+        post = self.post()
+        res = self.client.get(post_detail_url(post.id))
+
+        with self.assertNumQueries(1):
+            again = self.client.get(
+                post_detail_url(post.id),
+                HTTP_IF_MODIFIED_SINCE=res["Last-Modified"],
+            )
+
+        self.assertEqual(again.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_author_rename_changes_post_etag(self):
+        post = self.post()
+        etag = self.client.get(post_detail_url(post.id))["ETag"]
+
+        self.profile.first_name = "renamed"
+        self.profile.save()
+
+        self.assertModified(post_detail_url(post.id), etag)
+
+    def test_author_rename_does_not_rewrite_posts(self):
+        post = self.post()
+        updated_at = post.updated_at
+        res = self.client.get(post_detail_url(post.id))
+
+        later = timezone.now() + datetime.timedelta(minutes=1)
+        with mock.patch("django.utils.timezone.now", return_value=later):
+            self.profile.first_name = "renamed"
+            self.profile.save()
+
+        post.refresh_from_db()
+        self.assertEqual(post.updated_at, updated_at)
+        again = self.client.get(
+            post_detail_url(post.id), HTTP_IF_MODIFIED_SINCE=res["Last-Modified"]
+        )
+        self.assertEqual(again.status_code, status.HTTP_200_OK)
+
+    def test_stale_profile_save_keeps_counters_and_version(self):
+        self.post()
+        self.profile.refresh_from_db()
+        stale = type(self.profile).objects.get(id=self.profile.id)
+        self.post()
+
+        stale.first_name = "renamed"
+        stale.save()
+
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.posts_count, 2)
+        self.assertGreater(self.profile.version, stale.version)
+
+    def test_profile_detail_etag_tracks_follows_and_posts(self):
+        url = profile_detail_url(self.profile.id)
+        etag = self.client.get(url)["ETag"]
+        # The preview validators are subqueries of the profile's query.
+        self.assertNotModified(url, etag, queries=1)
+
+        other = get_user_model().objects.create_user("other@test.com")
+        sample_profile(user=other).following.add(self.user)
+        self.assertModified(url, etag)
+        etag = self.client.get(url)["ETag"]
+
+        self.post()
+        self.assertModified(url, etag)
+
+    def test_profile_detail_etag_tracks_preview_renames(self):
+        other = get_user_model().objects.create_user("other@test.com")
+        follower = sample_profile(user=other)
+        follower.following.add(self.user)
+        self.profile.following.add(other)
+        url = profile_detail_url(self.profile.id)
+        etag = self.client.get(url)["ETag"]
+
+        follower.first_name = "renamed"
+        follower.save()
+
+        self.assertModified(url, etag)
+
+    def test_profile_list_etag_tracks_profile_changes(self):
+        etag = self.client.get(PROFILE_URL)["ETag"]
+        self.assertNotModified(PROFILE_URL, etag, queries=1)
+
+        self.profile.avatar = "https://example.com/a.png"
+        self.profile.save()
+
+        self.assertModified(PROFILE_URL, etag)
+
+    def test_cursor_page_revalidates_in_one_query(self):
+        self.post()
+        etag = self.client.get(POST_URL, {"cursor": ""})["ETag"]
+
+        with self.assertNumQueries(1):
+            res = self.client.get(POST_URL, {"cursor": ""}, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_unconditional_get_adds_no_query(self):
+        self.post()
+
+        with self.assertNumQueries(2):
+            res = self.client.get(POST_URL)
+
+        self.assertIn("ETag", res)
+
+    def test_batch_retrieval_has_no_validators(self):
+        post = self.post()
+
+        res = self.client.get(POST_URL, {"ids": post.id}, HTTP_IF_NONE_MATCH="*")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn("ETag", res)
+
+    def test_query_string_is_part_of_the_etag(self):
+        self.post()
+
+        first = self.client.get(POST_URL, {"page_size": 1})
+        second = self.client.get(POST_URL, {"page_size": 2})
+
+        self.assertNotEqual(first["ETag"], second["ETag"])
+
+    def test_unknown_detail_is_still_404(self):
+        self.assertEqual(
+            self.client.get(post_detail_url(0)).status_code, status.HTTP_404_NOT_FOUND
+        )
+        self.assertEqual(
+            self.client.get(profile_detail_url("x")).status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
@@ -0,0 +1,76 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from social.models import Profile
+from social.tests.test_social_media_api import sample_profile, sample_post
+
+PROFILE_URL = reverse("social:profile-list")
+
+
+class ProfileCountersTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("me@test.com", "testpass1")
+        self.other = get_user_model().objects.create_user(
+            "other@test.com", "testpass1"
+        )
+        self.profile = sample_profile(user=self.user)
+        self.other_profile = sample_profile(user=self.other)
+
+    def assertCounters(self, profile, followers, following, posts):
+        profile.refresh_from_db()
+        self.assertEqual(
+            (profile.followers_count, profile.following_count, profile.posts_count),
+            (followers, following, posts),
+        )
+
+    def test_follow_and_unfollow_update_counters(self):
+        self.profile.following.add(self.other)
+        self.profile.following.add(self.other)
+        self.assertCounters(self.profile, 0, 1, 0)
+        self.assertCounters(self.other_profile, 1, 0, 0)
+
+        self.profile.following.remove(self.other)
+        self.profile.following.remove(self.other)
+        self.assertCounters(self.profile, 0, 0, 0)
+        self.assertCounters(self.other_profile, 0, 0, 0)
+
+    def test_reverse_follow_and_clear_update_counters(self):
+        self.user.followers.add(self.other_profile)
+        self.assertCounters(self.profile, 1, 0, 0)
+        self.assertCounters(self.other_profile, 0, 1, 0)
+
+        self.other_profile.following.clear()
+        self.assertCounters(self.profile, 0, 0, 0)
+        self.assertCounters(self.other_profile, 0, 0, 0)
+
+    def test_post_create_and_delete_update_counter(self):
+        post = sample_post(author=self.user, profile=self.profile)
+        sample_post(author=self.user, profile=self.profile)
+        self.assertCounters(self.profile, 0, 0, 2)
+
+        post.delete()
+        self.assertCounters(self.profile, 0, 0, 1)
+
+    def test_rebuild_command_fixes_drift(self):
+        self.profile.following.add(self.other)
+        sample_post(author=self.user, profile=self.profile)
+        Profile.objects.update(followers_count=7, following_count=7, posts_count=7)
+
+        call_command("rebuild_profile_counters", stdout=StringIO())
+
+        self.assertCounters(self.profile, 0, 1, 1)
+        self.assertCounters(self.other_profile, 1, 0, 0)
+
+    def test_list_profiles_does_not_prefetch(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        with self.assertNumQueries(2):
+            res = client.get(PROFILE_URL)
+
+        self.assertEqual(res.data["count"], 2)
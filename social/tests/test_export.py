@@ -0,0 +1,117 @@
+import csv
+import json
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from social.tests.test_social_media_api import sample_profile, sample_post
+
+
+def export_url(profile_id):
+    return reverse("social:profile-export", args=[profile_id])
+
+
+class ProfileExportTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("me@test.com")
+        self.profile = sample_profile(user=self.user, first_name="Zoë")
+        self.others = [
+            get_user_model().objects.create_user(f"user{number}@test.com")
+            for number in range(3)
+        ]
+        self.other_profiles = [sample_profile(user=other) for other in self.others]
+        self.profile.following.add(self.others[0])
+        for other_profile in self.other_profiles[1:]:
+            other_profile.following.add(self.user)
+        self.posts = [
+            sample_post(author=self.user, profile=self.profile, title=f"post {number}")
+            for number in range(3)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def export(self, **params):
+        res = self.client.get(export_url(self.profile.id), params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        return b"".join(res.streaming_content).decode()
+
+    def test_posts_as_ndjson(self):
+        rows = [
+            json.loads(line)
+            for line in self.export(resource="posts").splitlines()
+        ]
+
+        self.assertEqual([row["id"] for row in rows], [post.id for post in self.posts])
+        self.assertEqual(rows[0]["title"], "post 0")
+
+    def test_followers_and_following_as_csv(self):
+        followers = list(
+            csv.DictReader(StringIO(self.export(resource="followers", output="csv")))
+        )
+        following = list(
+            csv.DictReader(StringIO(self.export(resource="following", output="csv")))
+        )
+
+        self.assertEqual(
+            [int(row["id"]) for row in followers],
+            [profile.id for profile in self.other_profiles[1:]],
+        )
+        self.assertEqual(
+            [int(row["user_id"]) for row in following], [self.others[0].id]
+        )
+
+    def test_attachment_headers(self):
+        res = self.client.get(
+            export_url(self.profile.id), {"resource": "posts", "output": "csv"}
+        )
+
+        self.assertEqual(res["Content-Type"], "text/csv")
+        self.assertIn(
+            f"profile-{self.profile.id}-posts.csv", res["Content-Disposition"]
+        )
+
+    def test_invalid_parameters(self):
+        for params in (
+            {},
+            {"resource": "likes"},
+            {"resource": "posts", "output": "xml"},
+        ):
+            res = self.client.get(export_url(self.profile.id), params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_only_owner_can_export(self):
+        res = self.client.get(
+            export_url(self.other_profiles[0].id), {"resource": "posts"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_command_writes_file(self):
+        with tempfile.NamedTemporaryFile(suffix=".ndjson") as file:
+            call_command(
+                "export_profile", self.profile.id, "posts", "--file", file.name
+            )
+            lines = file.read().decode().splitlines()
+
+        self.assertEqual(len(lines), 3)
+
+    def test_command_streams_to_stdout(self):
+        stdout = StringIO()
+
+        call_command(
+            "export_profile",
+            self.profile.id,
+            "followers",
+            "--output",
+            "csv",
+            stdout=stdout,
+        )
+
+        self.assertEqual(len(stdout.getvalue().splitlines()), 3)
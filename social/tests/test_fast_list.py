@@ -0,0 +1,152 @@
+import datetime
+from unittest import skipIf
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from social import fastpath
+from social.models import Post
+from social.serializers import (
+    PostSerializer,
+    ProfileDetailSerializer,
+    ProfileSerializer,
+)
+from social.tests.test_social_media_api import sample_post, sample_profile
+
+POST_URL = reverse("social:post-list")
+PROFILE_URL = reverse("social:profile-list")
+
+NAMES = [
+    ("Zoë", "O'Brien"),
+    ('Line\u2028"Sep"', "Para\u2029graph"),
+    ("Tab\tNew\nline", "Ctrl\x01\x7f"),
+    ("日本", "😀 \\ </script>"),
+]
+
+
+class FastListParityTests(TestCase):
+    """The fast path renders the same bytes as the serializers."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("me@test.com", "testpass1")
+        self.client.force_authenticate(self.user)
+
+        base = timezone.now().replace(microsecond=0)
+        for index, (first_name, last_name) in enumerate(NAMES):
+            user = get_user_model().objects.create_user(f"user{index}@test.com")
+            profile = sample_profile(
+                user=user,
+                first_name=first_name,
+                last_name=last_name,
+                gender=["Female", "Male", "unknown"][index % 3],
+                avatar="https://example.com/ä.png" if index % 2 else "",
+            )
+            for number in range(3):
+                post = sample_post(
+                    author=user,
+                    profile=profile,
+                    title=f"{first_name} #{number}",
+                    content=f'{last_name} "quoted" \u2028 {number}',
+                    hashtag="django" if number % 2 else "",
+                )
+                Post.objects.filter(id=post.id).update(
+                    created_at=base
+                    - datetime.timedelta(minutes=number, microseconds=index * 7)
+                )
+
+    def assertParity(self, url, params=None, **extra):
+        responses = []
+        for fast in (False, True):
+            with override_settings(SOCIAL_FAST_LIST=fast):
+                res = self.client.get(url, params, **extra)
+            self.assertEqual(res.status_code, 200)
+            responses.append(res)
+        slow, fast = responses
+
+        self.assertEqual(fast.content, slow.content)
+        self.assertEqual(fast["ETag"], slow["ETag"])
+        return fast
+
+    def test_post_list(self):
+        res = self.assertParity(POST_URL)
+
+        self.assertEqual(res.json()["count"], 12)
+
+    def test_post_list_pages(self):
+        self.assertParity(POST_URL, {"page": 2, "page_size": 5})
+
+    def test_post_list_cursor(self):
+        first = self.assertParity(POST_URL, {"cursor": "", "page_size": 5})
+        next_url = first.json()["next"]
+
+        second = self.assertParity(next_url)
+        self.assertParity(second.json()["previous"])
+
+    def test_post_list_filters(self):
+        self.assertParity(POST_URL, {"hashtag": "#Django"})
+        self.assertParity(POST_URL, {"title": "zoë"})
+        self.assertParity(POST_URL, {"q": "quoted"})
+
+    def test_post_list_sparse_fields(self):
+        self.assertParity(POST_URL, {"fields": "id,author,created_at"})
+        self.assertParity(POST_URL, {"omit": "content,author"})
+
+    def test_profile_list(self):
+        self.assertParity(PROFILE_URL)
+        self.assertParity(PROFILE_URL, {"cursor": "", "page_size": 2})
+
+    def test_profile_list_filters(self):
+        self.assertParity(PROFILE_URL, {"gender": "Male"})
+        self.assertParity(PROFILE_URL, {"first_name": "ZO", "fields": "full_name"})
+
+    def test_indented_json(self):
+        self.assertParity(POST_URL, HTTP_ACCEPT="application/json; indent=2")
+
+    def test_list_queries(self):
+        with self.assertNumQueries(2):
+            self.client.get(POST_URL)
+        with self.assertNumQueries(2):
+            self.client.get(PROFILE_URL)
+
+
+class RowConverterTests(TestCase):
+    def test_list_serializers_are_supported(self):
+        self.assertIsNotNone(fastpath.get_converter(PostSerializer))
+        self.assertIsNotNone(fastpath.get_converter(ProfileSerializer))
+
+    def test_unsupported_serializer_uses_slow_path(self):
+        self.assertIsNone(fastpath.get_converter(ProfileDetailSerializer))
+
+    def test_columns(self):
+        converter = fastpath.get_converter(PostSerializer, ("id", "author"))
+
+        self.assertEqual(
+            converter.columns, ["id", "profile__first_name", "profile__last_name"]
+        )
+        self.assertEqual(
+            converter(
+                {"id": 1, "profile__first_name": "A", "profile__last_name": "B"}
+            ),
+            {"id": 1, "author": "A B"},
+        )
+
+
+@skipIf(fastpath.orjson is None, "orjson is not installed")
+class FastJSONRendererTests(TestCase):
+    def test_matches_json_renderer(self):
+        data = {
+            "text": 'é "q" \\ \u2028\u2029 \x00\x1f\x7f 😀 </script>',
+            "numbers": [0, -1, 2**53, True, False, None],
+            "nested": {"empty": [], "obj": {}},
+        }
+        response = type("Response", (), {"plain_data": True})()
+
+        fast = fastpath.FastJSONRenderer().render(data, None, {"response": response})
+
+        self.assertEqual(fast, fastpath.JSONRenderer().render(data))
@@ -0,0 +1,126 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from social.models import TimelineEntry
+from social.tests.test_social_media_api import sample_profile, sample_post
+
+FEED_URL = reverse("social:feed")
+POST_URL = reverse("social:post-list")
+
+
+@override_settings(SOCIAL_FEED_ASYNC=False)
+class FeedTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("me@test.com", "testpass1")
+        self.profile = sample_profile(user=self.user)
+        self.author = get_user_model().objects.create_user(
+            "author@test.com", "testpass1"
+        )
+        self.author_profile = sample_profile(user=self.author)
+        self.client.force_authenticate(self.user)
+
+    def create_post_as(self, user, **payload):
+        client = APIClient()
+        client.force_authenticate(user)
+        payload.setdefault("title", "title")
+        payload.setdefault("content", "content")
+        with self.captureOnCommitCallbacks(execute=True):
+            res = client.post(POST_URL, payload)
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        return res.data["id"]
+
+    def test_feed_requires_authentication(self):
+        res = APIClient().get(FEED_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_new_post_is_fanned_out_to_followers(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.following.add(self.author)
+
+        post_id = self.create_post_as(self.author)
+        res = self.client.get(FEED_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([post["id"] for post in res.data["results"]], [post_id])
+        self.assertTrue(
+            TimelineEntry.objects.filter(user=self.user, post_id=post_id).exists()
+        )
+
+    def test_post_of_unfollowed_author_is_not_in_feed(self):
+        self.create_post_as(self.author)
+
+        res = self.client.get(FEED_URL)
+
+        self.assertEqual(res.data["results"], [])
+
+    def test_follow_backfills_and_unfollow_prunes(self):
+        post = sample_post(
+            author=self.author, profile=self.author_profile, title="older"
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.following.add(self.author)
+        res = self.client.get(FEED_URL)
+        self.assertEqual([item["id"] for item in res.data["results"]], [post.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.following.remove(self.author)
+        res = self.client.get(FEED_URL)
+        self.assertEqual(res.data["results"], [])
+
+    def test_large_accounts_are_merged_on_read(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.following.add(self.author)
+
+        with override_settings(SOCIAL_FEED_FANOUT_THRESHOLD=1):
+            post_id = self.create_post_as(self.author)
+            res = self.client.get(FEED_URL)
+
+        self.assertFalse(
+            TimelineEntry.objects.filter(user=self.user, post_id=post_id).exists()
+        )
+        self.assertEqual([item["id"] for item in res.data["results"]], [post_id])
+
+    def test_feed_cursor_pagination(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.following.add(self.author)
+        post_ids = [self.create_post_as(self.author) for _ in range(3)]
+
+        first = self.client.get(FEED_URL, {"cursor": "", "page_size": 2})
+        second = self.client.get(first.data["next"])
+
+        ids = [item["id"] for item in first.data["results"] + second.data["results"]]
+        self.assertEqual(ids, post_ids[::-1])
+        self.assertIsNone(second.data["next"])
+
+    def test_large_accounts_merge_with_the_timeline_in_order(self):
+        other = get_user_model().objects.create_user("other@test.com")
+        other_profile = sample_profile(user=other)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.following.add(self.author, other)
+            other_profile.following.add(self.author)
+        # Fanned out while the author was small; must not show up twice.
+        post_ids = [self.create_post_as(self.author)]
+
+        with override_settings(SOCIAL_FEED_FANOUT_THRESHOLD=2):
+            for user in (other, self.author, other, self.author, self.user):
+                post_ids.append(self.create_post_as(user))
+
+            ids = []
+            res = self.client.get(FEED_URL, {"page_size": 2})
+            while True:
+                self.assertNotIn("count", res.data)
+                ids += [item["id"] for item in res.data["results"]]
+                if res.data["next"] is None:
+                    break
+                res = self.client.get(res.data["next"])
+
+        self.assertEqual(ids, post_ids[::-1])
+        self.assertEqual(
+            TimelineEntry.objects.filter(user=self.user, author=other).count(), 2
+        )
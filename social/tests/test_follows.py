@@ -0,0 +1,158 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from social.models import Profile, TimelineEntry
+from social.tests.test_social_media_api import sample_profile, sample_post
+
+
+def follow_url(profile_id):
+    return reverse("social:profile-follow", args=[profile_id])
+
+
+def unfollow_url(profile_id):
+    return reverse("social:profile-unfollow", args=[profile_id])
+
+
+def bulk_follow_url(profile_id):
+    return reverse("social:profile-bulk-follow", args=[profile_id])
+
+
+@override_settings(SOCIAL_FEED_ASYNC=False)
+class FollowApiTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("me@test.com")
+        self.profile = sample_profile(user=self.user)
+        self.others = [
+            get_user_model().objects.create_user(f"user{number}@test.com")
+            for number in range(3)
+        ]
+        for other in self.others:
+            sample_profile(user=other)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def following_ids(self):
+        return set(self.profile.following.values_list("id", flat=True))
+
+    def test_follow_adds_only_new_edges(self):
+        first, second, _ = self.others
+        self.profile.following.add(first)
+
+        res = self.client.post(
+            follow_url(self.profile.id),
+            {"user_ids": [first.id, second.id, self.user.id, 999]},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {"followed": [second.id], "unfollowed": []})
+        self.assertEqual(self.following_ids(), {first.id, second.id})
+
+    def test_follow_updates_counters_and_timeline(self):
+        author = self.others[0]
+        post = sample_post(author=author, profile=author.profiles)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                follow_url(self.profile.id), {"user_ids": [author.id]}, format="json"
+            )
+
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.following_count, 1)
+        self.assertEqual(Profile.objects.get(user=author).followers_count, 1)
+        self.assertTrue(
+            TimelineEntry.objects.filter(user=self.user, post=post).exists()
+        )
+
+    def test_unfollow_removes_edges_and_counters(self):
+        self.profile.following.add(*self.others)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(
+                unfollow_url(self.profile.id),
+                {"user_ids": [self.others[0].id, 999]},
+                format="json",
+            )
+
+        self.assertEqual(res.data["unfollowed"], [self.others[0].id])
+        self.assertEqual(
+            self.following_ids(), {self.others[1].id, self.others[2].id}
+        )
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.following_count, 2)
+        self.assertEqual(Profile.objects.get(user=self.others[0]).followers_count, 0)
+
+    def test_follow_queries_do_not_grow_with_targets_or_following(self):
+        def count_queries(user_ids):
+            with CaptureQueriesContext(connection) as context:
+                res = self.client.post(
+                    follow_url(self.profile.id),
+                    {"user_ids": user_ids},
+                    format="json",
+                )
+            self.assertEqual(len(res.data["followed"]), len(user_ids))
+            return len(context.captured_queries)
+
+        first, *rest = self.others
+        one = count_queries([first.id])
+        extra = [
+            get_user_model().objects.create_user(f"extra{number}@test.com")
+            for number in range(30)
+        ]
+        for user in extra[20:]:
+            sample_profile(user=user)
+        self.profile.following.add(*extra[:20])
+
+        targets = rest + extra[20:]
+        self.assertEqual(count_queries([user.id for user in targets]), one)
+
+    def test_bulk_follow(self):
+        first, second, third = self.others
+        self.profile.following.add(first)
+
+        res = self.client.post(
+            bulk_follow_url(self.profile.id),
+            {"follow": [second.id, third.id], "unfollow": [first.id]},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(sorted(res.data["followed"]), [second.id, third.id])
+        self.assertEqual(res.data["unfollowed"], [first.id])
+        self.assertEqual(self.following_ids(), {second.id, third.id})
+
+    def test_bulk_follow_rejects_overlap(self):
+        user_id = self.others[0].id
+
+        res = self.client.post(
+            bulk_follow_url(self.profile.id),
+            {"follow": [user_id], "unfollow": [user_id]},
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rejects_ids_outside_the_primary_key_range(self):
+        for url, payload in (
+            (follow_url(self.profile.id), {"user_ids": [2**70]}),
+            (bulk_follow_url(self.profile.id), {"follow": [2**63]}),
+            (bulk_follow_url(self.profile.id), {"unfollow": [2**70]}),
+        ):
+            res = self.client.post(url, payload, format="json")
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cannot_follow_for_another_profile(self):
+        other_profile = self.others[0].profiles
+
+        res = self.client.post(
+            follow_url(other_profile.id), {"user_ids": [self.user.id]}, format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(other_profile.following.exists())
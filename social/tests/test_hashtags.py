@@ -0,0 +1,63 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from social.hashtags import parse_hashtags
+from social.models import Hashtag
+from social.tests.test_social_media_api import sample_profile, sample_post
+
+POST_URL = reverse("social:post-list")
+
+
+class ParseHashtagsTests(TestCase):
+    def test_parses_content_tags_and_legacy_field(self):
+        self.assertEqual(
+            parse_hashtags("Hello #Django and #python_3, not#this?", "#Extra more"),
+            {"django", "python_3", "this", "extra", "more"},
+        )
+
+    def test_skips_tags_longer_than_the_column(self):
+        self.assertEqual(parse_hashtags("#" + "a" * 51 + " #ok"), {"ok"})
+
+
+class HashtagIndexTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("me@test.com", "testpass1")
+        self.profile = sample_profile(user=self.user)
+        self.client.force_authenticate(self.user)
+
+    def post(self, **params):
+        return sample_post(author=self.user, profile=self.profile, **params)
+
+    def filter_ids(self, hashtag):
+        res = self.client.get(POST_URL, {"hashtag": hashtag})
+        return [item["id"] for item in res.data["results"]]
+
+    def test_tags_are_normalized_and_shared(self):
+        first = self.post(content="#Django rocks")
+        second = self.post(content="so does #DJANGO and #drf")
+
+        self.assertEqual(Hashtag.objects.filter(name="django").count(), 1)
+        self.assertCountEqual(
+            first.hashtags.values_list("name", flat=True), ["django"]
+        )
+        self.assertCountEqual(
+            second.hashtags.values_list("name", flat=True), ["django", "drf"]
+        )
+
+    def test_filter_by_hashtag_is_exact_and_case_insensitive(self):
+        tagged = self.post(content="#Django")
+        self.post(content="#djangorestframework")
+
+        self.assertEqual(self.filter_ids("#DJANGO"), [tagged.id])
+        self.assertEqual(self.filter_ids("django"), [tagged.id])
+
+    def test_edit_retags_post(self):
+        post = self.post(content="#old")
+        post.content = "#new"
+        post.save()
+
+        self.assertEqual(self.filter_ids("old"), [])
+        self.assertEqual(self.filter_ids("new"), [post.id])
@@ -0,0 +1,155 @@
+import json
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from social.models import HashtagBucket, Post, TimelineEntry
+from social.search import get_search_backend
+from social.tests.test_social_media_api import sample_profile
+
+BULK_URL = reverse("social:post-bulk")
+
+
+def payload(count, start=0):
+    return [
+        {"title": f"title {number}", "content": f"post {number} #bulk"}
+        for number in range(start, start + count)
+    ]
+
+
+@override_settings(SOCIAL_FEED_ASYNC=False)
+class BulkPostApiTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("me@test.com")
+        self.profile = sample_profile(user=self.user)
+        self.follower = get_user_model().objects.create_user("follower@test.com")
+        sample_profile(user=self.follower).following.add(self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def post_bulk(self, data):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(BULK_URL, data, format="json")
+
+    def test_bulk_create_applies_post_side_effects(self):
+        res = self.post_bulk(payload(3))
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        ids = [item["id"] for item in res.data]
+        self.assertEqual(len(ids), 3)
+        posts = Post.objects.filter(id__in=ids)
+        self.assertEqual({post.author_id for post in posts}, {self.user.id})
+        self.assertEqual({post.profile_id for post in posts}, {self.profile.id})
+
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.posts_count, 3)
+        self.assertEqual(Post.objects.filter(hashtags__name="bulk").count(), 3)
+        self.assertEqual(HashtagBucket.objects.get().count, 3)
+        self.assertCountEqual(get_search_backend().search("post", 10), ids)
+        self.assertEqual(
+            TimelineEntry.objects.filter(user=self.follower).count(), 3
+        )
+
+    def test_api_cannot_backdate_posts(self):
+        res = self.post_bulk([{**payload(1)[0], "created_at": "2019-05-01T10:00:00Z"}])
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertGreater(Post.objects.get().created_at.year, 2019)
+
+    def test_queries_do_not_grow_with_batch(self):
+        def count_queries(data):
+            with CaptureQueriesContext(connection) as context:
+                self.post_bulk(data)
+            return len(context.captured_queries)
+
+        self.assertEqual(count_queries(payload(2)), count_queries(payload(20, 2)))
+
+    def test_invalid_item_creates_nothing(self):
+        data = payload(2) + [{"content": "no title"}]
+
+        res = self.post_bulk(data)
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Post.objects.exists())
+
+    def test_rejects_non_list_and_too_many(self):
+        for data in ({"title": "t", "content": "c"}, payload(1_001)):
+            res = self.post_bulk(data)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_requires_profile(self):
+        self.client.force_authenticate(
+            get_user_model().objects.create_user("no-profile@test.com")
+        )
+
+        res = self.post_bulk(payload(1))
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(SOCIAL_FEED_ASYNC=False)
+class ImportPostsCommandTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("me@test.com")
+        self.profile = sample_profile(user=self.user)
+
+    def run_import(self, lines, *args):
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson") as file:
+            file.write("\n".join(lines))
+            file.flush()
+            stdout, stderr = StringIO(), StringIO()
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command(
+                    "import_posts", file.name, *args, stdout=stdout, stderr=stderr
+                )
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_imports_in_batches_and_reports_bad_lines(self):
+        lines = [json.dumps(item) for item in payload(5)]
+        lines[1] = "{not json"
+        lines[3] = json.dumps({"title": "t", "content": "c", "profile": 999})
+
+        stdout, stderr = self.run_import(
+            lines, "--profile", str(self.profile.id), "--batch-size", "2"
+        )
+
+        self.assertIn("Imported 3 posts, skipped 2", stdout)
+        self.assertIn("Line 2", stderr)
+        self.assertIn("Unknown profile 999", stderr)
+        self.assertEqual(Post.objects.filter(author=self.user).count(), 3)
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.posts_count, 3)
+
+    def test_import_keeps_created_at(self):
+        lines = [
+            json.dumps({**item, "profile": self.profile.id, "created_at": when})
+            for item, when in zip(
+                payload(2), ["2019-05-01T10:00:00Z", "2020-01-02T03:04:05Z"]
+            )
+        ]
+
+        self.run_import(lines)
+
+        self.assertEqual(
+            [post.created_at.isoformat() for post in Post.objects.all()],
+            ["2020-01-02T03:04:05+00:00", "2019-05-01T10:00:00+00:00"],
+        )
+
+    def test_historical_import_skips_timelines_and_trending(self):
+        lines = [
+            json.dumps({**item, "profile": self.profile.id}) for item in payload(2)
+        ]
+
+        self.run_import(lines, "--no-fan-out", "--no-trending")
+
+        self.assertEqual(Post.objects.count(), 2)
+        self.assertFalse(TimelineEntry.objects.exists())
+        self.assertFalse(HashtagBucket.objects.exists())
@@ -0,0 +1,96 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from social.multiget import MAX_IDS
+from social.serializers import PostSerializer, ProfileSerializer
+from social.tests.test_social_media_api import sample_post, sample_profile
+
+POST_URL = reverse("social:post-list")
+PROFILE_URL = reverse("social:profile-list")
+
+
+def ids_param(ids):
+    return {"ids": ",".join(map(str, ids))}
+
+
+class MultiGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.profiles = []
+        self.posts = []
+        for number in range(3):
+            user = get_user_model().objects.create_user(f"user{number}@test.com")
+            profile = sample_profile(user=user, first_name=f"name{number}")
+            self.profiles.append(profile)
+            self.posts.append(
+                sample_post(
+                    author=user,
+                    profile=profile,
+                    hashtag="django" if number else "",
+                )
+            )
+            profile.refresh_from_db()
+
+    def test_posts_in_request_order(self):
+        first, second, third = self.posts
+        ids = [third.id, first.id, second.id]
+
+        with self.assertNumQueries(1):
+            res = self.client.get(POST_URL, ids_param(ids))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data,
+            {
+                "results": PostSerializer([third, first, second], many=True).data,
+                "missing": [],
+            },
+        )
+
+    def test_profiles_report_missing(self):
+        first, second, _ = self.profiles
+        missing = self.profiles[-1].id + 100
+
+        with self.assertNumQueries(1):
+            res = self.client.get(
+                PROFILE_URL, ids_param([second.id, missing, first.id, second.id])
+            )
+
+        self.assertEqual(
+            res.data,
+            {
+                "results": ProfileSerializer([second, first], many=True).data,
+                "missing": [missing],
+            },
+        )
+
+    def test_filters_and_fields_apply(self):
+        ids = [post.id for post in self.posts]
+
+        res = self.client.get(
+            POST_URL, {**ids_param(ids), "hashtag": "django", "fields": "id"}
+        )
+
+        self.assertEqual(
+            res.data["results"], [{"id": self.posts[1].id}, {"id": self.posts[2].id}]
+        )
+        self.assertEqual(res.data["missing"], [self.posts[0].id])
+
+    def test_invalid_ids(self):
+        for value in (
+            "",
+            "1,x",
+            "0",
+            "-1",
+            "99999999999999999999999",
+            ",".join(map(str, range(1, MAX_IDS + 2))),
+        ):
+            res = self.client.get(POST_URL, {"ids": value})
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("ids", res.data)
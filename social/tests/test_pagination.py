@@ -0,0 +1,98 @@
+import base64
+import json
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from social.models import Post
+from social.tests.test_social_media_api import sample_profile, sample_post
+
+PROFILE_URL = reverse("social:profile-list")
+POST_URL = reverse("social:post-list")
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("me@test.com", "testpass1")
+        self.profile = sample_profile(user=self.user)
+        self.client.force_authenticate(self.user)
+
+    def walk(self, url, data):
+        ids = []
+        res = self.client.get(url, data)
+        while True:
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", res.data)
+            ids.extend(item["id"] for item in res.data["results"])
+            if res.data["next"] is None:
+                return ids, res
+            res = self.client.get(res.data["next"])
+
+    def test_post_cursor_walks_all_pages_newest_first(self):
+        for _ in range(7):
+            sample_post(author=self.user, profile=self.profile)
+        # Identical timestamps must still paginate without gaps or repeats.
+        Post.objects.update(created_at=Post.objects.first().created_at)
+
+        ids, _ = self.walk(POST_URL, {"cursor": "", "page_size": 3})
+
+        self.assertEqual(ids, sorted(Post.objects.values_list("id", flat=True))[::-1])
+
+    def test_previous_link_returns_preceding_page(self):
+        for _ in range(4):
+            sample_post(author=self.user, profile=self.profile)
+
+        first = self.client.get(POST_URL, {"cursor": "", "page_size": 2})
+        second = self.client.get(first.data["next"])
+        previous = self.client.get(second.data["previous"])
+
+        self.assertIsNone(first.data["previous"])
+        self.assertEqual(previous.data["results"], first.data["results"])
+
+    def test_cursor_page_runs_no_count_query(self):
+        sample_post(author=self.user, profile=self.profile)
+
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(POST_URL, {"cursor": ""})
+
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertNotIn("COUNT(", context.captured_queries[0]["sql"])
+
+    def test_profile_cursor_is_ordered_by_id(self):
+        for index in range(4):
+            user = get_user_model().objects.create_user(f"user{index}@test.com")
+            sample_profile(user=user)
+
+        ids, _ = self.walk(PROFILE_URL, {"cursor": "", "page_size": 2})
+
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(ids), 5)
+
+    def test_invalid_cursor(self):
+        def encode(payload):
+            return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+        for url, cursor in (
+            (POST_URL, "not-a-cursor"),
+            (POST_URL, encode({"p": [None, None]})),
+            (POST_URL, encode({"p": ["2023-01-01T00:00:00+00:00", 2**80]})),
+            (POST_URL, encode([1, 2])),
+            (PROFILE_URL, encode({"p": [-(2**70)]})),
+            (PROFILE_URL, encode({"p": [None]})),
+        ):
+            res = self.client.get(url, {"cursor": cursor})
+
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND, cursor)
+
+    def test_page_number_mode_is_default(self):
+        sample_post(author=self.user, profile=self.profile)
+
+        res = self.client.get(POST_URL)
+
+        self.assertEqual(res.data["count"], 1)
@@ -0,0 +1,78 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from social.serializers import PREVIEW_SIZE
+from social.tests.test_social_media_api import sample_profile, sample_post
+
+
+def profile_detail_url(profile_id):
+    return reverse("social:profile-detail", args=[profile_id])
+
+
+def profile_action_url(profile_id, action):
+    return reverse(f"social:profile-{action}", args=[profile_id])
+
+
+class ProfileSubResourceTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("me@test.com", "testpass1")
+        self.profile = sample_profile(user=self.user)
+        self.client.force_authenticate(self.user)
+
+        self.others = []
+        for index in range(PREVIEW_SIZE + 2):
+            user = get_user_model().objects.create_user(f"user{index}@test.com")
+            other = sample_profile(user=user, first_name=f"user{index}")
+            self.profile.following.add(user)
+            other.following.add(self.user)
+            self.others.append(other)
+            sample_post(author=self.user, profile=self.profile)
+
+    def walk(self, url):
+        ids = []
+        res = self.client.get(url, {"page_size": 3})
+        while True:
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            ids.extend(item["id"] for item in res.data["results"])
+            if res.data["next"] is None:
+                return ids
+            res = self.client.get(res.data["next"])
+
+    def test_detail_payload_is_bounded(self):
+        res = self.client.get(profile_detail_url(self.profile.id))
+
+        self.assertEqual(len(res.data["posts"]), PREVIEW_SIZE)
+        self.assertEqual(len(res.data["followers"]), PREVIEW_SIZE)
+        self.assertEqual(len(res.data["following"]), PREVIEW_SIZE)
+        self.assertEqual(res.data["posts_count"], PREVIEW_SIZE + 2)
+        self.assertEqual(res.data["followers_count"], PREVIEW_SIZE + 2)
+        self.assertEqual(res.data["following_count"], PREVIEW_SIZE + 2)
+
+    def test_followers_are_paginated(self):
+        ids = self.walk(profile_action_url(self.profile.id, "followers"))
+
+        self.assertEqual(ids, [other.id for other in self.others])
+
+    def test_following_are_paginated(self):
+        ids = self.walk(profile_action_url(self.profile.id, "following"))
+
+        self.assertEqual(ids, [other.id for other in self.others])
+
+    def test_posts_are_paginated_newest_first(self):
+        ids = self.walk(profile_action_url(self.profile.id, "posts"))
+
+        expected = list(
+            self.profile.posts.order_by("-created_at", "-id").values_list(
+                "id", flat=True
+            )
+        )
+        self.assertEqual(ids, expected)
+
+    def test_unknown_profile(self):
+        res = self.client.get(profile_action_url(0, "followers"))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from social.tests.test_social_media_api import sample_profile, sample_post
+from social.tests.utils import QueryCountMixin
+
+PROFILE_URL = reverse("social:profile-list")
+POST_URL = reverse("social:post-list")
+
+
+def profile_detail_url(profile_id):
+    return reverse("social:profile-detail", args=[profile_id])
+
+
+def post_detail_url(post_id):
+    return reverse("social:post-detail", args=[post_id])
+
+
+class QueryCountTests(QueryCountMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("me@test.com", "testpass1")
+        self.profile = sample_profile(user=self.user)
+        self.client.force_authenticate(self.user)
+        self.users = 0
+
+    def create_profiles(self, count):
+        profiles = []
+        for _ in range(count):
+            self.users += 1
+            user = get_user_model().objects.create_user(f"user{self.users}@test.com")
+            profiles.append(sample_profile(user=user))
+        return profiles
+
+    def create_posts(self, count, profile=None):
+        profile = profile or self.profile
+        for _ in range(count):
+            sample_post(author=profile.user, profile=profile)
+
+    def test_post_list(self):
+        self.create_posts(2)
+
+        self.assertConstantQueries(
+            2, POST_URL, lambda: self.create_posts(40), {"page_size": 30}
+        )
+
+    def test_post_detail(self):
+        self.create_posts(1)
+        post = self.profile.posts.get()
+
+        self.assertConstantQueries(1, post_detail_url(post.id), lambda: None)
+
+    def test_profile_list(self):
+        self.create_profiles(2)
+
+        self.assertConstantQueries(
+            2, PROFILE_URL, lambda: self.create_profiles(40), {"page_size": 30}
+        )
+
+    def test_profile_detail_with_follow_fan_out(self):
+        def grow():
+            for profile in self.create_profiles(10):
+                self.profile.following.add(profile.user)
+                profile.following.add(self.user)
+                self.create_posts(1, profile)
+            self.create_posts(10)
+
+        self.assertConstantQueries(4, profile_detail_url(self.profile.id), grow)
@@ -0,0 +1,188 @@
+"""Query plan regression tests for the read endpoints.
+
+Every SELECT an endpoint runs is explained with SQLite's ``EXPLAIN QUERY
+PLAN``. A plan fails when it contains
+
+* ``SCAN <table>`` without an index, a full table scan. Walking a table in
+  primary key order under ``ORDER BY id ... LIMIT`` also reads as a bare
+  ``SCAN``; it stops after the page and is accepted, as are full-text
+  ``MATCH`` lookups on virtual tables;
+* ``USE TEMP B-TREE``, a sort, DISTINCT or GROUP BY outside an index.
+
+``ALLOWED`` lists the steps some endpoints cannot avoid, with the reason;
+an entry no longer needed fails the test too, so the list only shrinks.
+"""
+
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from social.feed import fan_out_post
+from social.hashtags import tag_posts
+from social.tests.test_social_media_api import sample_post, sample_profile
+
+SUBSTRING_FILTER = "substring filters (icontains) cannot use a B-tree index"
+FOLLOW_TABLE = (
+    "the follow rows of one user are sorted by profile id; the auto-created "
+    "following table has no index in that order"
+)
+
+LARGE_ACCOUNTS = {"SOCIAL_FEED_FANOUT_THRESHOLD": 1}
+
+ALLOWED = {
+    "post title": {"SCAN social_post": SUBSTRING_FILTER},
+    "profile name": {"SCAN social_profile": SUBSTRING_FILTER},
+    "post hashtag": {
+        "USE TEMP B-TREE FOR ORDER BY": (
+            "posts are found through the hashtag's PostHashtag rows, so the "
+            "sort is bounded by the posts carrying that hashtag"
+        ),
+    },
+    "post search": {
+        "USE TEMP B-TREE FOR ORDER BY": (
+            "matches are ranked by bm25, then posts by that rank; both are "
+            "bounded by SEARCH_RESULTS_LIMIT"
+        ),
+    },
+    "trending": {
+        "USE TEMP B-TREE FOR GROUP BY": (
+            "the window's buckets are summed per tag once per snapshot "
+            "refresh, not per request"
+        ),
+    },
+    "profile detail": {"USE TEMP B-TREE FOR ORDER BY": FOLLOW_TABLE},
+    "profile followers": {"USE TEMP B-TREE FOR ORDER BY": FOLLOW_TABLE},
+    "profile following": {"USE TEMP B-TREE FOR ORDER BY": FOLLOW_TABLE},
+}
+
+
+def explain(sql):
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN QUERY PLAN " + sql)
+        return [row[3] for row in cursor.fetchall()]
+
+
+def problems(sql, plan):
+    """Plan steps that are full scans or temp B-trees."""
+    found = []
+    for step in plan:
+        if step.startswith("SCAN ") and not (
+            " USING " in step or " VIRTUAL TABLE " in step
+        ):
+            table = step.split()[1]
+            if f'ORDER BY "{table}"."id"' in sql and " LIMIT " in sql:
+                continue
+            found.append(step)
+        elif "USE TEMP B-TREE" in step:
+            found.append(step)
+    return found
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN is SQLite's")
+class QueryPlanTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        users = [
+            get_user_model().objects.create_user(f"user{number}@test.com")
+            for number in range(3)
+        ]
+        self.me, self.author, self.other = [
+            sample_profile(user=user, gender=gender)
+            for user, gender in zip(users, ("Female", "Male", "Male"))
+        ]
+        self.me.following.add(self.author.user, self.other.user)
+        self.author.following.add(self.me.user)
+        self.posts = [
+            sample_post(
+                author=self.author.user,
+                profile=self.author,
+                content=f"post {number} #django",
+            )
+            for number in range(3)
+        ]
+        tag_posts(self.posts)
+        for post in self.posts:
+            fan_out_post(post.id)
+        self.client.force_authenticate(self.me.user)
+
+    def endpoints(self):
+        posts = reverse("social:post-list")
+        profiles = reverse("social:profile-list")
+        post = self.posts[0].id
+        author = self.author.id
+
+        def profile_action(name):
+            return reverse(f"social:profile-{name}", args=[author])
+
+        return {
+            "post list": (posts, {}),
+            "post page": (posts, {"page": 2, "page_size": 2}),
+            "post cursor": (posts, {"cursor": ""}),
+            "post title": (posts, {"title": "first"}),
+            "post hashtag": (posts, {"hashtag": "django"}),
+            "post search": (posts, {"q": "post"}),
+            "post ids": (posts, {"ids": f"{post},{post + 1}"}),
+            "post detail": (reverse("social:post-detail", args=[post]), {}),
+            "profile list": (profiles, {}),
+            "profile gender": (profiles, {"gender": "Male"}),
+            "profile gender cursor": (profiles, {"gender": "Male", "cursor": ""}),
+            "profile name": (profiles, {"first_name": "first"}),
+            "profile ids": (profiles, {"ids": f"{author}"}),
+            "profile detail": (profile_action("detail"), {}),
+            "profile posts": (profile_action("posts"), {}),
+            "profile followers": (profile_action("followers"), {}),
+            "profile following": (profile_action("following"), {}),
+            "relationships": (
+                reverse("social:profile-relationships"),
+                {"ids": f"{author}"},
+            ),
+            "suggestions": (reverse("social:profile-suggestions"), {}),
+            "feed": (reverse("social:feed"), {}),
+            "feed cursor": (reverse("social:feed"), {"cursor": ""}),
+            # The followed author's posts are merged on read.
+            "feed large account": (reverse("social:feed"), {}, LARGE_ACCOUNTS),
+            "trending": (reverse("social:hashtags-trending"), {}),
+        }
+
+    def test_endpoint_queries_use_indexes(self):
+        used = set()
+        for name, (url, params, *overrides) in self.endpoints().items():
+            with self.subTest(name):
+                cache.clear()
+                with override_settings(**dict(*overrides)):
+                    with CaptureQueriesContext(connection) as queries:
+                        res = self.client.get(url, params)
+                self.assertEqual(res.status_code, 200, res.content)
+
+                selects = [
+                    query["sql"]
+                    for query in queries.captured_queries
+                    if query["sql"].startswith("SELECT")
+                ]
+                self.assertTrue(selects)
+                allowed = ALLOWED.get(name, {})
+                for sql in selects:
+                    plan = explain(sql)
+                    failing = []
+                    for step in problems(sql, plan):
+                        prefix = next(
+                            (prefix for prefix in allowed if step.startswith(prefix)),
+                            None,
+                        )
+                        if prefix is None:
+                            failing.append(step)
+                        else:
+                            used.add((name, prefix))
+                    self.assertEqual(failing, [], f"{sql}\n{plan}")
+
+        stale = {
+            (name, prefix) for name, steps in ALLOWED.items() for prefix in steps
+        } - used
+        self.assertEqual(stale, set(), "ALLOWED entries no longer needed")
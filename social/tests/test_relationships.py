@@ -0,0 +1,136 @@
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from social import follows
+from social.tests.test_social_media_api import sample_profile
+
+RELATIONSHIPS_URL = reverse("social:profile-relationships")
+
+SHARED_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "shared": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": tempfile.mkdtemp(prefix="relationship-cache-"),
+    },
+}
+
+
+@override_settings(CACHES=SHARED_CACHES, SOCIAL_RESPONSE_CACHE_ALIAS="shared")
+class RelationshipsApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches["shared"].clear()
+        self.user = get_user_model().objects.create_user("me@test.com")
+        self.profile = sample_profile(user=self.user)
+        self.others = [
+            get_user_model().objects.create_user(f"user{number}@test.com")
+            for number in range(4)
+        ]
+        self.other_profiles = [sample_profile(user=other) for other in self.others]
+
+        following, mutual, follower, _ = self.others
+        self.profile.following.add(following, mutual)
+        mutual.profiles.following.add(self.user)
+        follower.profiles.following.add(self.user)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self, profile_ids):
+        return self.client.get(
+            RELATIONSHIPS_URL, {"ids": ",".join(map(str, profile_ids))}
+        )
+
+    def assertFlags(self, res):
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [
+                (row["id"], row["following"], row["followed_by"], row["mutual"])
+                for row in res.data
+            ],
+            [
+                (self.other_profiles[3].id, False, False, False),
+                (self.other_profiles[0].id, True, False, False),
+                (self.other_profiles[1].id, True, True, True),
+                (self.other_profiles[2].id, False, True, False),
+            ],
+        )
+
+    def test_flags_in_one_query(self):
+        profile_ids = [profile.id for profile in self.other_profiles]
+
+        with self.assertNumQueries(1):
+            res = self.get([profile_ids[3], *profile_ids[:3], 999])
+
+        self.assertFlags(res)
+
+    @override_settings(SOCIAL_RELATIONSHIP_CACHE=True)
+    def test_cached_id_sets(self):
+        profile_ids = [profile.id for profile in self.other_profiles]
+        ids = [profile_ids[3], *profile_ids[:3]]
+        self.get(ids)
+
+        with self.assertNumQueries(1):
+            res = self.get(ids)
+
+        self.assertFlags(res)
+        self.assertIsNotNone(
+            caches["shared"].get(f"social:relationships:{self.user.id}")
+        )
+
+    @override_settings(SOCIAL_RELATIONSHIP_CACHE=True)
+    def test_follow_changes_drop_cached_sets(self):
+        profile_id = self.other_profiles[3].id
+        self.get([profile_id])
+
+        follows.follow(self.profile, [self.others[3].id])
+        res = self.get([profile_id])
+        self.assertTrue(res.data[0]["following"])
+
+        self.other_profiles[3].following.add(self.user)
+        res = self.get([profile_id])
+        self.assertTrue(res.data[0]["mutual"])
+
+    @override_settings(
+        SOCIAL_RELATIONSHIP_CACHE=True, SOCIAL_RESPONSE_CACHE_ALIAS="default"
+    )
+    def test_process_local_cache_is_not_used(self):
+        profile_ids = [profile.id for profile in self.other_profiles]
+
+        res = self.get([profile_ids[3], *profile_ids[:3]])
+
+        self.assertFlags(res)
+        self.assertIsNone(cache.get(f"social:relationships:{self.user.id}"))
+
+    @override_settings(
+        SOCIAL_RELATIONSHIP_CACHE=True, SOCIAL_RELATIONSHIP_CACHE_MAX_SIZE=1
+    )
+    def test_large_sets_fall_back_to_query(self):
+        profile_ids = [profile.id for profile in self.other_profiles]
+
+        res = self.get([profile_ids[3], *profile_ids[:3]])
+
+        self.assertFlags(res)
+
+    def test_invalid_ids(self):
+        for value in (
+            "",
+            "1,x",
+            "0",
+            "-1",
+            "99999999999999999999999",
+            ",".join(map(str, range(1, 102))),
+        ):
+            res = self.client.get(RELATIONSHIPS_URL, {"ids": value})
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_requires_authentication(self):
+        res = APIClient().get(RELATIONSHIPS_URL, {"ids": "1"})
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
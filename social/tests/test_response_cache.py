@@ -0,0 +1,154 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache as default_cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from social import cache
+from social.tests.test_social_media_api import sample_profile, sample_post
+
+PROFILE_URL = reverse("social:profile-list")
+POST_URL = reverse("social:post-list")
+
+
+def profile_detail_url(profile_id):
+    return reverse("social:profile-detail", args=[profile_id])
+
+
+@override_settings(SOCIAL_FEED_ASYNC=False)
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        default_cache.clear()
+        cache.reset_stats()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("me@test.com", "testpass1")
+        self.profile = sample_profile(user=self.user)
+
+    def post(self, **params):
+        return sample_post(author=self.user, profile=self.profile, **params)
+
+    def test_second_anonymous_get_is_served_from_cache(self):
+        self.post()
+
+        first = self.client.get(POST_URL)
+        with self.assertNumQueries(0):
+            second = self.client.get(POST_URL)
+
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1})
+
+    def test_cached_etag_answers_revalidation_without_queries(self):
+        self.post()
+        etag = self.client.get(POST_URL)["ETag"]
+
+        with self.assertNumQueries(0):
+            res = self.client.get(POST_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, 304)
+
+    def test_query_params_are_part_of_the_key(self):
+        self.client.get(POST_URL, {"page_size": 1})
+
+        res = self.client.get(POST_URL, {"page_size": 2})
+
+        self.assertEqual(res["X-Cache"], "MISS")
+
+    @override_settings(ALLOWED_HOSTS=["one.test", "two.test"])
+    def test_host_and_scheme_are_part_of_the_key(self):
+        for _ in range(6):
+            self.post()
+
+        for host, secure in (
+            ("one.test", False),
+            ("two.test", False),
+            ("two.test", True),
+        ):
+            res = self.client.get(POST_URL, HTTP_HOST=host, secure=secure)
+
+            self.assertEqual(res["X-Cache"], "MISS")
+            scheme = "https" if secure else "http"
+            self.assertTrue(res.data["next"].startswith(f"{scheme}://{host}/"))
+
+    def test_post_changes_invalidate_lists_and_profiles(self):
+        self.client.get(POST_URL)
+        self.client.get(profile_detail_url(self.profile.id))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            post = self.post(title="fresh")
+
+        posts = self.client.get(POST_URL)
+        profile = self.client.get(profile_detail_url(self.profile.id))
+        self.assertEqual(posts["X-Cache"], "MISS")
+        self.assertEqual(posts.data["results"][0]["id"], post.id)
+        self.assertEqual(profile.data["posts_count"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            post.delete()
+        self.assertEqual(self.client.get(POST_URL).data["count"], 0)
+
+    def test_follow_invalidates_profiles(self):
+        other = get_user_model().objects.create_user("other@test.com")
+        sample_profile(user=other)
+        self.client.get(profile_detail_url(self.profile.id))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.following.add(other)
+
+        res = self.client.get(profile_detail_url(self.profile.id))
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(res.data["following_count"], 1)
+
+    def test_invalidation_waits_for_the_commit(self):
+        before = cache.generations([cache.POSTS])
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.post()
+            # A concurrent read would still see the old rows.
+            self.assertEqual(cache.generations([cache.POSTS]), before)
+        for callback in callbacks:
+            callback()
+
+        self.assertNotEqual(cache.generations([cache.POSTS]), before)
+
+    def test_writes_bump_only_their_namespace(self):
+        post = self.post()
+        self.client.get(POST_URL)
+        self.client.get(PROFILE_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            post.title = "edited"
+            post.save()
+        self.assertEqual(self.client.get(PROFILE_URL)["X-Cache"], "HIT")
+        self.assertEqual(self.client.get(POST_URL)["X-Cache"], "MISS")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.first_name = "Renamed"
+            self.profile.save()
+        res = self.client.get(POST_URL)
+        self.assertEqual(res["X-Cache"], "MISS")
+        self.assertEqual(res.data["results"][0]["author"], "Renamed lastname")
+
+    @mock.patch("social.cache.current_replica", return_value="replica")
+    def test_replica_reads_right_after_a_write_are_not_stored(self, _):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post()
+
+        self.client.get(POST_URL)
+        self.assertEqual(self.client.get(POST_URL)["X-Cache"], "MISS")
+
+        default_cache.delete(cache._invalidated_key(cache.POSTS))
+        self.client.get(POST_URL)
+        self.assertEqual(self.client.get(POST_URL)["X-Cache"], "HIT")
+
+    def test_authenticated_requests_bypass_cache(self):
+        self.client.force_authenticate(self.user)
+        self.client.get(POST_URL)
+
+        res = self.client.get(POST_URL)
+
+        self.assertNotIn("X-Cache", res)
+        self.assertEqual(cache.stats(), {"hits": 0, "misses": 0})
@@ -0,0 +1,120 @@
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from social.search import ContainsSearchBackend, get_search_backend
+from social.tests.test_social_media_api import sample_profile, sample_post
+
+POST_URL = reverse("social:post-list")
+
+
+class PostSearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("me@test.com", "testpass1")
+        self.profile = sample_profile(user=self.user)
+        self.client.force_authenticate(self.user)
+
+    def post(self, **params):
+        return sample_post(author=self.user, profile=self.profile, **params)
+
+    def search(self, query):
+        res = self.client.get(POST_URL, {"q": query})
+        return [item["id"] for item in res.data["results"]]
+
+    def test_search_matches_title_content_and_hashtag(self):
+        by_title = self.post(title="Django tips", content="none")
+        by_content = self.post(title="other", content="some django internals")
+        by_hashtag = self.post(title="other", content="none", hashtag="#django")
+        self.post(title="unrelated", content="flask")
+
+        self.assertCountEqual(
+            self.search("django"), [by_title.id, by_content.id, by_hashtag.id]
+        )
+
+    def test_title_hits_rank_above_content_hits(self):
+        by_content = self.post(title="other", content="python python python")
+        by_title = self.post(title="python", content="something else")
+
+        self.assertEqual(self.search("python"), [by_title.id, by_content.id])
+
+    def test_all_terms_must_match(self):
+        both = self.post(title="fast search", content="sqlite")
+        self.post(title="fast cars", content="engines")
+
+        self.assertEqual(self.search("fast sqlite"), [both.id])
+
+    def test_index_follows_updates_and_deletes(self):
+        post = self.post(title="before")
+        post.title = "after"
+        post.save()
+
+        self.assertEqual(self.search("before"), [])
+        self.assertEqual(self.search("after"), [post.id])
+
+        post.delete()
+        self.assertEqual(self.search("after"), [])
+
+    def test_query_without_terms_returns_nothing(self):
+        self.post(title="anything")
+
+        self.assertEqual(self.search("!!!"), [])
+
+    def test_rebuild_command(self):
+        post = self.post(title="rebuilt")
+        get_search_backend().clear()
+        self.assertEqual(self.search("rebuilt"), [])
+
+        call_command("rebuild_search_index", stdout=StringIO())
+
+        self.assertEqual(self.search("rebuilt"), [post.id])
+
+    def test_cursor_is_rejected_with_a_query(self):
+        res = self.client.get(POST_URL, {"q": "django", "cursor": ""})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("cursor", res.data)
+
+    def test_unknown_vendor_falls_back_to_substring_search(self):
+        get_search_backend.cache_clear()
+        self.addCleanup(get_search_backend.cache_clear)
+
+        with mock.patch.dict("social.search.BACKENDS", clear=True):
+            self.assertIsInstance(get_search_backend(), ContainsSearchBackend)
+            older = self.post(title="Django tips", content="sqlite")
+            newer = self.post(title="other", content="sqlite", hashtag="django")
+            self.post(title="Django", content="postgres")
+
+            self.assertEqual(self.search("django SQLite"), [newer.id, older.id])
+
+    @skipUnless("debug_toolbar" in settings.INSTALLED_APPS, "dev profile only")
+    @override_settings(
+        DEBUG=True,
+        DEBUG_TOOLBAR_CONFIG={"SHOW_TOOLBAR_CALLBACK": lambda request: True},
+    )
+    def test_index_writes_under_the_debug_toolbar(self):
+        # The toolbar's SQL panel wraps cursors and fails on executemany().
+        res = self.client.post(
+            POST_URL, {"title": "toolbar", "content": "panel"}, format="json"
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        post_id = res.data["id"]
+
+        res = self.client.patch(
+            reverse("social:post-detail", args=[post_id]),
+            {"title": "renamed"},
+            format="json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.search("renamed"), [post_id])
+
+        res = self.client.delete(reverse("social:post-detail", args=[post_id]))
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.search("renamed"), [])
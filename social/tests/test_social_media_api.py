@@ -256,6 +256,22 @@ class PostsTests(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
 
+    def test_update_post_keeps_created_at(self):
+        post = sample_post(author=self.user, profile=self.profile)
+        payload = {
+            "title": "another",
+            "content": "another",
+            "created_at": "2000-01-01T00:00:00Z",
+        }
+
+        for method in (self.client.put, self.client.patch):
+            res = method(post_detail_url(post.id), payload)
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertEqual(
+                Post.objects.get(id=post.id).created_at, post.created_at
+            )
+
     def test_delete_another_profile_forbidden(self):
         user = get_user_model().objects.create_user(
             "test1@test.com",
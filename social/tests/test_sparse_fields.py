@@ -0,0 +1,96 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from social.tests.test_social_media_api import sample_profile, sample_post
+
+POST_URL = reverse("social:post-list")
+PROFILE_URL = reverse("social:profile-list")
+
+
+class SparseFieldsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user("me@test.com")
+        self.profile = sample_profile(user=self.user, biography="long " * 100)
+        self.post = sample_post(
+            author=self.user, profile=self.profile, content="body " * 100
+        )
+        self.client = APIClient()
+
+    def get(self, url, params):
+        with CaptureQueriesContext(connection) as context:
+            res = self.client.get(url, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res, " ".join(query["sql"] for query in context.captured_queries)
+
+    def test_fields_prunes_response_and_columns(self):
+        res, sql = self.get(POST_URL, {"fields": "id,title"})
+
+        self.assertEqual(
+            res.data["results"], [{"id": self.post.id, "title": "firstname"}]
+        )
+        self.assertNotIn('"content"', sql)
+        self.assertNotIn('"media_attachments"', sql)
+        self.assertNotIn("JOIN", sql)
+
+    def test_omit_keeps_other_fields(self):
+        res, sql = self.get(POST_URL, {"omit": "content,media_attachments"})
+
+        self.assertEqual(
+            set(res.data["results"][0]),
+            {"id", "author", "title", "hashtag", "created_at"},
+        )
+        self.assertNotIn('"content"', sql)
+        self.assertIn("JOIN", sql)
+
+    def test_post_detail(self):
+        url = reverse("social:post-detail", args=[self.post.id])
+
+        res, sql = self.get(url, {"fields": "title"})
+
+        self.assertEqual(res.data, {"title": "firstname"})
+        self.assertNotIn('"content"', sql)
+
+    def test_profile_detail_skips_unrequested_previews(self):
+        url = reverse("social:profile-detail", args=[self.profile.id])
+
+        with self.assertNumQueries(1):
+            res = self.client.get(url, {"fields": "id,first_name"})
+
+        self.assertEqual(
+            res.data, {"id": self.profile.id, "first_name": "firstname"}
+        )
+
+    def test_profile_detail_defers_biography(self):
+        url = reverse("social:profile-detail", args=[self.profile.id])
+
+        res, sql = self.get(url, {"fields": "id,gender"})
+
+        self.assertNotIn('"biography"', sql)
+
+    def test_profile_list(self):
+        res, _ = self.get(PROFILE_URL, {"fields": "id,full_name"})
+
+        self.assertEqual(
+            res.data["results"],
+            [{"id": self.profile.id, "full_name": "firstname lastname"}],
+        )
+
+    def test_unknown_field(self):
+        res = self.client.get(POST_URL, {"fields": "id,password"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("password", res.data["fields"])
+
+    def test_cached_responses_are_per_fieldset(self):
+        self.client.get(POST_URL, {"fields": "id"})
+
+        res = self.client.get(POST_URL, {"fields": "title"})
+
+        self.assertEqual(res.data["results"], [{"title": "firstname"}])
@@ -0,0 +1,106 @@
+from io import StringIO
+from unittest import skipIf
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from social.models import FollowSuggestion
+from social.suggestions import FollowGraph, build_suggestions, np
+from social.tests.test_social_media_api import sample_profile
+
+SUGGESTIONS_URL = reverse("social:profile-suggestions")
+
+# 1 follows 2 and 3; 2 follows 4 and 5; 3 follows 4 and 1; 4 follows 6.
+EDGES = [(1, 2), (1, 3), (2, 4), (2, 5), (3, 4), (3, 1), (4, 6)]
+
+
+class FollowGraphTests(SimpleTestCase):
+    def graph(self, use_numpy):
+        sources, targets = zip(*EDGES)
+        return FollowGraph.from_edges(sources, targets, use_numpy)
+
+    def test_friends_of_friends_ranked_by_mutual_follows(self):
+        graph = self.graph(use_numpy=False)
+
+        self.assertEqual(graph.suggest(graph.node(1)), [(4, 2), (5, 1)])
+        self.assertEqual(graph.suggest(graph.node(1), k=1), [(4, 2)])
+        self.assertEqual(graph.suggest(graph.node(3)), [(2, 1), (6, 1)])
+        self.assertEqual(graph.suggest(graph.node(6)), [])
+        self.assertIsNone(graph.node(7))
+
+    @skipIf(np is None, "NumPy is not installed")
+    def test_numpy_backend_matches_array_backend(self):
+        expected = self.graph(use_numpy=False)
+        graph = self.graph(use_numpy=True)
+
+        for user_id in range(1, 7):
+            self.assertEqual(
+                graph.suggest(graph.node(user_id)),
+                expected.suggest(expected.node(user_id)),
+            )
+
+
+class FollowSuggestionsApiTests(TestCase):
+    def setUp(self):
+        self.users = {
+            number: get_user_model().objects.create_user(f"user{number}@test.com")
+            for number in range(1, 7)
+        }
+        self.profiles = {
+            number: sample_profile(user=user) for number, user in self.users.items()
+        }
+        for source, target in EDGES:
+            self.profiles[source].following.add(self.users[target])
+        self.client = APIClient()
+        self.client.force_authenticate(self.users[1])
+
+    def test_build_stores_one_row_per_follower(self):
+        call_command("build_follow_suggestions", stdout=StringIO())
+
+        self.assertEqual(FollowSuggestion.objects.count(), 4)
+        self.assertEqual(
+            FollowSuggestion.objects.get(user=self.users[1]).candidates,
+            [[self.users[4].id, 2], [self.users[5].id, 1]],
+        )
+
+    def test_rebuild_drops_users_who_follow_nobody(self):
+        build_suggestions()
+        self.profiles[4].following.clear()
+
+        build_suggestions()
+
+        self.assertFalse(FollowSuggestion.objects.filter(user=self.users[4]).exists())
+
+    def test_suggestions_endpoint(self):
+        build_suggestions()
+
+        with self.assertNumQueries(2):
+            res = self.client.get(SUGGESTIONS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(item["id"], item["mutual_follows"]) for item in res.data],
+            [(self.profiles[4].id, 2), (self.profiles[5].id, 1)],
+        )
+
+    def test_suggestions_skip_accounts_followed_since_build(self):
+        build_suggestions()
+        self.profiles[1].following.add(self.users[4])
+
+        res = self.client.get(SUGGESTIONS_URL)
+
+        self.assertEqual([item["id"] for item in res.data], [self.profiles[5].id])
+
+    def test_suggestions_empty_before_first_build(self):
+        res = self.client.get(SUGGESTIONS_URL)
+
+        self.assertEqual(res.data, [])
+
+    def test_suggestions_require_authentication(self):
+        res = APIClient().get(SUGGESTIONS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,97 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from social import trending
+from social.models import Hashtag, HashtagBucket
+from social.tests.test_social_media_api import sample_profile, sample_post
+
+TRENDING_URL = reverse("social:hashtags-trending")
+
+
+class TopKTests(TestCase):
+    def test_keeps_only_highest_scores(self):
+        top = trending.TopK(2)
+        for item, score in [("a", 1), ("b", 5), ("c", 3), ("d", 2)]:
+            top.push(item, score)
+
+        self.assertEqual(top.items(), [("b", 5), ("c", 3)])
+
+
+class TrendingHashtagsTests(TestCase):
+    def setUp(self):
+        trending.clear_snapshots()
+        self.addCleanup(trending.clear_snapshots)
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("me@test.com", "testpass1")
+        self.profile = sample_profile(user=self.user)
+
+    def post(self, content):
+        return sample_post(author=self.user, profile=self.profile, content=content)
+
+    def record(self, name, count, at):
+        hashtag, _ = Hashtag.objects.get_or_create(name=name)
+        for _ in range(count):
+            trending.record([hashtag.id], at)
+
+    def test_new_posts_are_counted(self):
+        self.post("#django #drf")
+        self.post("#django")
+
+        res = self.client.get(TRENDING_URL, {"window": "hour"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data, [{"name": "django", "count": 2}, {"name": "drf", "count": 1}]
+        )
+
+    def test_windows_only_count_recent_buckets(self):
+        now = timezone.now()
+        self.record("recent", 1, now)
+        self.record("older", 3, now - timedelta(hours=3))
+        self.record("expired", 5, now - timedelta(days=2))
+
+        self.assertEqual(trending.compute("hour", now), [("recent", 1)])
+        self.assertEqual(trending.compute("day", now), [("older", 3), ("recent", 1)])
+
+    def test_limit_and_invalid_window(self):
+        self.post("#a #b #c")
+
+        self.assertEqual(len(self.client.get(TRENDING_URL, {"limit": 2}).data), 2)
+        res = self.client.get(TRENDING_URL, {"window": "year"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_snapshot_is_served_until_refresh(self):
+        now = timezone.now()
+        self.record("first", 1, now)
+        self.assertEqual(trending.trending("day", 10, now), [("first", 1)])
+
+        self.record("second", 2, now)
+        with self.assertNumQueries(0):
+            self.assertEqual(trending.trending("day", 10, now), [("first", 1)])
+
+        later = now + timedelta(seconds=trending.REFRESH_SECONDS)
+        self.assertEqual(
+            trending.trending("day", 10, later), [("second", 2), ("first", 1)]
+        )
+
+    def test_compaction_merges_into_hours_and_drops_expired(self):
+        now = timezone.now()
+        hour = trending.bucket_start(now - timedelta(hours=5), 3600)
+        for minutes in (0, 5, 10):
+            self.record("tag", 2, hour + timedelta(minutes=minutes))
+        self.record("tag", 1, now)
+        self.record("tag", 4, now - timedelta(days=2))
+
+        before = trending.compute("day", now)
+        expired, merged = trending.compact(now)
+
+        self.assertEqual(expired, 1)
+        self.assertEqual(merged, 2)
+        self.assertEqual(HashtagBucket.objects.count(), 2)
+        self.assertEqual(trending.compute("day", now), before)
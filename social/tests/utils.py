@@ -0,0 +1,19 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+
+class QueryCountMixin:
+    """Assertions that an endpoint's query count does not grow with its data."""
+
+    def count_queries(self, url, data=None):
+        with CaptureQueriesContext(connection) as context:
+            res = self.client.get(url, data)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries)
+
+    def assertConstantQueries(self, expected, url, grow, data=None):
+        """GET ``url`` runs ``expected`` queries both before and after ``grow()``."""
+        self.assertEqual(self.count_queries(url, data), expected)
+        grow()
+        self.assertEqual(self.count_queries(url, data), expected)
@@ -0,0 +1,165 @@
+"""Trending hashtags from time-bucketed counters.
+
+Creating a post increments one ``HashtagBucket`` row per tag for the
+current ``BUCKET_SECONDS`` slot. Rankings per window are aggregated from
+those rows (never from posts) into a bounded ``TopK`` and kept in process
+for ``REFRESH_SECONDS``. ``compact`` merges buckets older than an hour into
+hourly rows and drops buckets that left the longest window.
+"""
+
+import heapq
+import threading
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from social.models import HashtagBucket
+
+BUCKET_SECONDS = getattr(settings, "SOCIAL_TRENDING_BUCKET_SECONDS", 300)
+REFRESH_SECONDS = getattr(settings, "SOCIAL_TRENDING_REFRESH_SECONDS", 60)
+TOP_K = getattr(settings, "SOCIAL_TRENDING_TOP_K", 50)
+COMPACTED_SECONDS = 3600
+WINDOWS = {
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+}
+
+_snapshots = {}
+_lock = threading.Lock()
+
+
+class TopK:
+    """Keep the ``k`` highest-scoring items seen, in O(log k) per push."""
+
+    def __init__(self, k):
+        self.k = k
+        self._heap = []
+
+    def push(self, item, score):
+        entry = (score, item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def items(self):
+        return [(item, score) for score, item in sorted(self._heap, reverse=True)]
+
+
+def bucket_start(moment, seconds=BUCKET_SECONDS):
+    timestamp = int(moment.timestamp())
+    return moment.fromtimestamp(timestamp - timestamp % seconds, tz=moment.tzinfo)
+
+
+def record(hashtag_ids, created_at=None):
+    """Count one new post for each of ``hashtag_ids``."""
+    record_many([(hashtag_ids, created_at or timezone.now())])
+
+
+def record_many(tagged_posts):
+    """Count new posts given as ``(hashtag_ids, created_at)`` pairs."""
+    counts = Counter()
+    for hashtag_ids, created_at in tagged_posts:
+        start = bucket_start(created_at)
+        for hashtag_id in hashtag_ids:
+            counts[start, hashtag_id] += 1
+    if not counts:
+        return
+
+    HashtagBucket.objects.bulk_create(
+        [
+            HashtagBucket(hashtag_id=hashtag_id, start=start)
+            for start, hashtag_id in counts
+        ],
+        ignore_conflicts=True,
+    )
+    # One UPDATE per bucket and distinct increment, not per tag.
+    increments = defaultdict(list)
+    for (start, hashtag_id), count in counts.items():
+        increments[start, count].append(hashtag_id)
+    for (start, count), hashtag_ids in increments.items():
+        HashtagBucket.objects.filter(start=start, hashtag_id__in=hashtag_ids).update(
+            count=F("count") + count
+        )
+
+
+def compute(window, now=None, k=TOP_K):
+    now = now or timezone.now()
+    rows = (
+        HashtagBucket.objects.filter(start__gt=now - WINDOWS[window])
+        .values("hashtag__name")
+        .annotate(total=Sum("count"))
+        .values_list("hashtag__name", "total")
+        .order_by()
+    )
+    top = TopK(k)
+    for name, total in rows.iterator():
+        top.push(name, total)
+    return top.items()
+
+
+def trending(window, limit, now=None):
+    """Top ``limit`` tags of ``window`` from the in-process snapshot."""
+    now = now or timezone.now()
+    snapshot = _snapshots.get(window)
+    if snapshot is None or (now - snapshot[0]).total_seconds() >= REFRESH_SECONDS:
+        with _lock:
+            snapshot = _snapshots.get(window)
+            if (
+                snapshot is None
+                or (now - snapshot[0]).total_seconds() >= REFRESH_SECONDS
+            ):
+                snapshot = (now, compute(window, now))
+                _snapshots[window] = snapshot
+    return snapshot[1][:limit]
+
+
+def refresh(now=None):
+    now = now or timezone.now()
+    with _lock:
+        for window in WINDOWS:
+            _snapshots[window] = (now, compute(window, now))
+
+
+def clear_snapshots():
+    _snapshots.clear()
+
+
+@transaction.atomic
+def compact(now=None):
+    """Merge old buckets into hourly rows and drop expired ones.
+
+    Returns ``(deleted, merged)`` row counts.
+    """
+    now = now or timezone.now()
+    expired, _ = HashtagBucket.objects.filter(
+        start__lte=now - max(WINDOWS.values())
+    ).delete()
+
+    cutoff = bucket_start(now - timedelta(seconds=COMPACTED_SECONDS), COMPACTED_SECONDS)
+    old = HashtagBucket.objects.filter(start__lt=cutoff)
+    merged = defaultdict(int)
+    fine_ids = []
+    for bucket_id, hashtag_id, start, count in old.values_list(
+        "id", "hashtag_id", "start", "count"
+    ).iterator():
+        hour = bucket_start(start, COMPACTED_SECONDS)
+        merged[(hashtag_id, hour)] += count
+        if start != hour:
+            fine_ids.append(bucket_id)
+
+    if not fine_ids:
+        return expired, 0
+
+    old.delete()
+    HashtagBucket.objects.bulk_create(
+        [
+            HashtagBucket(hashtag_id=hashtag_id, start=start, count=count)
+            for (hashtag_id, start), count in merged.items()
+        ]
+    )
+    return expired, len(fine_ids)
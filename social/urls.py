@@ -1,12 +1,25 @@
 from django.urls import path, include
 from rest_framework import routers
 
-from social.views import ProfileViewSet, PostViewSet
+from social.views import (
+    ProfileViewSet,
+    PostViewSet,
+    FeedView,
+    TrendingHashtagsView,
+)
 
 router = routers.DefaultRouter()
 router.register("profiles", ProfileViewSet)
 router.register("posts", PostViewSet)
 
-urlpatterns = [path("", include(router.urls))]
+urlpatterns = [
+    path("feed/", FeedView.as_view(), name="feed"),
+    path(
+        "hashtags/trending/",
+        TrendingHashtagsView.as_view(),
+        name="hashtags-trending",
+    ),
+    path("", include(router.urls)),
+]
 
 app_name = "social"
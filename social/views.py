@@ -1,12 +1,60 @@
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
-from rest_framework import viewsets
-from rest_framework.pagination import PageNumberPagination
+from django.db import transaction
+from django.db.models import (
+    Case,
+    F,
+    Func,
+    IntegerField,
+    OuterRef,
+    Subquery,
+    Value,
+    When,
+)
+from django.http import StreamingHttpResponse
+from rest_framework import generics, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from py_social_media_api.metrics import SerializerMetricsMixin
 
+from social import (
+    export,
+    feed,
+    follows,
+    ingest,
+    relationships,
+    suggestions,
+    trending,
+)
+from social.cache import AUTHORS, POSTS, PROFILES, ResponseCacheMixin
+from social.conditional import ConditionalGetMixin
+from social.fastpath import FastListMixin
 from social.models import Profile, Post
+from social.pagination import (
+    KeysetPagination,
+    PostPagination,
+    ProfilePagination,
+    FeedPagination,
+)
+from social.hashtags import normalize as normalize_hashtag
+from social.multiget import MULTI_GET_PARAMETER, MultiGetMixin, parse_ids
+from social.search import get_search_backend
+from social.sparse import SPARSE_PARAMETERS, SparseFieldsMixin
 from social.permissions import IsPostOwnerOrReadOnly, IsProfileOwnerOrReadOnly
 from social.serializers import (
+    PREVIEW_SIZE,
+    BulkFollowSerializer,
+    FollowResultSerializer,
+    FollowSerializer,
+    TrendingHashtagSerializer,
     ProfileSerializer,
+    ProfilePostsSerializer,
+    ProfileSuggestionSerializer,
+    RelationshipSerializer,
     PostSerializer,
     ProfileDetailSerializer,
     PostCreateUpdateSerializer,
@@ -14,20 +62,21 @@ from social.serializers import (
 )
 
 
-class Pagination(PageNumberPagination):
-    page_size = 5
-    page_size_query_param = "page_size"
-    max_page_size = 30
-
-
-class ProfileViewSet(viewsets.ModelViewSet):
-    queryset = Profile.objects.all().prefetch_related(
-        "user__followers",
-        "posts",
-    )
+class ProfileViewSet(
+    ResponseCacheMixin,
+    ConditionalGetMixin,
+    SparseFieldsMixin,
+    MultiGetMixin,
+    FastListMixin,
+    SerializerMetricsMixin,
+    viewsets.ModelViewSet,
+):
+    queryset = Profile.objects.order_by("id")
     serializer_class = ProfileSerializer
     permission_classes = [IsProfileOwnerOrReadOnly]
-    pagination_class = Pagination
+    pagination_class = ProfilePagination
+    cache_namespaces = (PROFILES,)
+    validator_fields = ("id", "version", "user")
 
     def get_queryset(self):
         first_name = self.request.query_params.get("first_name")
@@ -36,6 +85,11 @@ class ProfileViewSet(viewsets.ModelViewSet):
 
         queryset = self.queryset
 
+        if self.action == "retrieve":
+            queryset = queryset.select_related("user").annotate(
+                **self.preview_validators()
+            )
+
         if first_name:
             queryset = queryset.filter(first_name__icontains=first_name)
 
@@ -45,11 +99,55 @@ class ProfileViewSet(viewsets.ModelViewSet):
         if gender:
             queryset = queryset.filter(gender=gender)
 
-        return queryset.distinct()
+        return queryset
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    def get_cache_namespaces(self):
+        if self.action == "retrieve":
+            # The detail embeds a preview of the profile's posts.
+            return (PROFILES, POSTS)
+        return self.cache_namespaces
+
+    def preview_validators(self):
+        """Sums of the ids and versions of the previewed followers and followings.
+
+        The detail shows their names, whose edits move their versions, not
+        this one. Follows do move this one; the id sums catch previewed
+        profiles deleted since.
+        """
+        keep = self.sparse_fields()
+        previews = {
+            "followers": Profile.objects.filter(
+                following=OuterRef(OuterRef("user_id"))
+            ),
+            "following": Profile.objects.filter(
+                user__followers=OuterRef(OuterRef("id"))
+            ),
+        }
+        annotations = {}
+        for name, queryset in previews.items():
+            if keep is not None and name not in keep:
+                continue
+            ids = queryset.order_by("id").values("id")[:PREVIEW_SIZE]
+            for field in ("id", "version"):
+                annotations[f"{name}_preview_{field}s"] = Subquery(
+                    Profile.objects.filter(id__in=ids)
+                    .order_by()
+                    .annotate(total=Func(F(field), function="SUM"))
+                    .values("total")
+                )
+        return annotations
+
+    def row_version(self, obj):
+        version = (obj.id, obj.version)
+        if self.action != "retrieve":
+            return version
+        return version + tuple(
+            getattr(obj, name) for name in self.preview_validators()
+        )
+
     def get_serializer_class(self):
         if self.action == "retrieve":
             return ProfileDetailSerializer
@@ -76,35 +174,306 @@ class ProfileViewSet(viewsets.ModelViewSet):
                 type=OpenApiTypes.STR,
                 description="Filter by gender (ex. ?gender=Male)",
             ),
+            *SPARSE_PARAMETERS,
+            MULTI_GET_PARAMETER,
         ]
     )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @extend_schema(parameters=SPARSE_PARAMETERS)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    def _paginated(self, queryset, serializer_class, ordering):
+        paginator = KeysetPagination(ordering)
+        page = paginator.paginate_queryset(queryset, self.request, view=self)
+        serializer = serializer_class(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    @extend_schema(responses=ProfileSerializer(many=True))
+    @action(detail=True, pagination_class=KeysetPagination)
+    def followers(self, request, pk=None):
+        profile = self.get_object()
+        return self._paginated(
+            Profile.objects.filter(following=profile.user_id),
+            ProfileSerializer,
+            ("id",),
+        )
+
+    @extend_schema(responses=ProfileSerializer(many=True))
+    @action(detail=True, pagination_class=KeysetPagination)
+    def following(self, request, pk=None):
+        profile = self.get_object()
+        return self._paginated(
+            Profile.objects.filter(user__followers=profile),
+            ProfileSerializer,
+            ("id",),
+        )
+
+    @extend_schema(responses=ProfilePostsSerializer(many=True))
+    @action(detail=True, pagination_class=KeysetPagination)
+    def posts(self, request, pk=None):
+        profile = self.get_object()
+        return self._paginated(
+            profile.posts.all(),
+            ProfilePostsSerializer,
+            ("-created_at", "-id"),
+        )
+
+    @extend_schema(responses=ProfileSuggestionSerializer(many=True))
+    @action(detail=False, permission_classes=[IsAuthenticated])
+    def suggestions(self, request):
+        """Accounts followed by the people you follow, most mutual first"""
+        serializer = ProfileSuggestionSerializer(
+            suggestions.suggested_profiles(request.user), many=True
+        )
+        return Response(serializer.data)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "ids",
+                type=OpenApiTypes.STR,
+                required=True,
+                description=(
+                    f"Comma-separated profile ids, at most "
+                    f"{relationships.MAX_PROFILES} (ex. ?ids=1,2,3)"
+                ),
+            ),
+        ],
+        responses=RelationshipSerializer(many=True),
+    )
+    @action(detail=False, permission_classes=[IsAuthenticated])
+    def relationships(self, request):
+        """Whether you follow, are followed by, or mutually follow each profile"""
+        profile_ids = parse_ids(
+            request.query_params.get("ids", ""), relationships.MAX_PROFILES
+        )
+        flags = relationships.relationships(request.user, profile_ids)
+        rows = []
+        for profile_id in profile_ids:
+            if profile_id in flags:
+                following, followed_by = flags[profile_id]
+                rows.append(
+                    {
+                        "id": profile_id,
+                        "following": following,
+                        "followed_by": followed_by,
+                        "mutual": following and followed_by,
+                    }
+                )
+        return Response(RelationshipSerializer(rows, many=True).data)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "resource",
+                type=OpenApiTypes.STR,
+                enum=tuple(export.RESOURCES),
+                required=True,
+                description="What to export (ex. ?resource=posts)",
+            ),
+            OpenApiParameter(
+                "output",
+                type=OpenApiTypes.STR,
+                enum=tuple(export.FORMATS),
+                description="ndjson (default) or csv",
+            ),
+        ],
+        responses={(200, "application/x-ndjson"): OpenApiTypes.STR},
+    )
+    @action(detail=True, permission_classes=[IsAuthenticated])
+    def export(self, request, pk=None):
+        """Stream all posts, followers or following of your own profile"""
+        resource = request.query_params.get("resource")
+        if resource not in export.RESOURCES:
+            raise ValidationError(
+                {"resource": f"Expected one of: {', '.join(export.RESOURCES)}"}
+            )
+        output = request.query_params.get("output", "ndjson")
+        if output not in export.FORMATS:
+            raise ValidationError(
+                {"output": f"Expected one of: {', '.join(export.FORMATS)}"}
+            )
+
+        profile = self.get_object()
+        if profile.user_id != request.user.id:
+            raise PermissionDenied("You can only export your own profile")
+
+        response = StreamingHttpResponse(
+            export.export_lines(profile, resource, output),
+            content_type=export.FORMATS[output],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="profile-{profile.id}-{resource}.{output}"'
+        )
+        return response
+
+    def _validated(self, serializer_class):
+        serializer = serializer_class(data=self.request.data)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
 
-class PostViewSet(viewsets.ModelViewSet):
+    @extend_schema(request=FollowSerializer, responses=FollowResultSerializer)
+    @action(detail=True, methods=["post"])
+    def follow(self, request, pk=None):
+        """Follow the given users, leaving the rest of the list untouched"""
+        profile = self.get_object()
+        user_ids = self._validated(FollowSerializer)["user_ids"]
+        return Response(
+            {"followed": follows.follow(profile, user_ids), "unfollowed": []}
+        )
+
+    @extend_schema(request=FollowSerializer, responses=FollowResultSerializer)
+    @action(detail=True, methods=["post"])
+    def unfollow(self, request, pk=None):
+        """Stop following the given users"""
+        profile = self.get_object()
+        user_ids = self._validated(FollowSerializer)["user_ids"]
+        return Response(
+            {"followed": [], "unfollowed": follows.unfollow(profile, user_ids)}
+        )
+
+    @extend_schema(request=BulkFollowSerializer, responses=FollowResultSerializer)
+    @action(detail=True, methods=["post"], url_path="follow/bulk")
+    def bulk_follow(self, request, pk=None):
+        """Follow and unfollow users in one request"""
+        profile = self.get_object()
+        data = self._validated(BulkFollowSerializer)
+        with transaction.atomic():
+            unfollowed = follows.unfollow(profile, data.get("unfollow", []))
+            followed = follows.follow(profile, data.get("follow", []))
+        return Response({"followed": followed, "unfollowed": unfollowed})
+
+
+SEARCH_RESULTS_LIMIT = 1_000
+
+
+class PostViewSet(
+    ResponseCacheMixin,
+    ConditionalGetMixin,
+    SparseFieldsMixin,
+    MultiGetMixin,
+    FastListMixin,
+    SerializerMetricsMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Post.objects.all()
     serializer_class = PostSerializer
     permission_classes = [IsPostOwnerOrReadOnly]
-    pagination_class = Pagination
+    pagination_class = PostPagination
+    cache_namespaces = (POSTS, AUTHORS)
+    # Posts show their author's name, so the author's version and save time
+    # are part of their validators, when the author field is returned.
+    author_validator_fields = ("author_version", "author_updated_at")
+
+    def shows_author(self):
+        keep = self.sparse_fields()
+        return keep is None or "author" in keep
+
+    @property
+    def validator_fields(self):
+        fields = ("id", "created_at", "updated_at")
+        if self.action in ("list", "retrieve") and self.shows_author():
+            fields += self.author_validator_fields
+        return fields
 
     def get_queryset(self):
         hashtag = self.request.query_params.get("hashtag")
         title = self.request.query_params.get("title")
+        query = self.request.query_params.get("q")
 
         queryset = self.queryset
 
+        if self.action in ("list", "retrieve"):
+            queryset = queryset.select_related("profile")
+            if self.shows_author():
+                queryset = queryset.annotate(
+                    author_version=F("profile__version"),
+                    author_updated_at=F("profile__updated_at"),
+                )
+
         if hashtag:
-            queryset = queryset.filter(hashtag__icontains=hashtag)
+            queryset = queryset.filter(hashtags__name=normalize_hashtag(hashtag))
 
         if title:
             queryset = queryset.filter(title__icontains=title)
 
-        return queryset.distinct()
+        if query:
+            # Keyset pages are ordered by date, which would drop the ranking.
+            if KeysetPagination.cursor_query_param in self.request.query_params:
+                raise ValidationError(
+                    {"cursor": "Not available with ?q=; use page numbers"}
+                )
+            post_ids = get_search_backend().search(query, SEARCH_RESULTS_LIMIT)
+            queryset = queryset.filter(id__in=post_ids).order_by(
+                Case(
+                    *[
+                        When(id=post_id, then=Value(rank))
+                        for rank, post_id in enumerate(post_ids)
+                    ],
+                    output_field=IntegerField(),
+                )
+            )
+
+        # No DISTINCT: a post carries a hashtag at most once, so no filter
+        # repeats rows, and DISTINCT would make the page COUNT(*) scan posts.
+        return queryset
 
+    @transaction.atomic
     def perform_create(self, serializer):
         profile = Profile.objects.get(user=self.request.user)
-        serializer.save(author=self.request.user, profile=profile)
+        post = serializer.save(author=self.request.user, profile=profile)
+        feed.schedule_fan_out(post)
+
+    @extend_schema(
+        request=PostCreateUpdateSerializer(many=True),
+        responses=PostCreateUpdateSerializer(many=True),
+    )
+    @action(detail=False, methods=["post"], permission_classes=[IsAuthenticated])
+    def bulk(self, request):
+        """Create up to MAX_BULK_POSTS posts of your profile at once"""
+        if not isinstance(request.data, list):
+            raise ValidationError("Expected a list of posts")
+        if len(request.data) > ingest.MAX_BULK_POSTS:
+            raise ValidationError(
+                f"At most {ingest.MAX_BULK_POSTS} posts are allowed"
+            )
+
+        serializer = PostCreateUpdateSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+
+        profile = Profile.objects.filter(user=request.user).first()
+        if profile is None:
+            raise ValidationError("Create a profile before posting")
+
+        posts = ingest.create_posts(
+            [
+                Post(author=request.user, profile=profile, **data)
+                for data in serializer.validated_data
+            ]
+        )
+        return Response(
+            PostCreateUpdateSerializer(posts, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+    @staticmethod
+    def row_version(obj):
+        return (
+            obj.id,
+            obj.updated_at,
+            getattr(obj, "author_version", None),
+            getattr(obj, "author_updated_at", None),
+        )
+
+    @staticmethod
+    def row_modified(obj):
+        author_updated_at = getattr(obj, "author_updated_at", None)
+        if author_updated_at is None:
+            return obj.updated_at
+        return max(obj.updated_at, author_updated_at)
 
     def get_serializer_class(self):
         if self.action == "retrieve":
@@ -120,14 +489,83 @@ class PostViewSet(viewsets.ModelViewSet):
             OpenApiParameter(
                 "hashtag",
                 type=OpenApiTypes.STR,
-                description="Filter by hashtag (ex. ?hashtag=#hashtag)",
+                description=(
+                    "Filter by hashtag, case-insensitive "
+                    "(ex. ?hashtag=hashtag or ?hashtag=%23hashtag)"
+                ),
             ),
             OpenApiParameter(
                 "title",
                 type=OpenApiTypes.STR,
                 description="Filter by title (ex. ?title=title)",
             ),
+            OpenApiParameter(
+                "q",
+                type=OpenApiTypes.STR,
+                description=(
+                    "Full-text search over title, content and hashtag, "
+                    "most relevant first (ex. ?q=django tips); paginated by "
+                    "page number only, not with ?cursor="
+                ),
+            ),
+            *SPARSE_PARAMETERS,
+            MULTI_GET_PARAMETER,
         ]
     )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
+
+    @extend_schema(parameters=SPARSE_PARAMETERS)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+
+class FeedView(SerializerMetricsMixin, generics.ListAPIView):
+    serializer_class = PostSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = FeedPagination
+
+    def get_queryset(self):
+        return feed.feed_sources(self.request.user)
+
+
+class TrendingHashtagsView(APIView):
+    default_limit = 10
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "window",
+                type=OpenApiTypes.STR,
+                enum=list(trending.WINDOWS),
+                description="Time window (ex. ?window=hour), defaults to day",
+            ),
+            OpenApiParameter(
+                "limit",
+                type=OpenApiTypes.INT,
+                description=f"Number of tags, at most {trending.TOP_K}",
+            ),
+        ],
+        responses=TrendingHashtagSerializer(many=True),
+    )
+    def get(self, request):
+        window = request.query_params.get("window", "day")
+        if window not in trending.WINDOWS:
+            raise ValidationError(
+                {"window": f"Expected one of: {', '.join(trending.WINDOWS)}"}
+            )
+
+        try:
+            limit = int(request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            raise ValidationError({"limit": "Expected an integer"})
+        limit = max(1, min(limit, trending.TOP_K))
+
+        serializer = TrendingHashtagSerializer(
+            [
+                {"name": name, "count": count}
+                for name, count in trending.trending(window, limit)
+            ],
+            many=True,
+        )
+        return Response(serializer.data)
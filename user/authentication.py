@@ -0,0 +1,92 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+
+# Backends whose entries another worker cannot see, so an eviction there
+# would not revoke the token everywhere.
+PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+
+
+def get_cache():
+    """The token cache, or ``None`` if it is not shared between workers."""
+    cache = caches[getattr(settings, "AUTH_TOKEN_CACHE_ALIAS", "default")]
+    if isinstance(cache, PROCESS_LOCAL_BACKENDS):
+        return None
+    return cache
+
+
+def token_cache_key(key):
+    return "user:token:" + hashlib.sha256(key.encode()).hexdigest()
+
+
+def evict_token(key):
+    """Drop a token from the lookup cache (logout, password change, ...)."""
+    cache = get_cache()
+    if cache is not None:
+        cache.delete(token_cache_key(key))
+
+
+def _user_fields(model):
+    return [
+        field.attname
+        for field in model._meta.concrete_fields
+        if field.attname != "password"
+    ]
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """``TokenAuthentication`` that caches the token with its user.
+
+    Entries expire after ``AUTH_TOKEN_CACHE_TIMEOUT`` seconds and are evicted
+    as soon as the token is deleted or its user is saved, so deactivation,
+    logout and password changes take effect immediately. That only holds
+    for a cache every worker shares, so with a process-local backend
+    (the default without ``REDIS_URL``) tokens are looked up every time.
+
+    Entries hold the user's fields except the password hash; the user is
+    rebuilt with ``password`` deferred, and saving it leaves the hash alone.
+    """
+
+    def authenticate_credentials(self, key):
+        cache = get_cache()
+        if cache is None:
+            return super().authenticate_credentials(key)
+
+        cache_key = token_cache_key(key)
+        entry = cache.get(cache_key)
+        if entry is None:
+            model = self.get_model()
+            try:
+                token = model.objects.select_related("user").get(key=key)
+            except model.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_("Invalid token."))
+            names = _user_fields(type(token.user))
+            entry = (token.created, [getattr(token.user, name) for name in names])
+            cache.set(
+                cache_key, entry, getattr(settings, "AUTH_TOKEN_CACHE_TIMEOUT", 300)
+            )
+        else:
+            token = self.rebuild(key, *entry)
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+
+        return token.user, token
+
+    def rebuild(self, key, created, values):
+        model = self.get_model()
+        user_model = model._meta.get_field("user").related_model
+        user = user_model.from_db(DEFAULT_DB_ALIAS, _user_fields(user_model), values)
+        token = model.from_db(
+            DEFAULT_DB_ALIAS, ["key", "user_id", "created"], [key, user.pk, created]
+        )
+        token.user = user
+        return token
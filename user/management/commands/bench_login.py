@@ -0,0 +1,50 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIRequestFactory
+
+from user.views import CreateTokenView
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure login requests per second on one core with the configured "
+        "password hasher (throttling disabled, nothing is kept)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=100)
+        parser.add_argument("--password", default="bench-password-123")
+
+    def handle(self, *args, **options):
+        count = options["requests"]
+        password = options["password"]
+        hasher = get_hasher()
+        view = CreateTokenView.as_view(throttle_classes=())
+        factory = APIRequestFactory()
+
+        with transaction.atomic():
+            user = get_user_model().objects.create_user(
+                email="bench-login@example.com", password=password
+            )
+            payload = {"email": user.email, "password": password}
+
+            started = time.perf_counter()
+            for _ in range(count):
+                response = view(factory.post("/", payload, format="json"))
+                if response.status_code != 200:
+                    raise RuntimeError(f"Login failed: {response.data}")
+            elapsed = time.perf_counter() - started
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{hasher.algorithm}: "
+                f"{count / elapsed:.1f} logins/s, "
+                f"{elapsed / count * 1000:.2f} ms per login"
+            )
+        )
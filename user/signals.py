@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from user.authentication import evict_token
+
+
+@receiver(post_delete, sender=Token)
+def evict_deleted_token(sender, instance, **kwargs):
+    evict_token(instance.key)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def evict_saved_user_tokens(sender, instance, created, raw=False, **kwargs):
+    if created or raw:
+        return
+    for key in Token.objects.filter(user=instance).values_list("key", flat=True):
+        evict_token(key)
@@ -1,3 +1,193 @@
-from django.test import TestCase
+import tempfile
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from user.authentication import token_cache_key
+from user.throttling import get_store, refill
+
+TOKEN_URL = reverse("user:token")
+MANAGE_URL = reverse("user:manage")
+LOGOUT_URL = reverse("user:logout")
+
+
+SHARED_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "tokens": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": tempfile.mkdtemp(prefix="token-cache-"),
+    },
+}
+
+
+@override_settings(CACHES=SHARED_CACHES, AUTH_TOKEN_CACHE_ALIAS="tokens")
+class CachedTokenAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        caches["tokens"].clear()
+        self.user = get_user_model().objects.create_user(
+            email="user@test.com", password="password123"
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def test_token_lookup_is_cached(self):
+        self.client.get(MANAGE_URL)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(MANAGE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["email"], self.user.email)
+
+    def test_password_hash_is_not_cached(self):
+        self.client.get(MANAGE_URL)
+
+        entry = caches["tokens"].get(token_cache_key(self.token.key))
+        self.assertNotIn(self.user.password, repr(entry))
+
+        res = self.client.patch(MANAGE_URL, {"email": "renamed@test.com"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password("password123"))
+
+    @override_settings(AUTH_TOKEN_CACHE_ALIAS="default")
+    def test_process_local_cache_is_not_used(self):
+        self.client.get(MANAGE_URL)
+
+        with self.assertNumQueries(1):
+            res = self.client.get(MANAGE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIsNone(cache.get(token_cache_key(self.token.key)))
+
+    def test_invalid_token_rejected(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Token invalid")
+
+        res = self.client.get(MANAGE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_logout_revokes_cached_token(self):
+        self.client.get(MANAGE_URL)
+
+        res = self.client.post(LOGOUT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Token.objects.filter(key=self.token.key).exists())
+        self.assertIsNone(caches["tokens"].get(token_cache_key(self.token.key)))
+        res = self.client.get(MANAGE_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_password_change_revokes_token(self):
+        self.client.get(MANAGE_URL)
+
+        res = self.client.patch(MANAGE_URL, {"password": "newpassword123"})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        res = self.client.get(MANAGE_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_rejected_while_cached(self):
+        self.client.get(MANAGE_URL)
+
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(MANAGE_URL)
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_user_update_refreshes_cached_user(self):
+        self.client.get(MANAGE_URL)
+
+        self.client.patch(MANAGE_URL, {"email": "new@test.com"})
+
+        res = self.client.get(MANAGE_URL)
+        self.assertEqual(res.data["email"], "new@test.com")
+
+
+class TokenBucketTests(TestCase):
+    def test_bucket_refills_over_time(self):
+        allowed, state, _ = refill(None, 2, 60, now=0)
+        self.assertTrue(allowed)
+        allowed, state, _ = refill(state, 2, 60, now=0)
+        self.assertTrue(allowed)
+        allowed, state, wait = refill(state, 2, 60, now=0)
+        self.assertFalse(allowed)
+        self.assertEqual(wait, 30)
+
+        allowed, state, _ = refill(state, 2, 60, now=30)
+        self.assertTrue(allowed)
+
+
+@override_settings(
+    LOGIN_THROTTLE_RATES={"login_ip": "5/min", "login_email": "2/min"}
+)
+class LoginThrottleTests(TestCase):
+    def setUp(self):
+        get_store.cache_clear()
+        self.client = APIClient()
+
+    def test_email_bucket_blocks_before_checking_password(self):
+        user = get_user_model().objects.create_user(
+            email="user@test.com", password="password123"
+        )
+        payload = {"email": "User@test.com ", "password": "wrong"}
+        for _ in range(2):
+            res = self.client.post(TOKEN_URL, payload)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        with self.assertNumQueries(0):
+            res = self.client.post(
+                TOKEN_URL, {"email": user.email, "password": "password123"}
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", res)
+
+    def test_ip_bucket_spans_emails(self):
+        for number in range(5):
+            self.client.post(
+                TOKEN_URL, {"email": f"user{number}@test.com", "password": "x"}
+            )
+
+        res = self.client.post(TOKEN_URL, {"email": "other@test.com"})
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_ip_bucket_ignores_untrusted_forwarded_for(self):
+        for number in range(5):
+            self.client.post(
+                TOKEN_URL,
+                {"email": f"user{number}@test.com", "password": "x"},
+                HTTP_X_FORWARDED_FOR=f"10.0.0.{number}",
+            )
+
+        res = self.client.post(
+            TOKEN_URL, {"email": "other@test.com"}, HTTP_X_FORWARDED_FOR="10.0.1.1"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_non_object_body(self):
+        res = self.client.post(TOKEN_URL, ["user@test.com"], format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(LOGIN_THROTTLE_STORE="user.throttling.CacheBucketStore")
+    def test_cache_store(self):
+        get_store.cache_clear()
+        cache.clear()
+        for _ in range(2):
+            self.client.post(TOKEN_URL, {"email": "a@test.com", "password": "x"})
+
+        res = self.client.post(TOKEN_URL, {"email": "a@test.com", "password": "x"})
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        get_store.cache_clear()
@@ -0,0 +1,158 @@
+"""Token-bucket rate limiting of login attempts.
+
+A bucket holds up to ``capacity`` tokens and refills at ``capacity`` per
+period; every attempt takes one token. Buckets are kept per client IP and
+per submitted email. The IP is ``REMOTE_ADDR`` unless ``NUM_PROXIES`` says
+how many trusted proxies append to ``X-Forwarded-For``. DRF checks
+throttles before the view runs, so a rejected attempt never reaches
+password hashing.
+
+``LOGIN_THROTTLE_STORE`` names the bucket store by dotted path: the
+process-local ``MemoryBucketStore`` by default, or ``CacheBucketStore`` to
+share buckets between workers through the Django cache.
+"""
+
+import hashlib
+import math
+import threading
+import time
+from collections.abc import Mapping
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+DEFAULT_RATES = {
+    "login_ip": "30/min",
+    "login_email": "5/min",
+}
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate):
+    """``"5/min"`` -> ``(5, 60)``, in the format of DRF throttle rates."""
+    num, period = rate.split("/")
+    return int(num), PERIODS[period[0]]
+
+
+def refill(state, capacity, period, now):
+    """Take one token from ``state``.
+
+    Returns ``(allowed, state, wait)`` where ``wait`` is the number of
+    seconds until the next token when the attempt is refused.
+    """
+    tokens, updated = state if state is not None else (capacity, now)
+    tokens = min(capacity, tokens + (now - updated) * capacity / period)
+    if tokens >= 1:
+        return True, (tokens - 1, now), 0
+    return False, (tokens, now), (1 - tokens) * period / capacity
+
+
+class MemoryBucketStore:
+    """Buckets in a dict of this process, pruned when it grows too large."""
+
+    max_keys = 100_000
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, period, now):
+        with self._lock:
+            allowed, state, wait = refill(
+                self._buckets.get(key), capacity, period, now
+            )
+            self._buckets[key] = state
+            if len(self._buckets) > self.max_keys:
+                self._prune(now, period)
+            return allowed, wait
+
+    def _prune(self, now, period):
+        # A bucket untouched for a full period is full again, which is the
+        # same as not having one.
+        for key, (_, updated) in list(self._buckets.items()):
+            if now - updated >= period:
+                del self._buckets[key]
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class CacheBucketStore:
+    """Buckets in the Django cache named by ``LOGIN_THROTTLE_CACHE_ALIAS``.
+
+    The read-modify-write is not atomic, so concurrent attempts may
+    occasionally share a token; the limit still holds within a small margin.
+    """
+
+    def take(self, key, capacity, period, now):
+        cache = caches[getattr(settings, "LOGIN_THROTTLE_CACHE_ALIAS", "default")]
+        allowed, state, wait = refill(cache.get(key), capacity, period, now)
+        cache.set(key, state, math.ceil(period))
+        return allowed, wait
+
+    def clear(self):
+        pass
+
+
+@lru_cache(maxsize=None)
+def get_store():
+    return import_string(
+        getattr(
+            settings, "LOGIN_THROTTLE_STORE", "user.throttling.MemoryBucketStore"
+        )
+    )()
+
+
+class LoginThrottle(BaseThrottle):
+    """Token bucket per ``get_key``, rated by ``LOGIN_THROTTLE_RATES[scope]``."""
+
+    scope = None
+
+    def get_key(self, request):
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        rate = getattr(settings, "LOGIN_THROTTLE_RATES", DEFAULT_RATES).get(
+            self.scope
+        )
+        key = self.get_key(request)
+        if rate is None or key is None:
+            return True
+
+        capacity, period = parse_rate(rate)
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        allowed, self._wait = get_store().take(
+            f"user:throttle:{self.scope}:{digest}", capacity, period, time.time()
+        )
+        return allowed
+
+    def wait(self):
+        return self._wait
+
+
+class LoginIPThrottle(LoginThrottle):
+    scope = "login_ip"
+
+    def get_key(self, request):
+        # Without trusted proxies, X-Forwarded-For is whatever the client
+        # sends, and a new value per attempt would get a fresh bucket.
+        if api_settings.NUM_PROXIES is None:
+            return request.META.get("REMOTE_ADDR")
+        return self.get_ident(request)
+
+
+class LoginEmailThrottle(LoginThrottle):
+    scope = "login_email"
+
+    def get_key(self, request):
+        if not isinstance(request.data, Mapping):
+            return None
+        email = request.data.get("email")
+        if not isinstance(email, str) or not email.strip():
+            return None
+        return email.strip().lower()